@@ -2,10 +2,19 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import annotations
-import os, re, sys
-from dataclasses import dataclass
+import argparse
+from functools import partial
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import AbstractSet, Callable, Dict, Iterable, List, NamedTuple
+
+from content_cache import ScanCache, add_cache_arguments, fingerprint, open_cache, run_cached_scan
+from content_git import ChangedLines, GitScopeError, add_git_arguments, git_scope, gitignored_paths, on_changed_line, select_changed, staged_blobs, walk_ignored
+from content_profile import add_profile_arguments, finish_profile, start_profile
+from content_report import HitStream, add_format_argument, stats_out
+from content_rules import rule_pack
+from content_scan import FileHits, HelpFormatter, HitList, RuleSet, ScanOptions, ScanStats, add_jobs_argument, add_stats_argument, add_visible_argument, iter_lines, rule_labels, scan_context, scan_options
+from content_walk import walk_files
+from content_watch import WatchHit, add_watch_arguments, watch_loop
 
 # ============ SCOPE ============
 # We scannen ALLEEN app/(site). Blogs worden expliciet genegeerd.
@@ -17,44 +26,25 @@ EXCLUDE_DIRS = {".git", "node_modules", "dist", "build", ".next", "out", ".cache
 MAX_FILE_SIZE_MB = 3
 
 # ============ PATTERNS ============
-# Focus op SITE-COPY risico's:
+# Focus op SITE-COPY risico's (regelset "content_audit" in rules/site-copy.json):
 # - ProSafetyMatch overlap
 # - DBA-proof "hard claim"
 # - arbeidsrelatie/gezag framing (niet het vakinhoudelijke toezicht)
-PATTERNS = {
-  "ProSafetyMatch overlap/CTA": [
-    r"\b(prosafetymatch)\b",
-    r"\b(meld\s+je\s+aan\s+voor\s+prosafetymatch)\b",
-    r"\b(bouw\s+mee\s+aan\s+prosafetymatch)\b",
-    r"\b(fundament|voorloper)\b.*\b(prosafetymatch)\b",
-  ],
-  "Harde juridische claim": [
-    r"\b(DBA[-\s]?proof)\b",
-    r"\b(100%\s+DBA)\b",
-    r"\b(garandeer(t)?\s+)\b",
-    r"\b(geen\s+enkel\s+risico)\b",
-  ],
-  # Alleen flaggen als 'gezag/aansturing' in dezelfde zin staat met arbeidsrelatie-signalen.
-  "Arbeidsrelatie/gezags-taal": [
-    r"\b(tarief|voorwaarden|rooster|planning|uren|werktijden|inbedding|opdracht)\b.*\b(gezag|aansturing|aansturen|leidinggevende)\b",
-    r"\b(gezag|aansturing|aansturen|leidinggevende)\b.*\b(tarief|voorwaarden|rooster|planning|uren|werktijden|inbedding|opdracht)\b",
-  ],
-  "Exclusiviteit/druk": [
-    r"\b(exclusief|exclusiviteit)\b",
-    r"\b(alleen\s+via|uitsluitend\s+via)\b",
-    r"\b(blacklist|zwarte\s+lijst)\b",
-    r"\b(kom\s+je\s+er\s+niet\s+meer\s+in|niet\s+meer\s+welkom)\b",
-  ],
-}
-
-@dataclass
-class Hit:
+RULES = rule_pack()
+PATTERNS: Dict[str, List[str]] = RULES.categories("content_audit")
+LABELS = rule_labels(PATTERNS)
+
+class Hit(NamedTuple):
   category: str
   pattern: str
   path: Path
   line_no: int
   line: str
 
+def new_hits() -> HitList:
+  # Zelfde veldvolgorde als make(categorie, patroon, plaats, regelnummer, regel).
+  return HitList(LABELS, Hit)
+
 def is_ignored(path: Path) -> bool:
   s = str(path).replace("\\", "/")
   return any(frag in s for frag in IGNORE_PATH_FRAGMENTS)
@@ -63,51 +53,92 @@ def is_in_site_scope(path: Path) -> bool:
   s = str(path).replace("\\", "/")
   return SITE_ROOT_FRAGMENT in s
 
-def iter_files(root: Path) -> Iterable[Path]:
-  for dirpath, dirnames, filenames in os.walk(root):
-    dirnames[:] = [d for d in dirnames if d not in EXCLUDE_DIRS]
-    for fn in filenames:
-      p = Path(dirpath) / fn
-      if p.suffix.lower() not in INCLUDE_EXT:
-        continue
-      if is_ignored(p):
-        continue
-      # Extra veiligheid: ook als iemand per ongeluk "." scant → alleen site scope.
-      if not is_in_site_scope(p):
-        continue
-      try:
-        if p.stat().st_size > MAX_FILE_SIZE_MB * 1024 * 1024:
-          continue
-      except OSError:
-        continue
-      yield p
-
-def scan_file(path: Path, compiled: List[Tuple[str, re.Pattern]]) -> List[Hit]:
-  hits: List[Hit] = []
+def is_candidate(p: Path) -> bool:
+  if p.suffix.lower() not in INCLUDE_EXT:
+    return False
+  if is_ignored(p):
+    return False
+  # Extra veiligheid: ook als iemand per ongeluk "." scant → alleen site scope.
+  # De eigenlijke scope ligt relatief aan de root (content_walk.scope_filter): iter_files
+  # en select_changed passen die toe, deze test is daar een ruimere ondergrens van.
+  if not is_in_site_scope(p):
+    return False
+  try:
+    if p.stat().st_size > MAX_FILE_SIZE_MB * 1024 * 1024:
+      return False
+  except OSError:
+    return False
+  return True
+
+def iter_files(root: Path, ignored: AbstractSet[str] | None = None) -> Iterable[Path]:
+  # is_candidate met de scope relatief aan root, gesnoeid en zonder Path/stat per bestand.
+  return walk_files(root, EXCLUDE_DIRS, INCLUDE_EXT, MAX_FILE_SIZE_MB * 1024 * 1024,
+                    ignore_fragments=IGNORE_PATH_FRAGMENTS, scope_fragment=SITE_ROOT_FRAGMENT,
+                    ignored=ignored)
+
+def compile_rules() -> RuleSet:
+  return RuleSet.from_mapping(PATTERNS, flags=RULES.flags("content_audit"))
+
+def rules_fingerprint() -> str:
+  # De hash van alle packs: flags en shared patronen bepalen het resultaat ook.
+  return fingerprint(RULES.hash, "content_audit")
+
+class FileScan:
+  """Per-regel verwerking van één bestand; ook gevoed door content_suite."""
+
+  def __init__(self, path: Path, rules: RuleSet):
+    self.path = path
+    self.rules = rules
+    self.hits = FileHits()
+
+  def feed(self, i: int, line: str) -> None:
+    # Trefwoord-prefilter: schone regels kosten één literal-search i.p.v. één search per patroon.
+    ids = self.rules.match_ids(line)
+    if ids:
+      self.hits.add(ids, i, line.strip())
+
+  def result(self) -> FileHits:
+    return self.hits
+
+def scan_file(path: Path, rules: RuleSet) -> FileHits | None:
+  # Bytes-prefilter: bestanden zonder enig trefwoord worden niet eens gedecodeerd (None = overgeslagen).
+  if not rules.could_match_file(path):
+    return None
+  scan = FileScan(path, rules)
   try:
-    text = path.read_text(encoding="utf-8", errors="ignore")
+    for i, line in iter_lines(path):
+      scan.feed(i, line)
   except Exception:
-    return hits
-  for i, line in enumerate(text.splitlines(), start=1):
-    for category, creg in compiled:
-      if creg.search(line):
-        hits.append(Hit(category, creg.pattern, path, i, line.strip()))
+    # Zelfde gedrag als voorheen: een onleesbaar bestand levert geen hits op.
+    return FileHits()
+  return scan.result()
+
+def watch_hits(path: Path, rules: RuleSet) -> List[WatchHit]:
+  return [WatchHit((h.category, h.pattern, h.line), h.line_no, f"[{h.category}] {h.line}")
+          for h in HitList(rules.labels, Hit).each(path, scan_file(path, rules))]
+
+def run_audit(roots: List[Path], jobs: int = 1, cache: ScanCache | None = None,
+              changed: ChangedLines | None = None, changed_lines_only: bool = False,
+              stats: ScanStats | None = None, gitignore: bool = False,
+              on_hit: Callable[[Hit], None] | None = None, options: ScanOptions | None = None) -> HitList:
+  """Alle hits onder roots; met on_hit gaat elke hit direct daarheen en blijft de lijst leeg."""
+  hits = new_hits()
+  if changed is None:
+    paths = [p for root in roots for p in iter_files(root, gitignored_paths(root) if gitignore else None)]
+  else:
+    paths = select_changed(changed, roots, EXCLUDE_DIRS, is_candidate, SITE_ROOT_FRAGMENT)
+  results = run_cached_scan(scan_file, paths, compile_rules, cache, jobs=jobs, empty=FileHits, stats=stats,
+                            options=options)
+  for p, file_hits in zip(paths, results):
+    keep = partial(on_changed_line, changed, True, p) if changed is not None and changed_lines_only else None
+    if on_hit is None:
+      hits.add(p, file_hits, keep)
+    else:
+      for h in hits.each(p, file_hits, keep):
+        on_hit(h)
   return hits
 
-def main() -> int:
-  # Je mag "app/(site)" meegeven, maar het script forceert scope sowieso.
-  roots = [Path(p).resolve() for p in (sys.argv[1:] or ["."])]
-
-  compiled: List[Tuple[str, re.Pattern]] = []
-  for cat, pats in PATTERNS.items():
-    for pat in pats:
-      compiled.append((cat, re.compile(pat, re.IGNORECASE)))
-
-  all_hits: List[Hit] = []
-  for root in roots:
-    for p in iter_files(root):
-      all_hits.extend(scan_file(p, compiled))
-
+def print_report(roots: List[Path], all_hits: HitList) -> int:
   print("="*90)
   print("SITE-COPY CONTENT AUDIT REPORT (scope: app/(site), blogs ignored)")
   for r in roots:
@@ -118,9 +149,7 @@ def main() -> int:
     print("✅ Geen matches op ingestelde site-copy patronen.")
     return 0
 
-  by_cat = {}
-  for h in all_hits:
-    by_cat.setdefault(h.category, []).append(h)
+  by_cat = all_hits.by_category()
 
   print(f"⚠️  Totaal hits: {len(all_hits)}\n")
   for cat in sorted(by_cat.keys()):
@@ -135,6 +164,58 @@ def main() -> int:
     print()
   return 2
 
+def main() -> int:
+  ap = argparse.ArgumentParser(formatter_class=HelpFormatter)
+  # Je mag "app/(site)" meegeven, maar het script forceert scope sowieso.
+  ap.add_argument("roots", nargs="*", default=["."])
+  add_jobs_argument(ap)
+  add_visible_argument(ap)
+  add_cache_arguments(ap)
+  add_git_arguments(ap)
+  add_stats_argument(ap)
+  add_format_argument(ap)
+  add_profile_arguments(ap)
+  add_watch_arguments(ap)
+  args = ap.parse_args()
+  profile = start_profile(args)
+  options = scan_options(args, profile)
+  roots = [Path(p).resolve() for p in args.roots]
+
+  if args.watch:
+    with scan_context(options):
+      rules = compile_rules()
+      return watch_loop(roots, lambda: [p for root in roots for p in iter_files(root, walk_ignored(args, root))],
+                        lambda p: watch_hits(p, rules), interval=args.watch_interval)
+
+  try:
+    changed = git_scope(args, roots[0])
+  except GitScopeError as e:
+    print("git diff mislukt:", e)
+    return 1
+  options.blobs = staged_blobs(changed)
+
+  cache = open_cache(args, "content_audit", rules_fingerprint())
+  stats = ScanStats()
+  try:
+    if args.format == "text":
+      code = print_report(roots, run_audit(roots, args.jobs, cache, changed, args.changed_lines_only, stats,
+                                           args.gitignore, options=options))
+    else:
+      # Streamen: hits gaan direct naar stdout, alleen tellingen blijven staan.
+      stream = HitStream(args.format, "content_audit", PATTERNS)
+      run_audit(roots, args.jobs, cache, changed, args.changed_lines_only, stats, args.gitignore,
+                on_hit=lambda h: stream.hit(h.category, h.path, h.line_no, h.line, h.pattern), options=options)
+      code = 2 if stream.total else 0
+      stream.close(code, roots=[str(r) for r in roots])
+  finally:
+    if cache:
+      cache.close()
+
+  if args.stats:
+    print(stats.footer(), file=stats_out(args.format))
+  finish_profile(profile, args, stats_out(args.format))
+  return code
+
 if __name__ == "__main__":
   raise SystemExit(main())
 
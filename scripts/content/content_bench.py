@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark voor de content-audits op een synthetische app/(site)-boom.
+
+Zonder --sizes: vergelijkt de oude scan (één re.search per patroon per regel) met de
+RuleSet-engine uit content_scan en controleert dat beide exact dezelfde hits opleveren.
+
+Met --sizes: timet elk commando (content_audit, conscious, freeze audit/funnelcheck/
+apply/soften, suite) per boomgrootte in een vers proces en rapporteert wandtijd,
+bestanden/s, MB/s en piek-RSS. Met --save/--compare vang je regressies in CI.
+
+Met --startup: start elk script --runs keer koud (python -X importtime) op een kleine
+boom, zoals een hook dat doet, en rapporteert de snelste wandtijd, de totale importtijd
+en de traagste imports. Werkt ook met --save/--compare.
+
+  python scripts/content/content_bench.py --files 100000
+  python scripts/content/content_bench.py --sizes 1000,10000,100000 --save bench.json
+  python scripts/content/content_bench.py --sizes 10000 --compare bench.json --tolerance 0.25
+  python scripts/content/content_bench.py --startup --save startup.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import content_audit
+
+try:
+    import resource
+except ImportError:  # Windows: geen piek-RSS
+    resource = None
+
+# ============================================================
+# Synthetische site-boom
+# ============================================================
+
+FILLER = [
+    "Een brandwacht werkt zelfstandig en kiest bewust voor opdrachten.",
+    "Heldere afspraken over inzet, rolverdeling en verantwoordelijkheden.",
+    "Opdrachtgevers en brandwachten stemmen de context vooraf af.",
+    "<p className=\"text-slate-300\">Lees meer over veiligheid op locatie.</p>",
+    "import Link from 'next/link'",
+    "export const metadata = { title: 'ProBrandwacht' }",
+    "      <section className=\"mx-auto max-w-5xl px-4\">",
+    "      </section>",
+]
+
+TRIGGERS = [
+    "Meld je aan voor ProSafetyMatch en bouw mee.",
+    "Deze werkwijze is 100% DBA-proof.",
+    "Het tarief wordt bepaald onder gezag van de leidinggevende.",
+    "Opdrachten lopen uitsluitend via ons platform.",
+    "Je staat dan op de zwarte lijst.",
+    "Wij garanderen geen enkel risico.",
+]
+
+
+# Triggers voor PATTERNS (content_audit/freeze), AUDIT_RULES (conscious), funnel en soften.
+COPY_TRIGGERS = TRIGGERS + [
+    "Je kiest zelf je eigen tarief en voorwaarden.",
+    "Dit geeft zekerheid zonder risico.",
+    "ProSafetyMatch bundelt aanvragen en regelt de planning.",
+    "Het platform is in ontwikkeling en kan straks meer.",
+    "Blijf op de hoogte via de wachtlijst.",
+    "Bouw mee aan ProSafetyMatch als voorloper van de markt.",
+    "Onder druk van de belastingdienst ontstaat angst.",
+    "Een raamovereenkomst is niet nodig.",
+]
+
+CTA_LINES = [
+    "Meld je aan voor de interesselijst.",
+    "Wil je blijven? Blijf op de hoogte.",
+]
+
+QUESTION_LINES = [
+    "Past deze manier van werken bij jou?",
+    "Welke rolverdeling spreek je vooraf af?",
+]
+
+JSON_LD = """const jsonLd = {
+  "@context": "https://schema.org",
+  "@type": "Service",
+  "name": "Brandwacht inhuren",
+  "areaServed": "NL",
+};"""
+
+PAGE_HEAD = """import Link from 'next/link'
+import type { Metadata } from 'next'
+
+export const metadata: Metadata = { title: 'ProBrandwacht', description: 'Zelfstandige brandwachten' }
+"""
+
+MDX_HEAD = """---
+title: "Werken als zelfstandige brandwacht"
+description: "Heldere afspraken over inzet en verantwoordelijkheden."
+---
+"""
+
+
+def _copy_line(rnd: random.Random, density: float, triggers: List[str]) -> str:
+    if rnd.random() < density:
+        return rnd.choice(triggers)
+    if rnd.random() < 0.01:
+        return rnd.choice(CTA_LINES + QUESTION_LINES)
+    return rnd.choice(FILLER)
+
+
+def generate_tree(root: Path, files: int, lines: int = 40, density: float = 0.02,
+                  seed: int = 1, realistic: bool = False) -> Path:
+    """
+    Bouw `files` bestanden onder root/app/(site) met `density` triggerregels.
+    realistic=True: geneste routes, page.tsx met JSON-LD, ~1 op 5 als .mdx, en triggers
+    voor alle regelsets (niet alleen content_audit).
+    """
+    rnd = random.Random(seed)
+    site = root / "app" / "(site)"
+    triggers = COPY_TRIGGERS if realistic else TRIGGERS
+    for n in range(files):
+        if realistic:
+            d = site / f"sectie-{n % 31}" / f"groep-{(n // 31) % 17}" / f"route-{n // 527}"
+        else:
+            d = site / f"sectie-{n % 97}" / f"route-{n // 97}"
+        d.mkdir(parents=True, exist_ok=True)
+        body = [_copy_line(rnd, density, triggers) for _ in range(lines)]
+        if not realistic:
+            (d / "page.tsx").write_text("\n".join(body) + "\n", encoding="utf-8")
+        elif n % 5 == 4:
+            (d / f"artikel-{n}.mdx").write_text(MDX_HEAD + "\n".join(body) + "\n", encoding="utf-8")
+        else:
+            jsx = [f"        <p>{line}</p>" if not line.lstrip().startswith(("<", "import", "export")) else line
+                   for line in body]
+            text = (PAGE_HEAD + "\n" + JSON_LD + "\n\nexport default function Page() {\n  return (\n    <main>\n"
+                    + "\n".join(jsx) + "\n    </main>\n  )\n}\n")
+            (d / "page.tsx").write_text(text, encoding="utf-8")
+    return site
+
+
+def tree_size(site: Path) -> Tuple[int, int]:
+    """(aantal bestanden, bytes) onder site."""
+    files = 0
+    size = 0
+    for dirpath, _, filenames in os.walk(site):
+        for fn in filenames:
+            files += 1
+            size += os.path.getsize(os.path.join(dirpath, fn))
+    return files, size
+
+# ============================================================
+# Baseline (oude engine)
+# ============================================================
+
+def legacy_scan_file(path: Path, compiled: List[Tuple[str, re.Pattern]]) -> List[content_audit.Hit]:
+    hits: List[content_audit.Hit] = []
+    text = path.read_text(encoding="utf-8", errors="ignore")
+    for i, line in enumerate(text.splitlines(), start=1):
+        for category, creg in compiled:
+            if creg.search(line):
+                hits.append(content_audit.Hit(category, creg.pattern, path, i, line.strip()))
+    return hits
+
+
+def engine_scan(paths: List[Path], rules) -> content_audit.HitList:
+    hits = content_audit.new_hits()
+    for p in paths:
+        hits.add(p, content_audit.scan_file(p, rules))
+    return hits
+
+
+def timed(fn) -> Tuple[float, object]:
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+# ============================================================
+# Commando-benchmark
+# ============================================================
+
+def _run_content_audit(site: Path, jobs: int) -> None:
+    content_audit.run_audit([site], jobs=jobs)
+
+
+def _run_conscious(site: Path, jobs: int) -> None:
+    import content_conscious_audit
+    content_conscious_audit.run_audit(site, jobs=jobs)
+
+
+def _run_freeze(cmd: str) -> Callable[[Path, int], None]:
+    def run(site: Path, jobs: int) -> None:
+        import freeze_site_copy as f
+        if cmd == "audit":
+            f.command_audit(site, jobs)
+        elif cmd == "funnelcheck":
+            f.command_funnelcheck(site, jobs)
+        elif cmd == "apply":
+            f.command_apply(site, dry_run=True, jobs=jobs)
+        else:
+            f.command_soften(site, dry_run=True, jobs=jobs)
+    return run
+
+
+def _run_suite(site: Path, jobs: int) -> None:
+    import content_suite
+    argv = sys.argv
+    sys.argv = ["content_suite.py", "all", "--root", str(site), "--no-cache", "--jobs", str(jobs)]
+    try:
+        content_suite.main()
+    finally:
+        sys.argv = argv
+
+
+COMMANDS: Dict[str, Callable[[Path, int], None]] = {
+    "content_audit": _run_content_audit,
+    "conscious": _run_conscious,
+    "freeze audit": _run_freeze("audit"),
+    "freeze funnelcheck": _run_freeze("funnelcheck"),
+    "freeze apply": _run_freeze("apply"),
+    "freeze soften": _run_freeze("soften"),
+    "suite all": _run_suite,
+}
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return float("nan")
+    # ru_maxrss is KB op Linux, bytes op macOS; workers (--jobs) tellen via CHILDREN mee.
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / scale
+
+
+def _measure(command: str, site: str, jobs: int) -> Tuple[float, float]:
+    """Draait in een vers (spawn-)proces: (wandtijd, piek-RSS in MB)."""
+    fn = COMMANDS[command]
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        t0 = time.perf_counter()
+        fn(Path(site), jobs)
+        wall = time.perf_counter() - t0
+    return wall, _peak_rss_mb()
+
+
+def measure(command: str, site: Path, jobs: int = 1) -> Tuple[float, float]:
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(_measure, command, str(site), jobs).result()
+
+
+def bench_commands(sizes: List[int], commands: List[str], lines: int, density: float,
+                   jobs: int = 1) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix="content-bench-") as tmp:
+            t_gen, site = timed(lambda: generate_tree(Path(tmp), size, lines, density, realistic=True))
+            files, nbytes = tree_size(site)
+            print(f"\n=== {files} bestanden, {nbytes / 1e6:.1f} MB (gegenereerd in {t_gen:.1f}s) ===")
+            print(f"{'commando':<20} {'wand (s)':>9} {'best./s':>10} {'MB/s':>8} {'piek-RSS':>10}")
+            for command in commands:
+                wall, rss = measure(command, site, jobs)
+                row = {"size": size, "command": command, "files": files, "bytes": nbytes,
+                       "wall_s": round(wall, 4), "files_per_s": round(files / wall, 1),
+                       "mb_per_s": round(nbytes / 1e6 / wall, 2), "peak_rss_mb": round(rss, 1)}
+                results.append(row)
+                print(f"{command:<20} {wall:>9.2f} {row['files_per_s']:>10.0f} {row['mb_per_s']:>8.1f} "
+                      f"{rss:>8.0f}MB")
+    return results
+
+
+def compare_results(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> int:
+    """1 als een commando meer dan `tolerance` trager is dan de baseline (zelfde grootte)."""
+    base = {(r["size"], r["command"]): r for r in baseline}
+    regressions = 0
+    print("\n=== Vergelijking met baseline ===")
+    for r in results:
+        b = base.get((r["size"], r["command"]))
+        if b is None:
+            continue
+        ratio = r["wall_s"] / b["wall_s"] if b["wall_s"] else float("inf")
+        flag = "❌" if ratio > 1 + tolerance else "✅"
+        regressions += ratio > 1 + tolerance
+        print(f"{flag} {r['command']:<20} {r['size']:>7}  {b['wall_s']:.2f}s → {r['wall_s']:.2f}s  ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+# ============================================================
+# Opstarttijd
+# ============================================================
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Zoals een hook ze aanroept: vers proces, standaardcache onder de werkmap.
+STARTUP_COMMANDS: Dict[str, List[str]] = {
+    "content_audit": ["content_audit.py", "{site}"],
+    "conscious": ["content_conscious_audit.py", "--root", "{site}"],
+    "freeze audit": ["freeze_site_copy.py", "audit", "--root", "{site}"],
+    "freeze funnelcheck": ["freeze_site_copy.py", "funnelcheck", "--root", "{site}"],
+    "suite all": ["content_suite.py", "all", "--root", "{site}"],
+}
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, float]]:
+    """(module, eigen importtijd in ms) per regel van -X importtime."""
+    out = []
+    for line in stderr.splitlines():
+        m = IMPORTTIME_RE.match(line)
+        if m:
+            out.append((m.group(4), int(m.group(1)) / 1000))
+    return out
+
+
+def measure_startup(command: str, site: Path, runs: int) -> Tuple[float, List[Tuple[str, float]]]:
+    """Snelste van `runs` koude starts: (wandtijd, importtijden van die run)."""
+    script, *rest = STARTUP_COMMANDS[command]
+    argv = [sys.executable, "-X", "importtime", str(SCRIPTS_DIR / script)] + [a.format(site=site) for a in rest]
+    best: Tuple[float, List[Tuple[str, float]]] = (float("inf"), [])
+    # Eén extra run vooraf vult de cache en het rule-artefact, zoals bij een hook in een werkboom.
+    for _ in range(runs + 1):
+        t0 = time.perf_counter()
+        proc = subprocess.run(argv, cwd=site.parents[1], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                              text=True)
+        wall = time.perf_counter() - t0
+        best = min(best, (wall, parse_importtime(proc.stderr)), key=itemgetter(0))
+    return best
+
+
+def bench_startup(sizes: List[int], commands: List[str], runs: int, top: int = 3) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix="content-bench-") as tmp:
+            site = generate_tree(Path(tmp), size, realistic=True)
+            files, nbytes = tree_size(site)
+            print(f"\n=== opstarttijd, {files} bestanden (beste van {runs}) ===")
+            print(f"{'commando':<20} {'wand (ms)':>10} {'imports (ms)':>13}  traagste imports")
+            for command in commands:
+                wall, imports = measure_startup(command, site, runs)
+                import_ms = sum(ms for _, ms in imports)
+                slowest = sorted(imports, key=itemgetter(1), reverse=True)[:top]
+                row = {"size": size, "command": f"startup {command}", "files": files, "bytes": nbytes,
+                       "wall_s": round(wall, 4), "import_ms": round(import_ms, 1),
+                       "top_imports": [[mod, round(ms, 1)] for mod, ms in slowest]}
+                results.append(row)
+                print(f"{command:<20} {wall * 1000:>10.1f} {import_ms:>13.1f}  "
+                      + ", ".join(f"{mod} {ms:.1f}" for mod, ms in slowest))
+    return results
+
+# ============================================================
+# Main
+# ============================================================
+
+def bench_engine(args) -> int:
+    with tempfile.TemporaryDirectory(prefix="content-bench-") as tmp:
+        t_gen, site = timed(lambda: generate_tree(Path(tmp), args.files, args.lines, args.density))
+        paths = list(content_audit.iter_files(site))
+        print(f"Boom: {len(paths)} bestanden in {t_gen:.1f}s gegenereerd")
+
+        compiled = [(cat, re.compile(p, re.IGNORECASE))
+                    for cat, pats in content_audit.PATTERNS.items() for p in pats]
+        rules = content_audit.compile_rules()
+
+        t_old, old = timed(lambda: [h for p in paths for h in legacy_scan_file(p, compiled)])
+        t_new, new = timed(lambda: list(engine_scan(paths, rules)))
+
+    same = [(h.category, h.pattern, h.path, h.line_no) for h in old] == \
+           [(h.category, h.pattern, h.path, h.line_no) for h in new]
+    print(f"per-patroon : {t_old:8.2f}s  ({len(old)} hits)")
+    print(f"RuleSet     : {t_new:8.2f}s  ({len(new)} hits)")
+    print(f"speedup     : {t_old / t_new:8.2f}x")
+    print("hits identiek" if same else "❌ hits wijken af")
+    return 0 if same else 1
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=100_000)
+    ap.add_argument("--lines", type=int, default=40, help="regels per bestand")
+    ap.add_argument("--density", type=float, default=0.02, help="aandeel triggerregels")
+    ap.add_argument("--sizes", default=None,
+                    help="commando-benchmark voor deze boomgroottes, bv. 1000,10000,100000")
+    ap.add_argument("--commands", default=None,
+                    help=f"komma-gescheiden subset van: {', '.join(COMMANDS)} (standaard: alle)")
+    ap.add_argument("--jobs", "-j", type=int, default=1, help="--jobs voor elk commando")
+    ap.add_argument("--startup", action="store_true",
+                    help="koude start per commando meten met -X importtime (wand- en importtijd)")
+    ap.add_argument("--runs", type=int, default=10, help="aantal starts per commando bij --startup")
+    ap.add_argument("--save", default=None, help="resultaten als JSON wegschrijven")
+    ap.add_argument("--compare", default=None, help="baseline-JSON (van --save) om tegen te vergelijken")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="toegestane vertraging t.o.v. baseline")
+    args = ap.parse_args()
+
+    if args.sizes is None and not args.startup:
+        return bench_engine(args)
+
+    sizes = [int(s.replace("k", "000")) for s in (args.sizes or "100").split(",") if s]
+    known = STARTUP_COMMANDS if args.startup else COMMANDS
+    if args.commands is None:
+        commands = list(known)
+    else:
+        commands = [c.strip() for c in args.commands.split(",") if c.strip()]
+    unknown = [c for c in commands if c not in known]
+    if unknown:
+        print("Onbekende commando's:", ", ".join(unknown))
+        return 1
+
+    if args.startup:
+        results = bench_startup(sizes, commands, args.runs)
+    else:
+        results = bench_commands(sizes, commands, args.lines, args.density, args.jobs)
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        return compare_results(results, baseline, args.tolerance)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
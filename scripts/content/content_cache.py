@@ -0,0 +1,620 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incrementele cache voor de content-audits.
+
+Per bestand bewaren we het scanresultaat in een SQLite-bestand onder .cache/. Een
+entry is geldig zolang pad, mtime, grootte én de fingerprint van de regelset gelijk
+zijn; een aanpassing in de rule-packs (rules/*.json) geeft een nieuwe fingerprint en maakt
+daarmee automatisch alle oude entries ongeldig. Warme runs scannen alleen wat
+veranderd is.
+
+BlobCache (content_history) staat in hetzelfde bestand, maar per git-blob-sha.
+
+Met --store DIR komt daar een ContentStore achter: resultaten op inhoud (git-blob-sha van
+het bestand + regelfingerprint) in een gewone map, onafhankelijk van pad, mtime en branch.
+Die map is als één archief te exporteren en elders te importeren, zodat CI-runners en
+andere checkouts elkaars resultaten hergebruiken voor ongewijzigde bestanden:
+
+  python scripts/content/content_cache.py stats  --store .cache/content-store
+  python scripts/content/content_cache.py export --store .cache/content-store store.tar.gz
+  python scripts/content/content_cache.py import --store .cache/content-store store.tar.gz
+  python scripts/content/content_cache.py prune  --store .cache/content-store --store-max-mb 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import re
+import time
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from content_scan import FileHits, ScanOptions, ScanStats, identity, run_scan, text_mode
+
+R = TypeVar("R")
+
+DEFAULT_CACHE_PATH = Path(".cache") / "content-audit.sqlite"
+DEFAULT_STORE_DIR = Path(".cache") / "content-store"
+DEFAULT_STORE_MAX_MB = 512
+
+# Ophogen als de vorm van de opgeslagen resultaten verandert.
+CACHE_VERSION = 5
+
+# ============================================================
+# Fingerprint
+# ============================================================
+
+def fingerprint(*parts: Any) -> str:
+    """Stabiele hash over regels (dicts/lijsten/strings) plus de cacheversie."""
+    h = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for part in parts:
+        h.update(b"\0")
+        h.update(repr(part).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+# ============================================================
+# Cache
+# ============================================================
+
+# sqlite3 en pickle pas laden als er een cache open gaat: een run met --no-cache
+# (of een import als API) heeft ze niet nodig.
+
+def _pickle(value: Any) -> bytes:
+    import pickle
+
+    return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _unpickle(payload: bytes) -> Any:
+    import pickle
+
+    return pickle.loads(payload)
+
+
+class ScanCache:
+    """
+    Per-bestand resultaten, gegroepeerd per namespace (script + root). Met een store
+    wordt een bestand zonder geldige entry eerst op inhoud opgezocht; variant is wat
+    het resultaat naast inhoud en regels bepaalt (bv. de rapporten van de suite).
+    """
+
+    def __init__(self, path: Path, namespace: str, rules_hash: str, store: Optional[ContentStore] = None):
+        import sqlite3
+
+        self.path = path
+        self.namespace = namespace
+        self.rules_hash = rules_hash
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._store_keys: Dict[Tuple[str, str], str] = {}
+        self._shas: Dict[str, Tuple[str, str]] = {}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " namespace TEXT, path TEXT, mtime_ns INTEGER, size INTEGER,"
+            " rules TEXT, payload BLOB, PRIMARY KEY (namespace, path))"
+        )
+        self._pending: List[Tuple[str, str, int, int, str, bytes]] = []
+
+    @staticmethod
+    def _stat(p: Path) -> Optional[os.stat_result]:
+        try:
+            return p.stat()
+        except OSError:
+            return None
+
+    def get(self, p: Path, variant: str = "") -> Tuple[bool, Any]:
+        st = self._stat(p)
+        row = None if st is None else self.db.execute(
+            "SELECT mtime_ns, size, rules, payload FROM results WHERE namespace = ? AND path = ?",
+            (self.namespace, str(p)),
+        ).fetchone()
+        if row and row[:3] == (st.st_mtime_ns, st.st_size, self.rules_hash):
+            try:
+                value = _unpickle(row[3])
+            except Exception:
+                value = None
+            else:
+                self.hits += 1
+                return True, value
+        if self.store is not None and st is not None:
+            found, value = self._from_store(p, st, variant)
+            if found:
+                self.hits += 1
+                return True, value
+        self.misses += 1
+        return False, None
+
+    def _store_key(self, p: Path, variant: str) -> str:
+        # De extensie telt mee: --visible-only/--sentences extraheren per bestandstype.
+        k = (p.suffix.lower(), variant)
+        key = self._store_keys.get(k)
+        if key is None:
+            key = self._store_keys[k] = fingerprint(self.rules_hash, *k)
+        return key
+
+    def _from_store(self, p: Path, st: os.stat_result, variant: str) -> Tuple[bool, Any]:
+        try:
+            data = p.read_bytes()
+        except OSError:
+            return False, None
+        key, sha = self._store_key(p, variant), blob_sha(data)
+        found, value = self.store.get(key, sha)
+        if found:
+            # Meteen ook een gewone entry: de volgende run hoeft niet te hashen.
+            self._pending.append((self.namespace, str(p), st.st_mtime_ns, st.st_size, self.rules_hash, _pickle(value)))
+            return True, value
+        self._shas[str(p)] = (key, sha)
+        return False, None
+
+    def put(self, p: Path, value: Any) -> None:
+        st = self._stat(p)
+        if st is None:
+            return
+        payload = _pickle(value)
+        self._pending.append((self.namespace, str(p), st.st_mtime_ns, st.st_size, self.rules_hash, payload))
+        stored = self._shas.pop(str(p), None)
+        if stored is not None:
+            self.store.put(*stored, value)
+
+    def close(self) -> None:
+        if self._pending:
+            self.db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", self._pending)
+            self._pending.clear()
+        self.db.commit()
+        self.db.close()
+        if self.store is not None:
+            self.store.close()
+
+
+class MemoryCache:
+    """
+    Zelfde interface als ScanCache, maar in het geheugen van een langlevend proces
+    (content_daemon). De regels kunnen daar niet veranderen, dus alleen mtime + grootte.
+    """
+
+    def __init__(self) -> None:
+        self.entries: Dict[str, Tuple[int, int, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, p: Path, variant: str = "") -> Tuple[bool, Any]:
+        st = ScanCache._stat(p)
+        entry = None if st is None else self.entries.get(str(p))
+        if entry and entry[:2] == (st.st_mtime_ns, st.st_size):
+            self.hits += 1
+            return True, entry[2]
+        self.misses += 1
+        return False, None
+
+    def put(self, p: Path, value: Any) -> None:
+        st = ScanCache._stat(p)
+        if st is not None:
+            self.entries[str(p)] = (st.st_mtime_ns, st.st_size, value)
+
+    def close(self) -> None:
+        pass
+
+
+class BlobCache:
+    """
+    Resultaten per git-blob (content_history). De inhoud van een blob ligt vast, dus
+    sha + regelfingerprint + soort resultaat is de hele sleutel: geen mtime/grootte,
+    en dezelfde blob in honderd commits of op twee branches is één entry.
+    """
+
+    def __init__(self, path: Path, rules_hash: str):
+        import sqlite3
+
+        self.path = path
+        self.rules_hash = rules_hash
+        self.hits = 0
+        self.misses = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            " sha TEXT, rules TEXT, kind TEXT, payload BLOB, PRIMARY KEY (sha, rules, kind)) WITHOUT ROWID"
+        )
+        self._pending: List[Tuple[str, str, str, bytes]] = []
+
+    def get(self, sha: str, kind: str) -> Tuple[bool, Any]:
+        row = self.db.execute(
+            "SELECT payload FROM blobs WHERE sha = ? AND rules = ? AND kind = ?", (sha, self.rules_hash, kind)
+        ).fetchone()
+        if row:
+            try:
+                value = _unpickle(row[0])
+            except Exception:
+                pass
+            else:
+                self.hits += 1
+                return True, value
+        self.misses += 1
+        return False, None
+
+    def put(self, sha: str, kind: str, value: Any) -> None:
+        self._pending.append((sha, self.rules_hash, kind, _pickle(value)))
+
+    def close(self) -> None:
+        if self._pending:
+            self.db.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?)", self._pending)
+            self._pending.clear()
+        self.db.commit()
+        self.db.close()
+
+
+# ============================================================
+# Content-store
+# ============================================================
+
+# <sleutel>/<sha[:2]>/<sha[2:]>: sleutel = fingerprint(regels, extensie, variant), sha = git-blob-sha.
+STORE_ENTRY_RE = re.compile(r"[0-9a-f]{16}/[0-9a-f]{2}/[0-9a-f]{38}")
+
+
+# Entries komen van andere checkouts en CI, dus alleen data: JSON met getagde objecten
+# ({"hits", "text"} = FileHits, {"tuple"}, {"dict"}), bij het laden streng gecontroleerd.
+
+def encode_result(value: Any) -> bytes:
+    """Resultaat van een scanfunctie als JSON; TypeError voor iets anders dan de bekende vormen."""
+    import json
+
+    return json.dumps(_to_data(value), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _to_data(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, FileHits):
+        rows, text = value.__getstate__()
+        return {"hits": rows.tolist(), "text": text}
+    if isinstance(value, tuple):
+        return {"tuple": [_to_data(v) for v in value]}
+    if isinstance(value, list):
+        return [_to_data(v) for v in value]
+    if isinstance(value, dict) and all(isinstance(k, str) for k in value):
+        return {"dict": {k: _to_data(v) for k, v in value.items()}}
+    raise TypeError(f"niet op te slaan in de content-store: {type(value).__name__}")
+
+
+def decode_result(payload: bytes) -> Any:
+    """Omgekeerde van encode_result; ValueError bij alles wat daar niet uit kan komen."""
+    import json
+
+    return _from_data(json.loads(payload.decode("utf-8")))
+
+
+def _from_data(data: Any) -> Any:
+    if data is None or isinstance(data, (bool, int, str)):
+        return data
+    if isinstance(data, list):
+        return [_from_data(v) for v in data]
+    if not isinstance(data, dict):
+        raise ValueError(f"onverwacht {type(data).__name__} in content-store-entry")
+    if data.keys() == {"hits", "text"}:
+        return _file_hits(data["hits"], data["text"])
+    if data.keys() == {"tuple"} and isinstance(data["tuple"], list):
+        return tuple(_from_data(v) for v in data["tuple"])
+    if data.keys() == {"dict"} and isinstance(data["dict"], dict):
+        return {k: _from_data(v) for k, v in data["dict"].items()}
+    raise ValueError(f"onbekend object in content-store-entry: {sorted(data)}")
+
+
+def _file_hits(rows: Any, text: Any) -> FileHits:
+    if not isinstance(text, str) or not isinstance(rows, list) or len(rows) % 4:
+        raise ValueError("ongeldige hits in content-store-entry")
+    if not all(type(n) is int and 0 <= n < 1 << 32 for n in rows):
+        raise ValueError("ongeldige hits in content-store-entry")
+    if not all(rows[k + 2] <= rows[k + 3] <= len(text) for k in range(0, len(rows), 4)):
+        raise ValueError("hits buiten de tekst in content-store-entry")
+    return FileHits(array("I", rows), text)
+
+
+def blob_sha(data: bytes) -> str:
+    """Git-blob-sha van data, zoals `git hash-object` (dezelfde sha als in content_history)."""
+    h = hashlib.sha1(b"blob %d\0" % len(data))
+    h.update(data)
+    return h.hexdigest()
+
+
+class ContentStore:
+    """
+    Resultaten op inhoud in een map, één JSON-bestand (encode_result) per entry. Pad,
+    mtime en branch doen niet mee, dus de map is bruikbaar op elke checkout met dezelfde
+    regels; een entry die niet door decode_result komt, telt als miss. Een hit
+    zet de mtime van de entry op nu; prune gooit de langst niet gebruikte entries weg tot
+    de map onder max_bytes zit (LRU). Schrijven gaat via een tijdelijk bestand + rename,
+    zodat parallelle runs op dezelfde map elkaar niet halve entries laten lezen.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_STORE_MAX_MB << 20):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.written = 0
+
+    def entry(self, key: str, sha: str) -> Path:
+        return self.root / key / sha[:2] / sha[2:]
+
+    def get(self, key: str, sha: str) -> Tuple[bool, Any]:
+        path = self.entry(key, sha)
+        try:
+            with open(path, "rb") as fh:
+                value = decode_result(fh.read())
+            os.utime(path)
+        except (OSError, ValueError):
+            # Ontbreekt, of geen geldige entry: gewoon opnieuw scannen (en overschrijven).
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, value
+
+    def put(self, key: str, sha: str, value: Any) -> None:
+        try:
+            payload = encode_result(value)
+        except TypeError:
+            return
+        self.write(key, sha, payload)
+
+    def write(self, key: str, sha: str, payload: bytes) -> None:
+        path = self.entry(key, sha)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(payload)
+            os.replace(tmp, path)
+        except OSError:
+            # Volle schijf, read-only map e.d.: dan alleen deze entry niet.
+            return
+        self.written += len(payload)
+
+    def entries(self) -> List[Tuple[float, int, Path]]:
+        """(mtime, grootte, pad) van alle entries."""
+        out = []
+        for top in os.scandir(self.root) if self.root.is_dir() else ():
+            if not top.is_dir():
+                continue
+            for sub in os.scandir(top.path):
+                if not sub.is_dir():
+                    continue
+                for e in os.scandir(sub.path):
+                    if e.name.startswith("."):
+                        continue
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    out.append((st.st_mtime, st.st_size, Path(e.path)))
+        return out
+
+    def prune(self, max_bytes: Optional[int] = None) -> Tuple[int, int]:
+        """Oudste entries weg tot de map onder max_bytes zit; geeft (aantal, bytes) terug."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= limit:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            removed += 1
+            freed += size
+        return removed, freed
+
+    def export_archive(self, archive: Path) -> int:
+        """Alle entries in één tar(.gz); mtimes gaan mee, dus de LRU-volgorde ook."""
+        import tarfile
+
+        entries = self.entries()
+        mode = "w:gz" if archive.name.endswith((".gz", ".tgz")) else "w"
+        with tarfile.open(archive, mode) as tar:
+            for _, _, path in sorted(entries, key=lambda e: e[2]):
+                tar.add(path, arcname=path.relative_to(self.root).as_posix(), recursive=False)
+        return len(entries)
+
+    def import_archive(self, archive: Path) -> Tuple[int, int]:
+        """Entries uit een archief erbij; bestaande blijven staan. Geeft (nieuw, overgeslagen)."""
+        import tarfile
+
+        added = skipped = 0
+        with tarfile.open(archive, "r:*") as tar:
+            for member in tar:
+                # Alleen gewone bestanden in de verwachte vorm (geen paden buiten de map, links,
+                # devices e.d.) met een geldige entry erin.
+                if not member.isfile() or not STORE_ENTRY_RE.fullmatch(member.name):
+                    skipped += 1
+                    continue
+                path = self.root / member.name
+                if path.exists():
+                    skipped += 1
+                    continue
+                payload = tar.extractfile(member).read()
+                try:
+                    decode_result(payload)
+                except ValueError:
+                    skipped += 1
+                    continue
+                key, prefix, rest = member.name.split("/")
+                self.write(key, prefix + rest, payload)
+                try:
+                    os.utime(path, (member.mtime, member.mtime))
+                except OSError:
+                    pass
+                added += 1
+        return added, skipped
+
+    def close(self) -> None:
+        if self.written:
+            self.prune()
+            self.written = 0
+
+
+def open_store(args) -> Optional[ContentStore]:
+    """ContentStore volgens --store/--store-max-mb, of None."""
+    if getattr(args, "store", None) is None:
+        return None
+    return ContentStore(Path(args.store), args.store_max_mb << 20)
+
+
+def open_blob_cache(args, rules_hash: str) -> Optional[BlobCache]:
+    """BlobCache in hetzelfde bestand als de scancache, of None (uit of niet beschikbaar)."""
+    if args.no_cache:
+        return None
+    import sqlite3
+
+    try:
+        return BlobCache(Path(args.cache), rules_hash)
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def open_cache(args, namespace: str, rules_hash: str) -> Optional[ScanCache]:
+    """Cache volgens de CLI-opties, of None (uit of niet beschikbaar)."""
+    if args.no_cache or getattr(args, "staged", False):
+        # --staged scant blobs uit de index; de cache kent alleen de bestanden op schijf.
+        return None
+    mode = text_mode(args)
+    if mode:
+        # Andere invoer voor dezelfde regels: eigen entries.
+        from content_extract import EXTRACT_VERSION
+
+        rules_hash = fingerprint(rules_hash, mode, EXTRACT_VERSION)
+    import sqlite3
+
+    try:
+        return ScanCache(Path(args.cache), namespace, rules_hash, open_store(args))
+    except (OSError, sqlite3.Error):
+        # Read-only checkout e.d.: gewoon zonder cache draaien.
+        return None
+
+
+def add_store_arguments(parser) -> None:
+    parser.add_argument("--store", metavar="DIR",
+                        help=f"content-store op inhoud, te delen tussen branches/CI (bv. {DEFAULT_STORE_DIR})")
+    parser.add_argument("--store-max-mb", type=int, default=DEFAULT_STORE_MAX_MB,
+                        help=f"maximale grootte van de content-store (LRU, default {DEFAULT_STORE_MAX_MB})")
+
+
+def add_cache_arguments(parser, store: bool = True) -> None:
+    parser.add_argument("--cache", default=str(DEFAULT_CACHE_PATH), help="pad naar de scancache")
+    parser.add_argument("--no-cache", action="store_true", help="altijd alles opnieuw scannen")
+    if store:
+        add_store_arguments(parser)
+
+# ============================================================
+# Gecachte scan
+# ============================================================
+
+def run_cached_scan(scan: Callable[[Any, Any], Optional[R]], items: Iterable[Any], setup: Callable[[], Any],
+                    cache: Optional[ScanCache | MemoryCache], jobs: int = 1,
+                    path_of: Callable[[Any], Path] = identity,
+                    empty: Callable[[], R] = list, stats: Optional[ScanStats] = None,
+                    variant_of: Optional[Callable[[Any], str]] = None,
+                    options: Optional[ScanOptions] = None) -> Iterator[R]:
+    """
+    Als content_scan.run_scan, maar alleen bestanden zonder geldige cache-entry worden gescand.
+    variant_of(item) is wat het resultaat behalve de inhoud bepaalt (sleutel in de content-store).
+    """
+    if cache is None:
+        yield from run_scan(scan, items, setup, jobs=jobs, empty=empty, stats=stats, path_of=path_of,
+                            options=options)
+        return
+
+    store = getattr(cache, "store", None)
+    if store is not None:
+        store_hits, store_misses = store.hits, store.misses
+    # (item, gevonden, waarde) in invoervolgorde; de scanner haalt de missers er lazy uit,
+    # dus elk resultaat gaat de deur uit zodra alles ervoor klaar is.
+    pending: Deque[Tuple[Any, bool, Any]] = deque()
+
+    def misses() -> Iterator[Any]:
+        for item in items:
+            found, value = cache.get(path_of(item), variant_of(item) if variant_of else "")
+            pending.append((item, found, value))
+            if found:
+                if stats is not None:
+                    stats.files += 1
+                    stats.cached += 1
+            else:
+                yield item
+
+    try:
+        for value in run_scan(scan, misses(), setup, jobs=jobs, empty=empty, stats=stats, path_of=path_of,
+                              options=options):
+            while pending[0][1]:
+                yield pending.popleft()[2]
+            item, _, _ = pending.popleft()
+            cache.put(path_of(item), value)
+            yield value
+        while pending:
+            yield pending.popleft()[2]
+    finally:
+        if stats is not None and store is not None:
+            stats.store_hits += store.hits - store_hits
+            stats.store_misses += store.misses - store_misses
+
+# ============================================================
+# CLI (content-store beheren)
+# ============================================================
+
+def format_size(n: int) -> str:
+    return f"{n / (1 << 20):.1f} MB"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Content-store beheren: tellen, exporteren, importeren, opruimen")
+    ap.add_argument("command", choices=["stats", "export", "import", "prune"])
+    ap.add_argument("archive", nargs="?", help="tar(.gz) voor export/import")
+    add_store_arguments(ap)
+    args = ap.parse_intermixed_args()
+
+    if args.command in ("export", "import") and not args.archive:
+        ap.error(f"{args.command} heeft een archief nodig")
+    store = ContentStore(Path(args.store or DEFAULT_STORE_DIR), args.store_max_mb << 20)
+
+    if args.command == "export":
+        n = store.export_archive(Path(args.archive))
+        print(f"📦 {n} entries geëxporteerd naar {args.archive}")
+        return 0
+    if args.command == "import":
+        import tarfile
+
+        try:
+            added, skipped = store.import_archive(Path(args.archive))
+        except (OSError, EOFError, tarfile.TarError) as e:
+            print("Import mislukt:", e)
+            return 1
+        removed, _ = store.prune()
+        print(f"📥 {added} entries geïmporteerd, {skipped} overgeslagen (al aanwezig of ongeldig), "
+              f"{removed} verwijderd door LRU")
+        return 0
+    if args.command == "prune":
+        removed, freed = store.prune()
+        print(f"🧹 {removed} entries verwijderd ({format_size(freed)})")
+        return 0
+
+    entries = store.entries()
+    total = sum(size for _, size, _ in entries)
+    keys = {path.parent.parent.name for _, _, path in entries}
+    print(f"Content-store: {store.root}")
+    print(f"Entries: {len(entries)}  sleutels (regels × extensie × variant): {len(keys)}")
+    print(f"Grootte: {format_size(total)} van max {format_size(store.max_bytes)}")
+    if entries:
+        oldest = min(mtime for mtime, _, _ in entries)
+        print(f"Langst niet gebruikt: {time.strftime('%Y-%m-%d %H:%M', time.localtime(oldest))}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,11 +4,20 @@
 from __future__ import annotations
 
 import argparse
-import os
 import re
-from dataclasses import dataclass
+from functools import partial
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import AbstractSet, Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+from content_cache import ScanCache, add_cache_arguments, fingerprint, open_cache, run_cached_scan
+from content_git import ChangedLines, GitScopeError, add_git_arguments, git_scope, on_changed_line, select_changed, staged_blobs, walk_ignored
+from content_profile import add_profile_arguments, finish_profile, start_profile
+from content_report import HitStream, add_format_argument, stats_out
+from content_rules import rule_pack
+from content_scan import FileHits, HelpFormatter, HitList, RuleSet, ScanOptions, ScanStats, add_jobs_argument, add_stats_argument, add_visible_argument, iter_lines, rule_labels, scan_context, scan_options
+from content_walk import walk_files
+from content_watch import WatchHit, add_watch_arguments, watch_loop
 
 
 DEFAULT_ROOT = "app/(site)"
@@ -30,58 +39,10 @@ HUMAN_CONTEXT_RE = re.compile(r"\bcontext\b", re.IGNORECASE)
 
 
 # -----------------------------
-# Audit rules (jouw echte doel)
+# Audit rules (jouw echte doel): regelset "conscious" in rules/site-copy.json
 # -----------------------------
-AUDIT_RULES: Dict[str, List[str]] = {
-    # ✅ Wil je juist vaker zien / toevoegen
-    "🟢 Keuze & autonomie (goed)": [
-        r"\bbewuste\s+keuze\b",
-        r"\b(jij|je)\s+kiest\b",
-        r"\b(eigen|jouw)\s+(tarief|voorwaarden)\b",
-        r"\bzelfstandig(e|)\s+(professional|ondernemer)\b",
-        r"\bzonder\s+verplichtingen\b",
-        r"\bje\s+kunt\s+weigeren\b|\bkun\s+je\s+weigeren\b",
-        r"\bmeerdere\s+opdrachtgevers\b|\bmeer\s+dan\s+één\s+opdrachtgever\b",
-        r"\bperiodiek\b.*\bherijken\b",
-    ],
-
-    # ⚠️ kan: prima, maar snel te “sturend” of lijkt op indirecte garantie
-    "🟡 Aanscherpen (te sturend / te veel belofte)": [
-        r"\b(altijd|garantie|gegarandeerd)\b",
-        r"\bzekerheid\b",
-        r"\bzonder\s+risico\b|\bgeen\s+risico\b",
-        r"\bwij\s+regelen\b|\bwij\s+lossen\b|\bwij\s+doen\b",
-        r"\bcompliant\b|\b100%\b",
-        r"\btoegang\s+tot\s+opdrachten\b",
-        r"\bde\s+standaard\b|\bmarktleider\b",
-    ],
-
-    # 🚫 liever niet op werving/landing pages; zet dit in blogs als je het wil duiden
-    "🔴 Druk / angst / vijand-taal (vermijden op funnel)": [
-        r"\bbelastingdienst\b.*\b(druk|jaagt|pakt)\b",
-        r"\boverheid\b.*\bmaakt\b.*\bmoeilijk\b",
-        r"\bsysteem\b.*\b(krom|giftig|ziek)\b",
-        r"\bmoet\b.*\b(anders|want)\b",
-        r"\bgevaar\b|\bonder\s+druk\b|\bangst\b",
-    ],
-
-    # ⚠️ exclusiviteit / afhankelijkheid: vaak het kernprobleem dat je juist wilt vermijden
-    "🟠 Afhankelijkheid / exclusiviteit (checken)": [
-        r"\b(alleen|uitsluitend)\s+via\b",
-        r"\bexclusief\b|\bexclusiviteit\b",
-        r"\bniet\s+meer\s+welkom\b|\bkom\s+je\s+er\s+niet\s+meer\s+in\b",
-        r"\bverboden\b.*\bdirect\b.*\bopdrachtgever\b",
-        r"\bblacklist\b|\bzwarte\s+lijst\b",
-        r"\braamovereenkomst\b",
-    ],
-
-    # ✅ bonus: pakt “context” alleen als mensentaal (niet schema)
-    "🟢 Mensentaal: context & verantwoordelijkheden (oké)": [
-        r"\bverantwoordelijkheid\b",
-        r"\brolverdeling\b|\bverantwoordelijkheden\b",
-        r"\bcontext\b.*\b(indicatie|vertrekpunt|bespreking)\b",
-    ],
-}
+RULES = rule_pack()
+AUDIT_RULES: Dict[str, List[str]] = RULES.categories("conscious")
 
 
 # -----------------------------
@@ -92,8 +53,7 @@ CTA_RE = re.compile(r"\b(blijf\s+op\s+de\s+hoogte|meld\s+je\s+aan|interesselijst
 REFLECT_Q_RE = re.compile(r"\?\s*$")  # lines ending with ?
 
 
-@dataclass
-class Hit:
+class Hit(NamedTuple):
     category: str
     relpath: str
     line_no: int
@@ -101,19 +61,27 @@ class Hit:
     pattern: str
 
 
-def iter_files(root: Path) -> Iterable[Path]:
-    for dirpath, dirnames, filenames in os.walk(root):
-        dirnames[:] = [d for d in dirnames if d not in EXCLUDE_DIRS]
-        for fn in filenames:
-            p = Path(dirpath) / fn
-            if p.suffix.lower() not in INCLUDE_EXT:
-                continue
-            try:
-                if p.stat().st_size > MAX_FILE_SIZE_MB * 1024 * 1024:
-                    continue
-            except OSError:
-                continue
-            yield p
+def make_hit(category: str, pattern: str, relpath: str, line_no: int, line: str) -> Hit:
+    return Hit(category, relpath, line_no, line, pattern)
+
+
+def new_hits(only: str | None = None) -> HitList:
+    return HitList(rule_labels(AUDIT_RULES, only), make_hit)
+
+
+def is_candidate(p: Path) -> bool:
+    if p.suffix.lower() not in INCLUDE_EXT:
+        return False
+    try:
+        if p.stat().st_size > MAX_FILE_SIZE_MB * 1024 * 1024:
+            return False
+    except OSError:
+        return False
+    return True
+
+
+def iter_files(root: Path, ignored: AbstractSet[str] | None = None) -> Iterable[Path]:
+    return walk_files(root, EXCLUDE_DIRS, INCLUDE_EXT, MAX_FILE_SIZE_MB * 1024 * 1024, ignored=ignored)
 
 
 def should_skip_line(line: str) -> bool:
@@ -125,50 +93,104 @@ def should_skip_line(line: str) -> bool:
     return False
 
 
-def run_audit(root: Path, only: str | None = None) -> Tuple[List[Hit], List[str]]:
-    compiled: List[Tuple[str, re.Pattern, str]] = []
-    for cat, pats in AUDIT_RULES.items():
-        if only and only.lower() not in cat.lower():
-            continue
-        for pat in pats:
-            compiled.append((cat, re.compile(pat, re.IGNORECASE), pat))
+def scanned_line(rawline: str) -> str | None:
+    """De (gestripte) tekst waarop de regels draaien; None voor lege, schema.org- en commentaarregels."""
+    line = rawline.strip()
+    if not line or should_skip_line(rawline):
+        return None
+    return line
+
+
+def compile_rules(only: str | None = None) -> RuleSet:
+    # CTA/vraagteken-detectie telt mee in de bestands-prefilter, anders missen we flags.
+    return RuleSet.from_mapping(AUDIT_RULES, only=only, flags=RULES.flags("conscious"),
+                                prefilter_extra=[CTA_RE.pattern, REFLECT_Q_RE.pattern])
+
+
+def empty_result() -> Tuple[FileHits, bool, bool]:
+    return FileHits(), False, False
 
-    hits: List[Hit] = []
-    cta_files: Dict[str, bool] = {}
-    question_files: Dict[str, bool] = {}
 
-    for p in iter_files(root):
-        rel = str(p.relative_to(root)).replace("\\", "/")
+class FileScan:
+    """Per-regel verwerking van één bestand; ook gevoed door content_suite."""
 
-        try:
-            text = p.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            continue
+    def __init__(self, rel: str, rules: RuleSet):
+        self.rel = rel
+        self.rules = rules
+        self.hits = FileHits()
+        self.has_cta = False
+        self.has_questions = False
 
-        has_cta = False
-        has_questions = False
+    def feed(self, i: int, rawline: str) -> None:
+        # ignore empty lines, schema.org @context lines & pure comment lines
+        line = scanned_line(rawline)
+        if line is None:
+            return
 
-        for i, rawline in enumerate(text.splitlines(), start=1):
-            line = rawline.strip()
-            if not line:
-                continue
+        # keep human "context", but only if not schema-context
+        # (rules handle this; here we just keep it in stream)
 
-            # ignore schema.org @context lines & pure comment lines
-            if should_skip_line(rawline):
-                continue
+        if CTA_RE.search(line):
+            self.has_cta = True
+        if REFLECT_Q_RE.search(line):
+            self.has_questions = True
 
-            # keep human "context", but only if not schema-context
-            # (rules handle this; here we just keep it in stream)
+        ids = self.rules.match_ids(line)
+        if ids:
+            self.hits.add(ids, i, line)
 
-            if CTA_RE.search(line):
-                has_cta = True
-            if REFLECT_Q_RE.search(line):
-                has_questions = True
+    def result(self) -> Tuple[FileHits, bool, bool]:
+        return self.hits, self.has_cta, self.has_questions
 
-            for cat, creg, pat in compiled:
-                if creg.search(line):
-                    hits.append(Hit(cat, rel, i, line, pat))
 
+def scan_file(item: Tuple[Path, str], rules: RuleSet) -> Tuple[FileHits, bool, bool] | None:
+    """Hits plus (has_cta, has_questions) voor één bestand (None = overgeslagen door prefilter)."""
+    p, rel = item
+    if not rules.could_match_file(p):
+        return None
+
+    scan = FileScan(rel, rules)
+    try:
+        for i, rawline in iter_lines(p):
+            scan.feed(i, rawline)
+    except Exception:
+        # onleesbaar bestand: telt niet mee (zoals voorheen)
+        return empty_result()
+
+    return scan.result()
+
+
+def rules_fingerprint(only: str | None = None) -> str:
+    # Alles wat het per-bestand resultaat bepaalt: alle packs (ook flags) plus de regexen hier.
+    return fingerprint(RULES.hash, only, CTA_RE.pattern, REFLECT_Q_RE.pattern,
+                       SCHEMA_CONTEXT_RE.pattern, COMMENT_LINE_RE.pattern)
+
+
+def run_audit(root: Path, only: str | None = None, jobs: int = 1,
+              cache: ScanCache | None = None, changed: ChangedLines | None = None,
+              changed_lines_only: bool = False, stats: ScanStats | None = None,
+              on_hit: Callable[[Hit], None] | None = None,
+              ignored: AbstractSet[str] | None = None,
+              options: ScanOptions | None = None) -> Tuple[HitList, List[str]]:
+    """
+    Hits plus CTA-pagina's zonder reflectievragen. Met on_hit gaat elke hit direct
+    daarheen (streamen) en blijft de teruggegeven hitlijst leeg.
+    """
+    hits = new_hits(only)
+    cta_files: Dict[str, bool] = {}
+    question_files: Dict[str, bool] = {}
+
+    paths = iter_files(root, ignored) if changed is None else select_changed(changed, [root], EXCLUDE_DIRS, is_candidate)
+    items = [(p, str(p.relative_to(root)).replace("\\", "/")) for p in paths]
+    results = run_cached_scan(scan_file, items, partial(compile_rules, only), cache,
+                              jobs=jobs, path_of=itemgetter(0), empty=empty_result, stats=stats, options=options)
+    for (p, rel), (file_hits, has_cta, has_questions) in zip(items, results):
+        keep = partial(on_changed_line, changed, True, p) if changed is not None and changed_lines_only else None
+        if on_hit is None:
+            hits.add(rel, file_hits, keep)
+        else:
+            for h in hits.each(rel, file_hits, keep):
+                on_hit(h)
         if has_cta:
             cta_files[rel] = True
         if has_questions:
@@ -180,10 +202,41 @@ def run_audit(root: Path, only: str | None = None) -> Tuple[List[Hit], List[str]
     return hits, missing_questions
 
 
-def print_report(hits: List[Hit], missing_questions: List[str], show: int) -> int:
-    by_cat: Dict[str, List[Hit]] = {}
-    for h in hits:
-        by_cat.setdefault(h.category, []).append(h)
+def watch_hits(item: Tuple[Path, str], rules: RuleSet) -> List[WatchHit]:
+    hits, has_cta, has_questions = scan_file(item, rules) or empty_result()
+    out = [WatchHit((h.category, h.pattern, h.line), h.line_no, f"[{h.category}] {h.line}")
+           for h in HitList(rules.labels, make_hit).each(item[1], hits)]
+    if has_cta and not has_questions:
+        out.append(WatchHit(("cta",), 0, "CTA-pagina zonder reflectievragen"))
+    return out
+
+
+def level_of(category: str) -> str:
+    """SARIF-niveau uit het kleurbolletje van de categorie."""
+    if category.startswith("🔴"):
+        return "error"
+    if category.startswith("🟢"):
+        return "note"
+    return "warning"
+
+
+def stream_report(root: Path, fmt: str, only: str | None = None, jobs: int = 1,
+                  cache: ScanCache | None = None, changed: ChangedLines | None = None,
+                  changed_lines_only: bool = False, stats: ScanStats | None = None,
+                  ignored: AbstractSet[str] | None = None, options: ScanOptions | None = None) -> int:
+    stream = HitStream(fmt, "content_conscious_audit", AUDIT_RULES, level_of=level_of)
+    _, missing_questions = run_audit(
+        root, only=only, jobs=jobs, cache=cache, changed=changed, changed_lines_only=changed_lines_only,
+        stats=stats, ignored=ignored, options=options, on_hit=lambda h: stream.hit(h.category, root / h.relpath, h.line_no, h.line, h.pattern),
+    )
+    for rel in missing_questions:
+        stream.extra("cta_zonder_reflectievragen", root / rel, "CTA-pagina zonder reflectievragen")
+    stream.close(0, root=str(root))
+    return 0
+
+
+def print_report(hits: HitList, missing_questions: List[str], show: int) -> int:
+    by_cat = hits.by_category()
 
     print("=" * 90)
     print("CONTENT AUDIT – Bewust zelfstandig werken (v2)")
@@ -221,19 +274,65 @@ def print_report(hits: List[Hit], missing_questions: List[str], show: int) -> in
 
 
 def main() -> int:
-    ap = argparse.ArgumentParser()
+    ap = argparse.ArgumentParser(formatter_class=HelpFormatter)
     ap.add_argument("--root", default=DEFAULT_ROOT)
     ap.add_argument("--show", type=int, default=25, help="aantal regels per categorie tonen")
     ap.add_argument("--only", default=None, help="filter categorieën (substring match)")
+    add_jobs_argument(ap)
+    add_visible_argument(ap)
+    add_cache_arguments(ap)
+    add_git_arguments(ap)
+    add_stats_argument(ap)
+    add_format_argument(ap)
+    add_profile_arguments(ap)
+    add_watch_arguments(ap)
     args = ap.parse_args()
+    profile = start_profile(args)
+    options = scan_options(args, profile)
 
     root = Path(args.root).resolve()
     if not root.exists():
         print("Root niet gevonden:", root)
         return 1
 
-    hits, missing_questions = run_audit(root, only=args.only)
-    return print_report(hits, missing_questions, show=args.show)
+    try:
+        changed = git_scope(args, root)
+    except GitScopeError as e:
+        print("git diff mislukt:", e)
+        return 1
+    options.blobs = staged_blobs(changed)
+
+    ignored = walk_ignored(args, root) if changed is None else None
+
+    if args.watch:
+        def rel(p: Path) -> str:
+            return str(p.relative_to(root)).replace("\\", "/")
+
+        with scan_context(options):
+            rules = compile_rules(args.only)
+            return watch_loop([root], lambda: list(iter_files(root, ignored)),
+                              lambda p: watch_hits((p, rel(p)), rules), display=rel, interval=args.watch_interval)
+
+    # rel-paden in de hits hangen van de root af → root hoort in de namespace.
+    cache = open_cache(args, f"content_conscious_audit:{root}", rules_fingerprint(args.only))
+    stats = ScanStats()
+    try:
+        if args.format == "text":
+            hits, missing_questions = run_audit(root, only=args.only, jobs=args.jobs, cache=cache,
+                                                changed=changed, changed_lines_only=args.changed_lines_only,
+                                                stats=stats, ignored=ignored, options=options)
+            code = print_report(hits, missing_questions, show=args.show)
+        else:
+            code = stream_report(root, args.format, only=args.only, jobs=args.jobs, cache=cache,
+                                 changed=changed, changed_lines_only=args.changed_lines_only, stats=stats,
+                                 ignored=ignored, options=options)
+    finally:
+        if cache:
+            cache.close()
+    if args.stats:
+        print(stats.footer(), file=stats_out(args.format))
+    finish_profile(profile, args, stats_out(args.format))
+    return code
 
 
 if __name__ == "__main__":
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Audit-daemon voor editor- en pre-commit-integratie.
+
+  python scripts/content/content_daemon.py serve &
+  python scripts/content/content_daemon.py audit|funnelcheck [--root …] [--format …]
+  python scripts/content/content_daemon.py soften [--preview diff|json]   (altijd dry-run)
+  python scripts/content/content_daemon.py status|stop
+
+`serve` houdt de gecompileerde regels en de resultaten per bestand (MemoryCache,
+geldig zolang mtime + grootte gelijk zijn) warm en luistert op een Unix-socket. Met
+inotify (content_watch) onthoudt hij bovendien complete antwoorden per root tot er
+onder die root iets verandert; een herhaalde vraag kost dan alleen de round-trip. De
+client is dun: hij importeert de audits niet, stuurt één JSON-request, print de
+uitvoer van de daemon en eindigt met dezelfde exitcode als freeze_site_copy. Draait
+er geen daemon (of is die verouderd), dan voert de client het request zelf uit, met
+de gewone SQLite-cache; de uitvoer is in beide gevallen identiek.
+
+Protocol: één verbinding per request, JSON + newline heen, JSON terug.
+  {"cmd": "audit"|"funnelcheck"|"soften"|"status"|"stop", "root": <absoluut>, "cwd": …,
+   "format": "text"|…, "preview": null|"diff"|"json", "gitignore": bool}
+  → {"exit_code": n, "output": "…"}  of  {"error": "…"}
+Zolang de daemon aan een request werkt, stuurt hij elke KEEPALIVE seconden een
+losse newline. De time-out van de client geldt per ontvangen stuk: een koude scan die
+langer duurt dan --timeout wordt dus afgewacht in plaats van lokaal overgedaan, en
+alleen een daemon die niets meer laat horen valt terug op een lokale run. Voor
+json.loads is de reeks newlines vóór het antwoord gewoon witruimte.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_ROOT = "app/(site)"
+SOCKET_NAME = "content-audit.sock"
+COMMANDS = ["audit", "funnelcheck", "soften"]
+FORMATS = ["text", "json", "ndjson", "sarif"]   # = content_report.FORMATS; niet importeren, scheelt opstarttijd
+CONNECT_TIMEOUT = 0.5   # seconden; een daemon die niet meteen aanneemt, hangt
+DEFAULT_TIMEOUT = 10.0  # seconden stilte van de daemon, daarna lokaal uitvoeren
+KEEPALIVE = 1.0         # seconden tussen twee newlines van een daemon die nog bezig is
+
+# ============================================================
+# Socket
+# ============================================================
+
+def default_socket_path() -> Path:
+    """.cache/content-audit.sock in de werkmap; te lang voor AF_UNIX → tempdir met een hash."""
+    path = Path.cwd() / ".cache" / SOCKET_NAME
+    if len(os.fsencode(str(path))) < 100:
+        return path
+    import hashlib
+    import tempfile
+
+    digest = hashlib.sha1(str(Path.cwd()).encode("utf-8")).hexdigest()[:12]
+    return Path(tempfile.gettempdir()) / f"content-audit-{digest}.sock"
+
+
+def _recv_all(conn: socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def send_request(path: Path, request: Dict[str, Any], timeout: float) -> Optional[Dict[str, Any]]:
+    """
+    Antwoord van de daemon, of None als er niemand (bruikbaar) luistert: geen socket,
+    `timeout` seconden niets ontvangen (ook geen keep-alive), verbroken verbinding of
+    een onleesbaar antwoord. De client voert het request dan zelf uit.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(path))
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        response = json.loads(_recv_all(sock).decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+    if not isinstance(response, dict):
+        return None
+    if "error" not in response and not (isinstance(response.get("output"), str)
+                                        and isinstance(response.get("exit_code"), int)):
+        return None
+    return response
+
+# ============================================================
+# Uitvoeren (daemon én fallback)
+# ============================================================
+
+CacheFor = Callable[[str, Path], Any]
+
+
+def execute(request: Dict[str, Any], cache_for: CacheFor) -> int:
+    """Voer een request uit zoals freeze_site_copy het zou doen; uitvoer gaat naar stdout."""
+    import freeze_site_copy
+    from content_git import gitignored_paths
+
+    cmd = request["cmd"]
+    root = Path(request["root"])
+    fmt = request.get("format") or "text"
+    if not root.exists():
+        print("Root bestaat niet:", root)
+        return 1
+    ignored = gitignored_paths(root) if request.get("gitignore") else None
+
+    if cmd == "audit":
+        return freeze_site_copy.command_audit(root, cache=cache_for("audit", root), fmt=fmt, ignored=ignored)
+    if cmd == "funnelcheck":
+        return freeze_site_copy.command_funnelcheck(root, cache=cache_for("funnelcheck", root), fmt=fmt,
+                                                    ignored=ignored)
+    if cmd == "soften":
+        preview = request.get("preview")
+        return freeze_site_copy.command_soften(root, dry_run=True, preview=preview, ignored=ignored,
+                                               cache=cache_for(f"soften:{preview}", root))
+    raise ValueError(f"onbekend commando: {cmd}")
+
+
+def run_local(request: Dict[str, Any]) -> int:
+    """Fallback zonder daemon: hetzelfde als freeze_site_copy, met de SQLite-cache."""
+    import freeze_site_copy
+    from content_cache import DEFAULT_CACHE_PATH, ScanCache
+
+    caches = []
+
+    def cache_for(kind: str, root: Path):
+        if kind not in ("audit", "funnelcheck"):
+            return None
+        try:
+            cache = ScanCache(DEFAULT_CACHE_PATH, f"freeze_site_copy:{kind}",
+                              freeze_site_copy.rules_fingerprint(kind))
+        except Exception:
+            return None
+        caches.append(cache)
+        return cache
+
+    try:
+        return execute(request, cache_for)
+    finally:
+        for cache in caches:
+            cache.close()
+
+# ============================================================
+# Daemon
+# ============================================================
+
+def source_stamp() -> Tuple[Tuple[str, int], ...]:
+    """mtimes van de scripts en rule-packs; verandert er een, dan is de daemon verouderd."""
+    files = [*SCRIPT_DIR.glob("*.py"), *SCRIPT_DIR.glob("rules/*.json")]
+    return tuple(sorted((str(p.relative_to(SCRIPT_DIR)), p.stat().st_mtime_ns) for p in files))
+
+
+class RootWatch:
+    """Inotify op alle mappen onder een root (behalve EXCLUDE_DIRS) plus de antwoorden die nog gelden."""
+
+    def __init__(self, notify, root: Path, exclude_dirs) -> None:
+        self.notify = notify
+        self.responses: Dict[str, Dict[str, Any]] = {}
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in exclude_dirs]
+            notify.watch([dirpath])
+
+    def current(self) -> Dict[str, Dict[str, Any]]:
+        """Onthouden antwoorden; leeg zodra er sinds de vorige vraag een event was."""
+        if self.notify.wait(0):
+            self.notify.drain()
+            self.responses.clear()
+        return self.responses
+
+
+class AuditDaemon:
+    def __init__(self) -> None:
+        import freeze_site_copy
+
+        self.caches: Dict[Tuple[str, str], Any] = {}     # (soort, root) → MemoryCache
+        self.watches: Dict[str, Optional[RootWatch]] = {}
+        self.stamp = source_stamp()
+        self.requests = 0
+        self.memo_hits = 0
+        self.running = True
+        # Vooraf compileren, zodat ook het eerste request warm is.
+        freeze_site_copy.compile_audit_rules()
+        freeze_site_copy.compile_funnel_rules()
+        freeze_site_copy.compile_soften_rules()
+
+    def cache_for(self, kind: str, root: Path):
+        from content_cache import MemoryCache
+
+        key = (kind, str(root))
+        if key not in self.caches:
+            self.caches[key] = MemoryCache()
+        return self.caches[key]
+
+    def watch_for(self, root: str) -> Optional[RootWatch]:
+        """None zonder inotify: dan elke keer opnieuw (met de MemoryCache)."""
+        if root not in self.watches:
+            from content_watch import open_inotify
+            from freeze_site_copy import EXCLUDE_DIRS
+
+            notify = open_inotify()
+            self.watches[root] = RootWatch(notify, Path(root), EXCLUDE_DIRS) if notify else None
+        return self.watches[root]
+
+    def stale(self) -> bool:
+        """Scripts of regels gewijzigd: stoppen; de client doet het request dan zelf opnieuw."""
+        if source_stamp() == self.stamp:
+            return False
+        self.running = False
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "requests": self.requests,
+            "memo_hits": self.memo_hits,
+            "caches": [{"kind": kind, "root": root, "files": len(c.entries), "hits": c.hits, "misses": c.misses}
+                       for (kind, root), c in sorted(self.caches.items())],
+        }
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        import io
+        from contextlib import redirect_stdout
+
+        cmd = request.get("cmd")
+        if cmd == "status":
+            return {"exit_code": 0, "output": json.dumps(self.status(), ensure_ascii=False, indent=2) + "\n"}
+        if cmd == "stop":
+            self.running = False
+            return {"exit_code": 0, "output": ""}
+        if self.stale():
+            return {"error": "stale"}
+
+        self.requests += 1
+        memo = None
+        if not request.get("gitignore") and Path(request["root"]).is_dir():
+            # Met --gitignore kan een .gitignore boven de root meespelen; die zien we niet.
+            watch = self.watch_for(request["root"])
+            memo = watch.current() if watch else None
+        key = json.dumps(request, sort_keys=True)
+        if memo is not None and key in memo:
+            self.memo_hits += 1
+            return memo[key]
+
+        buf = io.StringIO()
+        try:
+            # display_path e.d. rekenen relatief aan de werkmap van de client.
+            os.chdir(request.get("cwd") or os.getcwd())
+            with redirect_stdout(buf):
+                code = execute(request, self.cache_for)
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+        if self.stale():
+            # Tijdens de scan gewijzigd: het antwoord kwam misschien van de oude regels.
+            return {"error": "stale"}
+        response = {"exit_code": code, "output": buf.getvalue()}
+        if memo is not None:
+            memo[key] = response
+        return response
+
+
+def _keepalive(conn: socket.socket, done) -> None:
+    """Newlines naar de client tot `done` gezet is (of de client weg is)."""
+    while not done.wait(KEEPALIVE):
+        try:
+            conn.sendall(b"\n")
+        except OSError:
+            return
+
+
+def _serve_connection(conn: socket.socket, daemon: AuditDaemon) -> None:
+    import threading
+
+    try:
+        request = json.loads(_recv_all(conn).decode("utf-8"))
+    except ValueError as e:
+        response = {"error": f"ongeldig request: {e}"}
+    else:
+        done = threading.Event()
+        beat = threading.Thread(target=_keepalive, args=(conn, done), daemon=True)
+        beat.start()
+        try:
+            response = daemon.handle(request)
+        finally:
+            done.set()
+            beat.join()
+    conn.sendall(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+
+
+def serve(path: Path) -> int:
+    import signal
+
+    if send_request(path, {"cmd": "status"}, timeout=1.0) is not None:
+        print("Er draait al een daemon op", path, file=sys.stderr)
+        return 1
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        path.unlink()   # achtergebleven socket van een gecrashte daemon
+    except FileNotFoundError:
+        pass
+
+    daemon = AuditDaemon()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(path))
+    os.chmod(path, 0o600)
+    sock.listen(16)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"content-daemon luistert op {path} (pid {os.getpid()})", file=sys.stderr, flush=True)
+    try:
+        while daemon.running:
+            conn, _ = sock.accept()
+            with conn:
+                try:
+                    _serve_connection(conn, daemon)
+                except OSError:
+                    pass   # client weg; volgende
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+    return 0
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="audit-daemon met dunne client (fallback: lokaal uitvoeren)")
+    parser.add_argument("cmd", choices=["serve", "status", "stop"] + COMMANDS)
+    parser.add_argument("--root", default=DEFAULT_ROOT)
+    parser.add_argument("--format", choices=FORMATS, default="text", help="audit/funnelcheck")
+    parser.add_argument("--preview", choices=["diff", "json"], default=None, help="soften (altijd dry-run)")
+    parser.add_argument("--gitignore", action="store_true",
+                        help="door .gitignore genegeerde paden overslaan")
+    parser.add_argument("--socket", default=None, help="pad naar de socket (standaard .cache/content-audit.sock)")
+    parser.add_argument("--no-daemon", action="store_true", help="niet verbinden, altijd lokaal uitvoeren")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="seconden zonder teken van leven van de daemon (daarna lokaal uitvoeren)")
+    args = parser.parse_args()
+
+    path = Path(args.socket) if args.socket else default_socket_path()
+    if args.cmd == "serve":
+        return serve(path)
+
+    request = {"cmd": args.cmd, "root": str(Path(args.root).resolve()), "cwd": os.getcwd(),
+               "format": args.format, "preview": args.preview, "gitignore": args.gitignore}
+
+    response = None if args.no_daemon else send_request(path, request, args.timeout)
+    if response is None or response.get("error") == "stale":
+        if args.cmd in ("status", "stop"):
+            print("Geen daemon actief op", path, file=sys.stderr)
+            return 1
+        return run_local(request)
+    if "error" in response:
+        print("daemon:", response["error"], file=sys.stderr)
+        return 1
+    sys.stdout.write(response["output"])
+    return response["exit_code"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+--visible-only: alleen zichtbare copy uit .tsx/.jsx/.ts/.js/.mdx/.md naar de regels.
+
+Een kleine tokenizer (geen volledige parser) haalt per bestand de segmenten eruit
+die een bezoeker te zien krijgt:
+  * JSX-tekstnodes, met inline elementen (<strong>, <a>, <Link>, …) en {" "} samengevoegd
+    tot één segment, ook als de tekst over meerdere bronregels loopt;
+  * strings en templates die direct JSX-kind zijn: {"…"}, {cond ? "a" : "b"}, {`…`};
+  * attributen uit VISIBLE_ATTRS (alt, title, aria-label, placeholder, description, …),
+    als string of als zo'n expressie; ook bij componenten alleen die;
+  * frontmatter-waarden en markdown-tekst, zonder code blocks, imports en inline code.
+Overige strings in code (imports, keys, t("key"), cn(…), metadata-objecten) tellen
+niet mee. Een template-literal blijft één segment: elke ${…} wordt PLACEHOLDER.
+
+Elk segment houdt regel en kolom van zijn begin in de bron; hits rapporteren die regel
+en de (witruimte-genormaliseerde) segmenttekst. Segmenten worden per proces gecachet
+op inhoud en extensie, zodat audit, funnelcheck, --watch en de daemon ze delen, ook
+voor gestagede of historische blobs die niet (meer) op schijf staan.
+Andere extensies (.json, .txt, .html, .yml) gaan ongewijzigd regel voor regel.
+
+--sentences knipt die segmenten daarna in zinnen (markdown-paragrafen eerst aaneen),
+zodat de regels per zin draaien: een co-occurrence als "prosafetymatch … regelt" moet
+dan in één zin staan, niet ergens verderop in een lange regel of JSX-blok. Elke zin
+rapporteert de bronregel waarop hij begint.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import html
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import content_scan
+
+EXTRACT_EXT = {".tsx", ".jsx", ".ts", ".js", ".mdx", ".md"}
+
+# Versie van de extractie; zit via open_cache in de fingerprint van de resultatencache.
+EXTRACT_VERSION = 2
+
+SEGMENT_CACHE_SIZE = 4096
+
+VISIBLE_ATTRS = {"alt", "title", "aria-label", "aria-description", "placeholder", "label", "content",
+                 "summary", "caption", "description", "subtitle", "heading", "headline", "tagline", "text",
+                 "question", "answer", "message", "tooltip"}
+NON_VISIBLE_KEYS = {
+    "classname", "class", "href", "src", "srcset", "id", "key", "ref", "style", "type", "rel", "target",
+    "name", "role", "variant", "size", "color", "icon", "as", "slug", "path", "url", "canonical", "image",
+    "images", "lang", "locale", "method", "action", "layout", "template", "robots", "sizes", "width",
+    "height", "priority", "loading", "fill", "viewbox", "d", "xmlns", "htmlfor", "tabindex", "date",
+    "datetime", "tags", "category", "author", "permalink", "draft", "weight", "order", "format",
+}
+INLINE_TAGS = {"a", "abbr", "b", "br", "code", "em", "i", "kbd", "mark", "q", "s", "small", "span", "strong",
+               "sub", "sup", "time", "u", "Link"}
+RAW_TAGS = {"script", "style", "pre", "code"}
+# Staat in een template-literal voor elke ${…}; geen letter en geen zinseinde.
+PLACEHOLDER = "{…}"
+
+# Na deze tokens begint een expressie: daar is "<" een JSX-tag en "/" een regex-literal.
+EXPR_START_PUNCT = set("(,=:[!&|?{};+-*%~^<>")
+EXPR_START_WORDS = {"", "return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void",
+                    "throw", "yield", "await", "default", "export"}
+
+# Stukken code zonder iets interessants slaan we in één match over; prev volgt uit het eind.
+_CODE_RUN_RE = re.compile(r"[^'\"`{}()</]+")
+_TAIL_WORD_RE = re.compile(r"[\w$]+$")
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?(?:\*/|\Z)", re.S)
+_STRING_RE = {q: re.compile(q + r"(?:[^" + q + r"\\\n]|\\.)*(?:" + q + r"|$)", re.S | re.M) for q in "'\""}
+_TEMPLATE_PART_RE = re.compile(r"(?:[^`\\$]|\\.|\$(?!\{))*", re.S)
+_REGEX_RE = re.compile(r"/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-z]*")
+_ESCAPE_RE = re.compile(r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)", re.S)
+_TAG_NAME_RE = re.compile(r"[A-Za-z_$][\w$.:-]*")
+_ATTR_NAME_RE = re.compile(r"[A-Za-z_$][\w$:.-]*")
+_WS_RE = re.compile(r"\s*")
+_CHILD_STOP_RE = re.compile(r"[<{]")
+_SIMPLE_LITERAL_RE = re.compile(r"""\s*(?:"([^"\\\n]*)"|'([^'\\\n]*)')\s*\}""")
+_HAS_LETTER_RE = re.compile(r"[^\W\d_]")
+# Zinseinde: leesteken(s), eventueel sluitende quotes/haakjes, witruimte. Of er echt een
+# nieuwe zin begint, beslist split_sentences op het volgende teken (hoofdletter).
+_SENTENCE_END_RE = re.compile(r"[.!?…]+[\"'”’»)\]]*\s+")
+_SENTENCE_OPEN = "\"'“‘„«(["
+_FIRST_WORD_RE = re.compile(r"\w+")
+
+
+class Segment(NamedTuple):
+    line: int      # 1-based, zoals iter_lines (splitlines)
+    col: int       # 1-based
+    text: str      # witruimte samengevoegd tot één spatie
+
+
+def _unescape(raw: str) -> str:
+    def repl(m: re.Match) -> str:
+        e = m.group(1)
+        if e[0] == "u" and len(e) > 1:
+            return chr(int(e[2:-1] if e[1] == "{" else e[1:], 16))
+        if e[0] == "x" and len(e) == 3:
+            return chr(int(e[1:], 16))
+        return " " if e in "ntrvf" or e == "\n" else e
+    return _ESCAPE_RE.sub(repl, raw)
+
+# ============================================================
+# JS / JSX
+# ============================================================
+
+class _JsScanner:
+    """Één pass over JS/TS(X); verzamelt (positie, tekst) van zichtbare stukken."""
+
+    def __init__(self, text: str, jsx: bool = True):
+        self.s = text
+        self.n = len(text)
+        self.jsx = jsx
+        self.out: List[Tuple[int, str]] = []
+
+    def emit(self, pos: int, text: str) -> None:
+        text = " ".join(text.split())
+        if text and _HAS_LETTER_RE.search(text):
+            self.out.append((pos, text))
+
+    def segments(self) -> List[Tuple[int, str]]:
+        return sorted(self.out)
+
+    # ---------- code ----------
+
+    def code(self, i: int, closing: bool = False, silent: bool = False, literals: bool = False) -> int:
+        """
+        Scan code vanaf i; met closing tot en met de bijbehorende "}". Met literals (een
+        JSX-kind of zichtbaar attribuut) tellen strings en templates op het hoogste
+        niveau van de expressie als zichtbaar: {"…"}, {cond ? "a" : "b"}, {`… ${x}`}.
+        Wat in haakjes of accolades staat (t("key"), objecten, cn(…)) niet.
+        """
+        s, n = self.s, self.n
+        prev = ""
+        braces = 0
+        parens = 0
+        while i < n:
+            c = s[i]
+            top = literals and not silent and not braces and not parens
+            if c in "'\"":
+                m = _STRING_RE[c].match(s, i)
+                j = m.end()
+                if top:
+                    value = s[i + 1:j - 1] if s[j - 1:j] == c else s[i + 1:j]
+                    self.emit(i + 1, _unescape(value))
+                prev = "str"
+                i = j
+                continue
+            if c == "`":
+                i = self._template(i, top, silent)
+                prev = "str"
+                continue
+            if c == "{":
+                braces += 1
+                prev = "{"
+                i += 1
+                continue
+            if c == "}":
+                if not braces:
+                    if closing:
+                        return i + 1
+                    i += 1
+                    continue
+                braces -= 1
+                prev = "}"
+                i += 1
+                continue
+            if c == "(":
+                parens += 1
+                prev = "("
+                i += 1
+                continue
+            if c == ")":
+                if parens:
+                    parens -= 1
+                prev = ")"
+                i += 1
+                continue
+            expr_start = prev in EXPR_START_WORDS or prev in EXPR_START_PUNCT
+            if c == "<" and self.jsx and expr_start and i + 1 < n and (s[i + 1].isalpha() or s[i + 1] == ">"):
+                i = self.element(i, None, silent)
+                prev = "jsx"
+                continue
+            if c == "/" and expr_start and not s.startswith("//", i) and not s.startswith("/*", i):
+                m = _REGEX_RE.match(s, i)
+                if m:
+                    prev = "re"
+                    i = m.end()
+                    continue
+            if c == "/":
+                m = _COMMENT_RE.match(s, i)
+                if m:
+                    i = m.end()
+                    continue
+            m = _CODE_RUN_RE.match(s, i)
+            if m:
+                tail = m.group().rstrip()
+                if tail:
+                    last = tail[-1]
+                    if last.isalnum() or last in "_$":
+                        prev = _TAIL_WORD_RE.search(tail, max(0, len(tail) - 32)).group()
+                    else:
+                        prev = last
+                i = m.end()
+                continue
+            prev = c
+            i += 1
+        return i
+
+    def _template(self, i: int, visible: bool, silent: bool) -> int:
+        """Template-literal (als visible) als één segment, met PLACEHOLDER voor elke ${…}."""
+        s, n = self.s, self.n
+        i += 1
+        first = i
+        parts: List[str] = []
+        while i < n:
+            m = _TEMPLATE_PART_RE.match(s, i)
+            parts.append(_unescape(m.group()))
+            i = m.end()
+            if i >= n:
+                break
+            if s[i] == "`":
+                i += 1
+                break
+            i = self.code(i + 2, closing=True, silent=silent)   # "${"
+        if visible:
+            self.emit(first, PLACEHOLDER.join(parts))
+        return i
+
+    # ---------- JSX ----------
+
+    def element(self, i: int, buf: Optional[List[Tuple[int, str]]], silent: bool = False) -> int:
+        """Element vanaf "<"; inline elementen schrijven hun tekst in de buf van de ouder."""
+        s, n = self.s, self.n
+        i += 1
+        if i < n and s[i] == ">":
+            name = ""
+            i += 1
+        else:
+            m = _TAG_NAME_RE.match(s, i)
+            if not m:
+                return i
+            name = m.group()
+            i = self._attributes(m.end(), name, silent)
+            if i < 0:              # self-closing
+                if buf is not None and name == "br":
+                    buf.append((-i, " "))
+                return -i
+
+        if name in RAW_TAGS:
+            end = s.find(f"</{name}", i)
+            end = n if end < 0 else s.find(">", end)
+            return n if end < 0 else end + 1
+        if buf is not None and name in INLINE_TAGS:
+            return self._children(i, buf, silent)
+        own: List[Tuple[int, str]] = []
+        i = self._children(i, own, silent)
+        self._flush(own, silent)
+        return i
+
+    def _attributes(self, i: int, tag: str, silent: bool) -> int:
+        """Tot na ">" (positief) of na "/>" (negatief)."""
+        s, n = self.s, self.n
+        while i < n:
+            i = _WS_RE.match(s, i).end()
+            if s.startswith("/>", i):
+                return -(i + 2)
+            if i >= n:
+                break
+            c = s[i]
+            if c == ">":
+                return i + 1
+            if c == "{":
+                i = self.code(i + 1, closing=True, silent=True)   # {...props}
+                continue
+            m = _ATTR_NAME_RE.match(s, i)
+            if not m:
+                i += 1
+                continue
+            attr = m.group()
+            i = _WS_RE.match(s, m.end()).end()
+            if i >= n or s[i] != "=":
+                continue
+            i = _WS_RE.match(s, i + 1).end()
+            if i >= n:
+                break
+            visible = attr.lower() in VISIBLE_ATTRS
+            if s[i] in "'\"":
+                end = s.find(s[i], i + 1)
+                end = n if end < 0 else end
+                if visible and not silent:
+                    self.emit(i + 1, html.unescape(s[i + 1:end]))
+                i = end + 1
+            elif s[i] == "{":
+                i = self.code(i + 1, closing=True, silent=silent, literals=visible)
+            else:
+                i += 1
+        return n
+
+    def _children(self, i: int, buf: List[Tuple[int, str]], silent: bool) -> int:
+        s, n = self.s, self.n
+        while i < n:
+            m = _CHILD_STOP_RE.search(s, i)
+            k = m.start() if m else n
+            if k > i:
+                buf.append((i, html.unescape(s[i:k])))
+            if k >= n:
+                return n
+            if s[k] == "{":
+                lit = _SIMPLE_LITERAL_RE.match(s, k + 1)
+                if lit:
+                    buf.append((k + 2, lit.group(1) if lit.group(1) is not None else lit.group(2)))
+                    i = lit.end()
+                else:
+                    buf.append((k, " "))
+                    i = self.code(k + 1, closing=True, silent=silent, literals=True)
+                continue
+            if s.startswith("</", k):
+                end = s.find(">", k)
+                return n if end < 0 else end + 1
+            nxt = k + 1
+            if nxt < n and not (s[nxt].isalpha() or s[nxt] == ">"):
+                buf.append((k, "<"))   # losse "<" in tekst
+                i = nxt
+                continue
+            name_m = _TAG_NAME_RE.match(s, nxt)
+            if name_m is None or name_m.group() not in INLINE_TAGS:
+                self._flush(buf, silent)
+            i = self.element(k, buf, silent)
+        return n
+
+    def _flush(self, buf: List[Tuple[int, str]], silent: bool) -> None:
+        pieces = [(p, t) for p, t in buf if t.strip()]
+        if pieces and not silent:
+            text = "".join(t for _, t in buf)
+            first = pieces[0][0] + (len(pieces[0][1]) - len(pieces[0][1].lstrip()))
+            self.emit(first, text)
+        buf.clear()
+
+
+def extract_js(text: str, jsx: bool = True) -> List[Tuple[int, str]]:
+    scanner = _JsScanner(text, jsx)
+    scanner.code(0)
+    return scanner.segments()
+
+# ============================================================
+# Markdown / MDX
+# ============================================================
+
+_FENCE_RE = re.compile(r"^\s*(```|~~~)")
+_FRONTMATTER_RE = re.compile(r"^(\s*(?:-\s+)?)(?:([\w-]+)\s*:\s*)?(.*)$")
+_MD_PREFIX_RE = re.compile(r"^\s*(?:#{1,6}\s+|>\s*|[-*+]\s+|\d+[.)]\s+)*")
+_MD_INLINE_CODE_RE = re.compile(r"`[^`\n]*`")
+_MD_LINK_RE = re.compile(r"\[([^\]\n]*)\]\([^)\n]*\)")
+_MD_TAG_RE = re.compile(r"<[^>]*>", re.S)
+_MD_ATTR_RE = re.compile(r"""([A-Za-z_][\w:.-]*)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+_MD_EXPR_RE = re.compile(r"\{[^{}\n]*\}")
+
+
+def _blank(m: re.Match) -> str:
+    return re.sub(r"[^\n]", " ", m.group())
+
+
+def extract_markdown(text: str, mdx: bool = True, join: bool = False) -> List[Tuple[int, str]]:
+    out: List[Tuple[int, str]] = []
+    lines = text.splitlines(keepends=True)
+    starts = [0]
+    for line in lines:
+        starts.append(starts[-1] + len(line))
+
+    idx = 0
+    if lines and lines[0].strip() == "---":
+        end = next((k for k in range(1, len(lines)) if lines[k].strip() in ("---", "...")), None)
+        if end is not None:
+            for k in range(1, end):
+                m = _FRONTMATTER_RE.match(lines[k].rstrip("\r\n"))
+                key, value = m.group(2), m.group(3).strip()
+                if (key and key.lower() in NON_VISIBLE_KEYS) or value in ("", "|", ">", "|-", ">-"):
+                    continue
+                col = m.start(3) + (len(m.group(3)) - len(m.group(3).lstrip()))
+                if value[:1] in "'\"" and value[-1:] == value[:1]:
+                    value, col = value[1:-1], col + 1
+                out.append((starts[k] + col, value))
+            idx = end + 1
+
+    fenced = False
+    body: List[int] = []    # regelindices van de huidige tekst-/JSX-paragraaf
+
+    def flush() -> None:
+        if not body:
+            return
+        a, b = starts[body[0]], starts[body[-1] + 1]
+        block = text[a:b]
+        head = block.lstrip()
+        if mdx and (head.startswith("import ") or head.startswith("export ")):
+            out.extend((a + p, t) for p, t in extract_js(block, jsx=True))
+        elif mdx and head.startswith("<"):
+            scanner = _JsScanner(block)
+            own: List[Tuple[int, str]] = []
+            scanner._children(0, own, False)
+            scanner._flush(own, False)
+            out.extend((a + p, t) for p, t in scanner.segments())
+        else:
+            out.extend(_markdown_lines(block, a, mdx, join))
+        body.clear()
+
+    for k in range(idx, len(lines)):
+        line = lines[k]
+        if _FENCE_RE.match(line):
+            flush()
+            fenced = not fenced
+        elif fenced:
+            continue
+        elif line.strip():
+            body.append(k)
+        else:
+            flush()
+    flush()
+    return sorted(out)
+
+
+def _markdown_lines(block: str, offset: int, mdx: bool, join: bool = False) -> List[Tuple[int, str]]:
+    """Tekst per regel; met join lopen vervolgregels (zonder kop/lijst/quote-teken) door."""
+    out: List[Tuple[int, str]] = []
+    for m in _MD_TAG_RE.finditer(block):
+        for a in _MD_ATTR_RE.finditer(m.group()):
+            if a.group(1).lower() in VISIBLE_ATTRS:
+                val = a.group(2) if a.group(2) is not None else a.group(3)
+                out.append((offset + m.start() + a.start(2 if a.group(2) is not None else 3), html.unescape(val)))
+    clean = _MD_TAG_RE.sub(_blank, block)
+    clean = _MD_INLINE_CODE_RE.sub(_blank, clean)
+    clean = _MD_LINK_RE.sub(lambda m: " " + m.group(1) + " " * (len(m.group()) - len(m.group(1)) - 1), clean)
+    if mdx:
+        clean = _MD_EXPR_RE.sub(_blank, clean)
+    pos = 0
+    last = -1   # index in out van de lopende tekstregel (voor join)
+    for line in clean.splitlines(keepends=True):
+        prefix = _MD_PREFIX_RE.match(line).end()
+        text = line[prefix:]
+        lead = len(text) - len(text.lstrip())
+        if not text.strip():
+            last = -1
+        elif join and last >= 0 and not line[:prefix].strip():
+            out[last] = (out[last][0], out[last][1] + " " + html.unescape(text))
+        else:
+            last = len(out)
+            out.append((offset + pos + prefix + lead, html.unescape(text)))
+        pos += len(line)
+    return out
+
+# ============================================================
+# Segmenten per bestand
+# ============================================================
+
+def split_sentences(text: str) -> List[Tuple[int, str]]:
+    """(offset, zin) in een genormaliseerde tekst; knippen alleen vóór een hoofdletter."""
+    out: List[Tuple[int, str]] = []
+    start = 0
+    for m in _SENTENCE_END_RE.finditer(text):
+        nxt = m.end()
+        while nxt < len(text) and text[nxt] in _SENTENCE_OPEN:
+            nxt += 1
+        if nxt < len(text) and text[nxt].isupper():
+            out.append((start, text[start:m.end()].rstrip()))
+            start = m.end()
+    out.append((start, text[start:]))
+    return [(off, sent) for off, sent in out if _HAS_LETTER_RE.search(sent)]
+
+
+def _sentence_starts(text: str, pos: int, seg: str) -> Iterator[Tuple[int, str]]:
+    """
+    (bronpositie, zin) per zin van seg, dat op pos begint. De bron heeft nog de
+    oorspronkelijke witruimte en tags, dus we zoeken het eerste woord van elke zin
+    vanaf de vorige; niet gevonden (entities, escapes) = de positie van de vorige zin.
+    """
+    limit = pos + 4 * len(seg) + 256
+    for off, sent in split_sentences(seg):
+        if off:
+            word = _FIRST_WORD_RE.search(sent)
+            k = text.find(word.group(), pos + 1, limit) if word else -1
+            if k >= 0:
+                pos = k
+        yield pos, sent
+
+
+def extract_segments(text: str, suffix: str, sentences: bool = False) -> List[Segment]:
+    """
+    Zichtbare segmenten van een gedecodeerde tekst, met regel/kolom in die tekst; met
+    sentences één segment per zin.
+    """
+    suffix = suffix.lower()
+    if suffix in (".md", ".mdx"):
+        raw = extract_markdown(text, mdx=suffix == ".mdx", join=sentences)
+    else:
+        raw = extract_js(text, jsx=suffix != ".ts")
+
+    starts = [0]
+    for line in text.splitlines(keepends=True):
+        starts.append(starts[-1] + len(line))
+    segments = []
+    for pos, seg in raw:
+        seg = " ".join(seg.split())
+        if not seg or not _HAS_LETTER_RE.search(seg):
+            continue
+        for start, part in (_sentence_starts(text, pos, seg) if sentences else ((pos, seg),)):
+            line = bisect.bisect_right(starts, start)
+            segments.append(Segment(line, start - starts[line - 1] + 1, part))
+    return segments
+
+
+_CACHE: "OrderedDict[Tuple[bytes, str, bool], List[Segment]]" = OrderedDict()
+
+
+def file_segments(path: Path, sentences: bool = False) -> Optional[List[Segment]]:
+    """Segmenten (of zinnen) van path (LRU per proces), of None voor extensies zonder extractie."""
+    suffix = path.suffix.lower()
+    if suffix not in EXTRACT_EXT:
+        return None
+    data = content_scan.preloaded(path)
+    if data is None:
+        with open(path, "rb") as fh:
+            data = fh.read()
+    # Op inhoud: een blob (--staged, content_history) hoeft niet te kloppen met het pad op schijf.
+    key = (hashlib.blake2b(data, digest_size=16).digest(), suffix, sentences)
+    cached = _CACHE.get(key)
+    if cached is not None:
+        _CACHE.move_to_end(key)
+        return cached
+    segments = extract_segments(data.decode("utf-8", errors="ignore"), suffix, sentences)
+    _CACHE[key] = segments
+    if len(_CACHE) > SEGMENT_CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return segments
+
+
+def visible_lines(path: Path) -> Optional[Iterator[Tuple[int, str]]]:
+    """(regelnummer, segmenttekst) voor content_scan.iter_lines, of None = gewone regels."""
+    segments = file_segments(path)
+    if segments is None:
+        return None
+    return ((seg.line, seg.text) for seg in segments)
+
+
+def sentence_lines(path: Path) -> Optional[Iterator[Tuple[int, str]]]:
+    """Als visible_lines, maar per zin."""
+    segments = file_segments(path, sentences=True)
+    if segments is None:
+        return None
+    return ((seg.line, seg.text) for seg in segments)
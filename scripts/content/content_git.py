@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Git-diff scope voor de content-audits (--changed-since REV / --staged).
+
+Leest gewijzigde paden en regelnummers uit `git diff -U0` en levert alleen die
+bestanden aan de scanner, in plaats van de hele boom te walken. De scope-regels van
+elk script (EXCLUDE_DIRS, extensies, app/(site)) blijven via select_changed gelden.
+
+Bij --staged komen de regelnummers uit de index; de scan leest dan ook de gestagede
+blobs (ChangedLines.blobs, via ScanOptions.blobs) in plaats van de werkboom, anders
+vallen hits op de verkeerde regels zodra werkboom en index verschillen.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from content_walk import scope_filter
+
+HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+# \a \b \t \n \v \f \r \" \\ in C-gequote paden; \ooo zijn losse bytes.
+C_ESCAPES = {"a": 7, "b": 8, "t": 9, "n": 10, "v": 11, "f": 12, "r": 13, '"': 34, "\\": 92}
+
+# Gewone bestanden; symlinks (120000) en submodules (160000) scant de walk ook niet.
+REGULAR_MODES = {"100644", "100755"}
+
+
+class ChangedLines(Dict[Path, Set[int]]):
+    """Gewijzigd pad → nieuwe regelnummers (leeg = alleen verwijderingen); bij --staged ook de blobs."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Pad → gestagede inhoud (alleen --staged): die hoort bij de regelnummers, niet de werkboom.
+        self.blobs: Optional[Dict[Path, bytes]] = None
+
+
+class GitScopeError(RuntimeError):
+    pass
+
+
+def _git(args: List[str], cwd: Path) -> str:
+    import subprocess   # alleen bij --changed-since/--staged/--gitignore
+
+    try:
+        proc = subprocess.run(["git", "-c", "core.quotePath=false", *args], cwd=str(cwd),
+                              capture_output=True, text=True, encoding="utf-8", errors="replace")
+    except OSError as e:
+        raise GitScopeError(str(e)) from e
+    if proc.returncode != 0:
+        raise GitScopeError(proc.stderr.strip() or f"git {' '.join(args)} faalde")
+    return proc.stdout
+
+
+def _unquote(quoted: str) -> str:
+    """Een C-gequoot pad van git (zonder de aanhalingstekens) terug naar de naam."""
+    out = bytearray()
+    i = 0
+    while i < len(quoted):
+        ch = quoted[i]
+        if ch == "\\" and i + 1 < len(quoted):
+            nxt = quoted[i + 1]
+            digits = quoted[i + 1:i + 4]
+            if len(digits) == 3 and all(d in "01234567" for d in digits):
+                out.append(int(digits, 8) & 0xFF)
+                i += 4
+                continue
+            if nxt in C_ESCAPES:
+                out.append(C_ESCAPES[nxt])
+            else:
+                out += nxt.encode("utf-8")
+            i += 2
+            continue
+        out += ch.encode("utf-8")
+        i += 1
+    return out.decode("utf-8", errors="replace")
+
+
+def _diff_path(field: str) -> Optional[str]:
+    """
+    Pad uit een `+++ `-kopregel (None = /dev/null). Git zet een tab achter paden met
+    een spatie en quoot paden met aanhalingstekens, backslashes of stuurtekens.
+    """
+    if field.endswith("\t"):
+        field = field[:-1]
+    if len(field) >= 2 and field[0] == field[-1] == '"':
+        field = _unquote(field[1:-1])
+    if field == "/dev/null":
+        return None
+    return field[2:] if field.startswith("b/") else field
+
+
+def parse_diff(diff: str, toplevel: Path, blobs: Optional[Dict[Path, str]] = None) -> ChangedLines:
+    """
+    Parse `git diff -U0`-uitvoer naar {absoluut pad: gewijzigde regels}. Met blobs erbij
+    (uitvoer met --full-index) komt daar de nieuwe blob-sha van elk gewoon bestand in.
+    """
+    changed = ChangedLines()
+    current: Optional[Set[int]] = None
+    header = False
+    sha = mode = None
+    # Op "\n" knippen: splitlines knipt ook op \r, \f enz. binnen een gewijzigde regel.
+    for line in diff.split("\n"):
+        if line.startswith("diff --git "):
+            header, current, sha, mode = True, None, None, None
+        elif line.startswith("@@"):
+            header = False
+            m = HUNK_RE.match(line)
+            if current is None or not m:
+                continue
+            start = int(m.group(1))
+            count = 1 if m.group(2) is None else int(m.group(2))
+            current.update(range(start, start + count))
+        elif not header:
+            continue    # inhoud: een toegevoegde regel "++ x" staat er als "+++ x"
+        elif line.startswith("index "):
+            # "index <oud>..<nieuw>[ <mode>]"
+            fields = line.split(" ")
+            sha = fields[1].partition("..")[2]
+            if len(fields) > 2:
+                mode = fields[2]
+        elif line.startswith(("new file mode ", "new mode ")):
+            mode = line.rsplit(" ", 1)[1]
+        elif line.startswith("+++ "):
+            target = _diff_path(line[4:])
+            if target is None:
+                current = None
+                continue
+            path = (toplevel / target).resolve()
+            current = changed.setdefault(path, set())
+            if blobs is not None and sha and mode in REGULAR_MODES:
+                blobs[path] = sha
+    return changed
+
+
+def changed_lines(cwd: Path, rev: str | None = None, staged: bool = False) -> ChangedLines:
+    toplevel = Path(_git(["rev-parse", "--show-toplevel"], cwd).strip())
+    args = ["diff", "-U0", "--no-color", "--no-ext-diff", "--diff-filter=ACMR",
+            "--src-prefix=a/", "--dst-prefix=b/"]
+    if staged:
+        args += ["--cached", "--full-index"]
+    if rev:
+        args.append(rev)
+    args.append("--")
+    if not staged:
+        return parse_diff(_git(args, cwd), toplevel)
+
+    shas: Dict[Path, str] = {}
+    changed = parse_diff(_git(args, cwd), toplevel, shas)
+    # Eén `git cat-file --batch` voor alle gestagede bestanden.
+    reader = BlobReader(toplevel)
+    try:
+        changed.blobs = {path: reader.read(sha) for path, sha in shas.items()}
+    finally:
+        reader.close()
+    return changed
+
+
+def staged_blobs(changed: Optional[ChangedLines]) -> Optional[Dict[Path, bytes]]:
+    """Wat de scan bij --staged moet lezen (ScanOptions.blobs); None = de werkboom."""
+    # Een gewone dict (bv. in tests) als ChangedLines kan ook: die heeft geen blobs.
+    return getattr(changed, "blobs", None)
+
+
+def select_changed(changed: ChangedLines, roots: Iterable[Path], exclude_dirs: Set[str],
+                   is_candidate: Callable[[Path], bool], scope_fragment: Optional[str] = None) -> List[Path]:
+    """
+    Gewijzigde bestanden die de normale walk van het script ook had opgeleverd;
+    scope_fragment zoals bij content_walk.walk_files (relatief aan de root).
+    """
+    roots = [r.resolve() for r in roots]
+    scopes = [scope_filter(r, scope_fragment) if scope_fragment else None for r in roots]
+    selected: List[Path] = []
+    for p in sorted(changed):
+        for root, in_scope in zip(roots, scopes):
+            try:
+                rel = p.relative_to(root)
+            except ValueError:
+                continue
+            if any(part in exclude_dirs for part in rel.parts[:-1]):
+                continue
+            if in_scope is not None and not in_scope(rel.as_posix()):
+                continue
+            if p.is_file() and is_candidate(p):
+                selected.append(p)
+            break
+    return selected
+
+def gitignored_paths(root: Path) -> Optional[Set[str]]:
+    """Door git genegeerde, niet-getrackte paden onder root (mappen zonder "/"), of None buiten een repo."""
+    try:
+        out = _git(["ls-files", "--others", "--ignored", "--exclude-standard", "--directory", "-z"], root)
+    except GitScopeError:
+        return None
+    return {os.path.join(str(root), rel.rstrip("/")) for rel in out.split("\0") if rel}
+
+# ============================================================
+# Geschiedenis (content_history)
+# ============================================================
+
+def git_toplevel(cwd: Path) -> Path:
+    return Path(_git(["rev-parse", "--show-toplevel"], cwd).strip())
+
+
+def commit_range(toplevel: Path, rev_range: str, first_parent: bool = False) -> List[Tuple[str, str, str]]:
+    """(sha, committerdatum ISO 8601, onderwerp) per commit in rev_range, oudste eerst."""
+    args = ["log", "--reverse", "--format=%H%x00%cI%x00%s"]
+    if first_parent:
+        args.append("--first-parent")
+    out = _git([*args, rev_range, "--"], toplevel)
+    return [tuple(line.split("\0", 2)) for line in out.splitlines() if line]  # type: ignore[misc]
+
+
+def tree_blobs(toplevel: Path, commit: str, pathspec: str) -> Dict[str, str]:
+    """{pad t.o.v. toplevel: blob-sha} van de gewone bestanden onder pathspec in commit."""
+    out = _git(["ls-tree", "-r", "-z", commit, "--", pathspec], toplevel)
+    blobs: Dict[str, str] = {}
+    for entry in out.split("\0"):
+        if not entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        mode, _, sha = meta.split(" ")
+        if mode in REGULAR_MODES:
+            blobs[path] = sha
+    return blobs
+
+
+def changed_blobs(toplevel: Path, old: str, new: str, pathspec: str) -> List[Tuple[str, Optional[str]]]:
+    """(pad, nieuwe blob-sha) per gewijzigd pad tussen twee commits; None = weg (of geen gewoon bestand meer)."""
+    out = _git(["diff-tree", "-r", "-z", "--no-renames", "--no-commit-id", old, new, "--", pathspec], toplevel)
+    parts = out.split("\0")
+    changes: List[Tuple[str, Optional[str]]] = []
+    # ":oudmode nieuwmode oudsha nieuwsha status" NUL pad NUL
+    for meta, path in zip(parts[0::2], parts[1::2]):
+        _, new_mode, _, new_sha, status = meta.lstrip(":").split(" ")
+        changes.append((path, new_sha if status != "D" and new_mode in REGULAR_MODES else None))
+    return changes
+
+
+class BlobReader:
+    """Eén `git cat-file --batch` voor alle blobs: geen proces per bestand of checkout per commit."""
+
+    def __init__(self, toplevel: Path):
+        import subprocess
+
+        try:
+            self.proc = subprocess.Popen(["git", "cat-file", "--batch"], cwd=str(toplevel),
+                                         stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        except OSError as e:
+            raise GitScopeError(str(e)) from e
+
+    def read(self, sha: str) -> bytes:
+        assert self.proc.stdin is not None and self.proc.stdout is not None
+        self.proc.stdin.write(sha.encode("ascii") + b"\n")
+        self.proc.stdin.flush()
+        header = self.proc.stdout.readline().split()
+        if len(header) != 3:
+            raise GitScopeError(f"git cat-file: {b' '.join(header).decode(errors='replace') or 'geen antwoord'}")
+        data = self.proc.stdout.read(int(header[2]))
+        self.proc.stdout.read(1)   # afsluitende newline
+        return data
+
+    def close(self) -> None:
+        if self.proc.stdin is not None:
+            self.proc.stdin.close()
+        self.proc.wait()
+
+# ============================================================
+# CLI
+# ============================================================
+
+def add_git_arguments(parser) -> None:
+    g = parser.add_argument_group("git-scope")
+    g.add_argument("--changed-since", metavar="REV", default=None,
+                   help="alleen bestanden die sinds REV gewijzigd zijn")
+    g.add_argument("--staged", action="store_true", help="alleen gestagede wijzigingen")
+    g.add_argument("--changed-lines-only", action="store_true",
+                   help="alleen hits op gewijzigde regels rapporteren")
+    g.add_argument("--gitignore", action="store_true",
+                   help="bij een volledige walk door .gitignore genegeerde paden overslaan")
+
+
+def git_scope(args, cwd: Path) -> Optional[ChangedLines]:
+    """ChangedLines volgens de CLI-opties, of None als er geen git-scope gevraagd is."""
+    if not args.changed_since and not args.staged:
+        return None
+    return changed_lines(cwd, rev=args.changed_since, staged=args.staged)
+
+
+def walk_ignored(args, root: Path) -> Optional[Set[str]]:
+    """Paden die de walk moet overslaan volgens --gitignore (None = niets)."""
+    return gitignored_paths(root) if args.gitignore else None
+
+
+def on_changed_line(changed: Optional[ChangedLines], only_lines: bool, path: Path, line_no: int) -> bool:
+    if changed is None or not only_lines:
+        return True
+    return line_no in changed.get(path.resolve(), ())
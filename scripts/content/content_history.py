@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Trend van de content-audits over de git-geschiedenis.
+
+  python scripts/content/content_history.py v1.0..main > trend.csv
+  python scripts/content/content_history.py HEAD~200..HEAD --first-parent --format json
+  python scripts/content/content_history.py main --category "Harde juridische claim" --category HARD
+
+Per commit in het bereik (oudste eerst) houden we de boom onder --root bij als
+{pad: blob-sha}: de eerste commit via `git ls-tree`, daarna alleen wat `git diff-tree`
+tussen twee opeenvolgende commits als gewijzigd meldt. Niets wordt uitgecheckt.
+
+Alleen blobs die nog niet bekend zijn gaan door één `git cat-file --batch` en de
+scanners van content_suite (dezelfde regels en bestandsselectie als de losse
+commando's). Per blob bewaren we alleen tellingen per categorie, in de BlobCache
+(content_cache), gekeyd op blob-sha, de rapporten die het pad raken en de regels. Een
+bestand dat in 500 commits gelijk blijft wordt dus één keer gelezen en gescand, en een
+tweede run over hetzelfde bereik leest geen enkele blob.
+
+Uitvoer: één rij per commit (sha, datum, onderwerp) met een kolom per
+"rapport:categorie" (audit, funnelcheck SOFT/HARD, conscious incl. CTA-pagina's zonder
+reflectievragen, content), als CSV of JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections import Counter
+from functools import partial
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import content_audit
+import content_conscious_audit
+import content_suite
+import freeze_site_copy
+from content_cache import BlobCache, add_cache_arguments, open_blob_cache
+from content_git import BlobReader, GitScopeError, changed_blobs, commit_range, git_toplevel, tree_blobs
+from content_scan import HelpFormatter, ScanOptions, add_jobs_argument, add_stats_argument, run_scan, scan_options, set_preloaded
+from content_walk import scope_filter
+
+DEFAULT_ROOT = content_suite.DEFAULT_ROOT
+REPORTS = content_suite.REPORTS
+
+# Script per rapport: INCLUDE_EXT, EXCLUDE_DIRS en MAX_FILE_SIZE_MB komen daar vandaan.
+MODULES = {
+    "audit": freeze_site_copy,
+    "funnelcheck": freeze_site_copy,
+    "conscious": content_conscious_audit,
+    "content": content_audit,
+}
+
+CTA_COLUMN = "conscious:CTA zonder reflectievragen"
+
+# Zoveel nieuwe blobs per run_scan (en dus hooguit zoveel tegelijk in het geheugen).
+SCAN_BATCH = 1024
+
+# ============================================================
+# Selectie
+# ============================================================
+
+def in_scope(report: str, rel: PurePosixPath, rel_to_root: PurePosixPath,
+             site_scope: Callable[[str], bool]) -> bool:
+    """
+    is_candidate van het rapport, maar op het pad in de commit (grootte volgt bij het
+    scannen); site_scope is content_walk.scope_filter voor de root.
+    """
+    module = MODULES[report]
+    if rel.suffix.lower() not in module.INCLUDE_EXT:
+        return False
+    if any(part in module.EXCLUDE_DIRS for part in rel_to_root.parts[:-1]):
+        return False
+    if report == "content":
+        return not content_audit.is_ignored(rel) and site_scope(rel_to_root.as_posix())
+    return True
+
+
+def columns(reports: Sequence[str]) -> List[str]:
+    """Alle kolommen in rapportvolgorde, ook als ze in het hele bereik 0 blijven."""
+    out: List[str] = []
+    for report in reports:
+        if report == "audit":
+            out += [f"audit:{cat}" for cat in freeze_site_copy.PATTERNS]
+        elif report == "funnelcheck":
+            out += ["funnelcheck:SOFT", "funnelcheck:HARD"]
+        elif report == "conscious":
+            out += [f"conscious:{cat}" for cat in content_conscious_audit.AUDIT_RULES] + [CTA_COLUMN]
+        elif report == "content":
+            out += [f"content:{cat}" for cat in content_audit.PATTERNS]
+    return out
+
+# ============================================================
+# Blobs scannen
+# ============================================================
+
+def _label_counts(prefix: str, labels: List[Tuple[str, str]], file_hits: Any, counts: Counter) -> None:
+    # Alleen de regel-id's uit de FileHits-rijen; de regeltekst is hier niet nodig.
+    for idx, n in Counter(file_hits.rows[0::4]).items():
+        counts[prefix + labels[idx][0]] += n
+
+
+def blob_counts(result: Dict[str, Any]) -> Dict[str, int]:
+    """Tellingen per kolom uit het content_suite-resultaat van één bestand."""
+    counts: Counter = Counter()
+    if "audit" in result:
+        _label_counts("audit:", freeze_site_copy.LABELS, result["audit"], counts)
+    if "funnelcheck" in result:
+        soft_lines, hard_lines = result["funnelcheck"]
+        counts["funnelcheck:SOFT"] += len(soft_lines)
+        counts["funnelcheck:HARD"] += len(hard_lines)
+    if "conscious" in result:
+        hits, has_cta, has_questions = result["conscious"]
+        _label_counts("conscious:", content_conscious_audit.new_hits().labels, hits, counts)
+        if has_cta and not has_questions:
+            counts[CTA_COLUMN] += 1
+    if "content" in result:
+        _label_counts("content:", content_audit.LABELS, result["content"], counts)
+    return {col: n for col, n in counts.items() if n}
+
+
+def scan_blob(item: Tuple[str, Tuple[str, ...], bytes], suite: content_suite.SuiteRules) -> Dict[str, int]:
+    """Zoals content_suite.scan_file, maar op de bytes van een blob i.p.v. een bestand op schijf."""
+    blob, applies, data = item
+    applies = tuple(r for r in applies if len(data) <= MODULES[r].MAX_FILE_SIZE_MB * 1024 * 1024)
+    # De blob-sha als (nergens bestaand) pad: iter_lines en de prefilter lezen de bytes hierboven.
+    p = Path(blob)
+    set_preloaded(p, data)
+    try:
+        result = content_suite.scan_file((p, blob, applies), suite) if applies else {}
+    finally:
+        set_preloaded(None, None)
+    return blob_counts(result or {})
+
+
+def no_path(item: Any) -> None:
+    return None
+
+# ============================================================
+# Geschiedenis
+# ============================================================
+
+class HistoryStats:
+    def __init__(self) -> None:
+        self.commits = 0
+        self.changes = 0
+        self.blobs = 0
+        self.read = 0
+        self.cached = 0
+
+    def footer(self) -> str:
+        return (f"📊 {self.commits} commits, {self.changes} bestandswijzigingen, {self.blobs} unieke blobs: "
+                f"{self.read} gelezen en gescand, {self.cached} uit cache")
+
+
+def walk_history(toplevel: Path, commits: List[Tuple[str, str, str]], pathspec: str,
+                 root_rel: PurePosixPath, reports: Sequence[str],
+                 stats: HistoryStats) -> List[List[Tuple[str, Optional[Tuple[str, Tuple[str, ...]]]]]]:
+    """
+    Per commit de wijzigingen als (pad, (blob-sha, rapporten) of None). De eerste
+    commit levert z'n hele boom onder root, elke volgende alleen het verschil.
+    """
+    site_scope = scope_filter(toplevel / root_rel, content_audit.SITE_ROOT_FRAGMENT)
+    out = []
+    prev = None
+    for sha, _, _ in commits:
+        if prev is None:
+            changes: List[Tuple[str, Optional[str]]] = list(tree_blobs(toplevel, sha, pathspec).items())
+        else:
+            changes = changed_blobs(toplevel, prev, sha, pathspec)
+        keyed = []
+        for path, blob in changes:
+            key = None
+            if blob is not None:
+                rel = PurePosixPath(path)
+                applies = tuple(r for r in reports if in_scope(r, rel, rel.relative_to(root_rel), site_scope))
+                if applies:
+                    key = (blob, applies)
+            keyed.append((path, key))
+        out.append(keyed)
+        stats.changes += len(changes)
+        prev = sha
+    return out
+
+
+def count_blobs(toplevel: Path, keys: List[Tuple[str, Tuple[str, ...]]], cache: Optional[BlobCache],
+                jobs: int, stats: HistoryStats,
+                options: Optional[ScanOptions] = None) -> Dict[Tuple[str, Tuple[str, ...]], Dict[str, int]]:
+    """Tellingen per (blob, rapporten): uit de cache, anders via cat-file + de suite-scanners."""
+    counts: Dict[Tuple[str, Tuple[str, ...]], Dict[str, int]] = {}
+    todo: List[Tuple[str, Tuple[str, ...]]] = []
+    for key in keys:
+        found, value = cache.get(key[0], ",".join(key[1])) if cache is not None else (False, None)
+        if found:
+            counts[key] = value
+        else:
+            todo.append(key)
+    stats.blobs = len(keys)
+    stats.cached = len(keys) - len(todo)
+    if not todo:
+        return counts
+
+    setup = partial(content_suite.SuiteRules, tuple(REPORTS))
+    reader = BlobReader(toplevel)
+    try:
+        for start in range(0, len(todo), SCAN_BATCH):
+            batch = todo[start:start + SCAN_BATCH]
+            items = [(blob, applies, reader.read(blob)) for blob, applies in batch]
+            results = run_scan(scan_blob, items, setup, jobs=jobs, empty=dict, path_of=no_path, options=options)
+            for key, value in zip(batch, results):
+                counts[key] = value
+                if cache is not None:
+                    cache.put(key[0], ",".join(key[1]), value)
+            stats.read += len(batch)
+    finally:
+        reader.close()
+    return counts
+
+
+def series(commits: List[Tuple[str, str, str]], changes: List[List[Tuple[str, Any]]],
+           counts: Dict[Tuple[str, Tuple[str, ...]], Dict[str, int]]) -> Iterator[Tuple[Tuple[str, str, str], Counter]]:
+    """Lopende totalen: per commit alleen de gewijzigde paden eraf en erbij."""
+    tree: Dict[str, Any] = {}
+    totals: Counter = Counter()
+    for commit, commit_changes in zip(commits, changes):
+        for path, key in commit_changes:
+            old = tree.pop(path, None)
+            if old is not None:
+                totals.subtract(counts[old])
+            if key is not None:
+                tree[path] = key
+                totals.update(counts[key])
+        yield commit, totals
+
+# ============================================================
+# Uitvoer
+# ============================================================
+
+def write_csv(out, cols: List[str], rows: Iterator[Tuple[Tuple[str, str, str], Counter]]) -> None:
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["commit", "datum", "onderwerp", *cols])
+    for (sha, date, subject), totals in rows:
+        writer.writerow([sha, date, subject, *(totals[c] for c in cols)])
+
+
+def write_json(out, cols: List[str], rows: Iterator[Tuple[Tuple[str, str, str], Counter]], **meta: Any) -> None:
+    doc = {**meta, "columns": cols,
+           "series": [{"commit": sha, "date": date, "subject": subject, "counts": {c: totals[c] for c in cols}}
+                      for (sha, date, subject), totals in rows]}
+    json.dump(doc, out, ensure_ascii=False, indent=2)
+    out.write("\n")
+
+# ============================================================
+# Main
+# ============================================================
+
+def main() -> int:
+    ap = argparse.ArgumentParser(formatter_class=HelpFormatter,
+                                 description="Tellingen per categorie voor elke commit in een git-bereik")
+    ap.add_argument("range", nargs="?", default="HEAD", help="commitbereik voor git log, bv. v1.0..main")
+    ap.add_argument("--root", default=DEFAULT_ROOT)
+    ap.add_argument("--reports", default=",".join(REPORTS),
+                    help=f"komma-gescheiden subset van: {', '.join(REPORTS)}")
+    ap.add_argument("--first-parent", action="store_true", help="alleen de hoofdlijn (merges als één stap)")
+    ap.add_argument("--category", action="append", default=[], metavar="TEKST",
+                    help="alleen kolommen die TEKST bevatten (herhaalbaar)")
+    ap.add_argument("--format", choices=["csv", "json"], default="csv")
+    ap.add_argument("--output", "-o", default=None, help="naar bestand i.p.v. stdout")
+    add_jobs_argument(ap)
+    add_cache_arguments(ap, store=False)
+    add_stats_argument(ap)
+    args = ap.parse_args()
+
+    reports = [r.strip() for r in args.reports.split(",") if r.strip()]
+    unknown = [r for r in reports if r not in REPORTS]
+    if unknown:
+        print("Onbekende rapporten:", ", ".join(unknown), file=sys.stderr)
+        return 2
+    reports = [r for r in REPORTS if r in reports]
+
+    root = Path(args.root).resolve()
+    try:
+        toplevel = git_toplevel(root if root.is_dir() else Path.cwd())
+        root_rel = PurePosixPath(root.relative_to(toplevel).as_posix())
+    except GitScopeError as e:
+        print("Geen git-repo:", e, file=sys.stderr)
+        return 1
+    except ValueError:
+        print("Root ligt buiten de repo:", root, file=sys.stderr)
+        return 1
+    pathspec = f":(literal){root_rel}" if str(root_rel) != "." else "."
+
+    stats = HistoryStats()
+    cache = open_blob_cache(args, content_suite.rules_fingerprint(REPORTS))
+    try:
+        commits = commit_range(toplevel, args.range, args.first_parent)
+        stats.commits = len(commits)
+        changes = walk_history(toplevel, commits, pathspec, root_rel, reports, stats)
+        keys = list(dict.fromkeys(key for commit_changes in changes for _, key in commit_changes if key))
+        counts = count_blobs(toplevel, keys, cache, args.jobs, stats, scan_options(args))
+    except GitScopeError as e:
+        print("git faalde:", e, file=sys.stderr)
+        return 1
+    finally:
+        if cache:
+            cache.close()
+
+    cols = columns(reports)
+    if args.category:
+        cols = [c for c in cols if any(t.lower() in c.lower() for t in args.category)]
+    rows = series(commits, changes, counts)
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            write_csv(out, cols, rows)
+        else:
+            write_json(out, cols, rows, range=args.range, root=str(root_rel))
+    finally:
+        if args.output:
+            out.close()
+    if args.stats:
+        print(stats.footer(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,759 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Copy-index over de hele scope van de audits, voor directe zinsdeel-queries.
+
+  python scripts/content/content_index.py build
+  python scripts/content/content_index.py query "zonder risico" "alleen via"
+  python scripts/content/content_index.py query gezag --near tarief --within 5
+  python scripts/content/content_index.py query --regex '\\bgarandeer\\w*\\b'
+  python scripts/content/content_index.py audit conscious
+
+Het index (.cache/content-index.sqlite) is een inverted index van genormaliseerde
+woorden (casefold, zonder accenten: "één" → "een") naar (bestand, positie, regel,
+kolom). Posities tellen woorden per bestand door, dus een zinsdeel dat in JSX over twee
+regels loopt telt gewoon mee. Elke query werkt het index eerst bij op mtime + grootte
+(alleen gewijzigde bestanden worden opnieuw getokeniseerd); --no-update slaat dat over.
+
+Een woord met "*" erachter is een prefix ("garandeer*"). --near zoekt het tweede
+zinsdeel binnen --within woorden van het eerste, in beide richtingen (--ordered: alleen
+erna).
+
+`audit` draait een regelset uit de rule-packs (content_audit, conscious, freeze_audit,
+funnel_soft, funnel_hard) via het index: elk patroon wordt vertaald naar woordgroepen
+die op dezelfde regel moeten staan, alleen die kandidaat-regels worden gelezen en met de
+echte regex gecontroleerd, met dezelfde regelfilters als het script zelf (conscious slaat
+lege, schema.org- en commentaarregels over; funnel telt een regel één keer). De hits zijn
+dus dezelfde als bij een volledige scan; een patroon dat niet te vertalen is, wordt wel
+volledig gescand. --regex doet hetzelfde voor losse patronen. --changed-since/--staged
+beperken queries en audits tot de gewijzigde bestanden (--changed-lines-only: regels).
+
+Met --visible-only/--sentences bevat het index alleen de zichtbare tekst; segmenten
+krijgen dan een gat in de posities, zodat zinsdelen en --near niet over segmenten (of
+zinnen) heen matchen. Een ander modus bouwt het index opnieuw op.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sqlite3
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from content_extract import EXTRACT_VERSION
+from content_git import ChangedLines, GitScopeError, add_git_arguments, git_scope, staged_blobs, walk_ignored
+from content_report import display_path
+from content_scan import (PREFETCH_DEPTH, RuleSet, ScanOptions, add_jobs_argument, add_visible_argument, iter_lines, run_scan,
+                          scan_context, sre_constants, sre_parse, text_filter_for, text_mode)
+
+DEFAULT_ROOT = "app/(site)"
+DEFAULT_INDEX_PATH = Path(".cache") / "content-index.sqlite"
+
+# Ophogen als de tokenisering of de opslag verandert.
+INDEX_VERSION = 1
+
+# Positiegat tussen segmenten (--visible-only/--sentences); --within blijft eronder.
+SEGMENT_GAP = 1 << 10
+
+# Regelsets die `audit` kent, met het rapport van content_suite dat hun bestanden kiest.
+AUDIT_REPORTS = {
+    "content_audit": "content",
+    "conscious": "conscious",
+    "freeze_audit": "audit",
+    "funnel_soft": "funnelcheck",
+    "funnel_hard": "funnelcheck",
+}
+
+# Regelsets waarvan het script een regel één keer telt (funnelcheck: SOFT/HARD per regel).
+PER_LINE = {"funnel_soft", "funnel_hard"}
+
+# (woord, prefix) of None = een willekeurig woord op die positie.
+Term = Optional[Tuple[str, bool]]
+Phrase = Tuple[Term, ...]
+# Alternatieven, elk een aantal zinsdelen die samen op één regel moeten staan.
+Plan = List[Tuple[Phrase, ...]]
+# (positie, regel, kolom) per voorkomen.
+Occurrence = Tuple[int, int, int]
+
+
+class QueryError(Exception):
+    pass
+
+# ============================================================
+# Tokens
+# ============================================================
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize(token: str) -> str:
+    """Casefold zonder accenten; volgt re.IGNORECASE (ook ı/İ, ß, ſ, K)."""
+    if token.isascii():
+        return token.lower()
+    folded = token.casefold().replace("ı", "i")
+    stripped = "".join(c for c in unicodedata.normalize("NFKD", folded) if not unicodedata.combining(c))
+    return stripped or folded
+
+
+def tokenize(text: str) -> Iterator[Tuple[int, str]]:
+    """(kolom, genormaliseerd woord); kolom 1-based, woordgrenzen als regex \\b."""
+    for m in _TOKEN_RE.finditer(text):
+        yield m.start() + 1, normalize(m.group())
+
+
+def index_file(path: Path, segmented: bool) -> Tuple[Dict[str, bytes], int]:
+    """Postings van één bestand: woord → array("I") van (positie, regel, kolom)-triples."""
+    postings: Dict[str, array] = {}
+    pos = 0
+    try:
+        for line_no, text in iter_lines(path):
+            for col, token in tokenize(text):
+                occ = postings.get(token)
+                if occ is None:
+                    occ = postings[token] = array("I")
+                occ.extend((pos, line_no, col))
+                pos += 1
+            if segmented:
+                pos += SEGMENT_GAP
+    except OSError:
+        return {}, 0
+    return {token: occ.tobytes() for token, occ in postings.items()}, pos
+
+
+def _index_state() -> bool:
+    return True
+
+
+def _index_item(segmented: bool, path: Path, _state: bool) -> Tuple[Dict[str, bytes], int]:
+    return index_file(path, segmented)
+
+
+def _occurrences(data: bytes) -> List[Occurrence]:
+    flat = array("I")
+    flat.frombytes(data)
+    return list(zip(flat[0::3], flat[1::3], flat[2::3]))
+
+# ============================================================
+# Index
+# ============================================================
+
+class CopyIndex:
+    """SQLite-index: files (pad, mtime, grootte) en postings (woord, bestand) → posities."""
+
+    def __init__(self, path: Path, mode: str = ""):
+        self.path = path
+        self.mode = mode
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        stamp = f"{INDEX_VERSION}:{mode}:{EXTRACT_VERSION if mode else ''}"
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'stamp'").fetchone()
+        if row is None or row[0] != stamp:
+            # Andere versie of modus: opnieuw beginnen.
+            self.db.execute("DROP TABLE IF EXISTS files")
+            self.db.execute("DROP TABLE IF EXISTS postings")
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('stamp', ?)", (stamp,))
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " id INTEGER PRIMARY KEY, path TEXT UNIQUE, mtime_ns INTEGER, size INTEGER, tokens INTEGER)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            " token TEXT, file INTEGER, data BLOB, PRIMARY KEY (token, file)) WITHOUT ROWID"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS postings_file ON postings (file)")
+        self.db.commit()
+        self.paths: Dict[int, Path] = {}
+        self.root: Optional[Path] = None
+        self._cache: Dict[Tuple[str, bool], Dict[int, List[Occurrence]]] = {}
+
+    def close(self) -> None:
+        self.db.close()
+
+    def scan_options(self, prefetch: int = PREFETCH_DEPTH) -> ScanOptions:
+        """Zo leest het index de bestanden: met het tekstfilter van zijn modus."""
+        return ScanOptions(prefetch, text_filter_for(self.mode))
+
+    def update(self, paths: Iterable[Path], root: Path, jobs: int = 1,
+               prefetch: int = PREFETCH_DEPTH) -> Tuple[int, int, int]:
+        """Index bijwerken voor de bestanden onder root: (opnieuw geïndexeerd, verwijderd, ongewijzigd)."""
+        prefix = str(root).rstrip("/") + "/"
+        known: Dict[str, Tuple[int, int, int]] = {}
+        for fid, p, mtime_ns, size in self.db.execute("SELECT id, path, mtime_ns, size FROM files"):
+            if p.startswith(prefix):
+                known[p] = (fid, mtime_ns, size)
+
+        todo: List[Tuple[Path, int, int]] = []
+        seen: Set[str] = set()
+        for p in paths:
+            key = str(p)
+            seen.add(key)
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entry = known.get(key)
+            if entry is None or entry[1:] != (st.st_mtime_ns, st.st_size):
+                todo.append((p, st.st_mtime_ns, st.st_size))
+        gone = [entry[0] for key, entry in known.items() if key not in seen]
+
+        results = run_scan(partial(_index_item, bool(self.mode)), [t[0] for t in todo], _index_state, jobs=jobs,
+                           options=self.scan_options(prefetch))
+        with self.db:
+            for fid in gone:
+                self.db.execute("DELETE FROM postings WHERE file = ?", (fid,))
+                self.db.execute("DELETE FROM files WHERE id = ?", (fid,))
+            for (p, mtime_ns, size), (postings, tokens) in zip(todo, results):
+                entry = known.get(str(p))
+                if entry is None:
+                    fid = self.db.execute("INSERT INTO files (path, mtime_ns, size, tokens) VALUES (?, ?, ?, ?)",
+                                          (str(p), mtime_ns, size, tokens)).lastrowid
+                else:
+                    fid = entry[0]
+                    self.db.execute("DELETE FROM postings WHERE file = ?", (fid,))
+                    self.db.execute("UPDATE files SET mtime_ns = ?, size = ?, tokens = ? WHERE id = ?",
+                                    (mtime_ns, size, tokens, fid))
+                self.db.executemany("INSERT INTO postings VALUES (?, ?, ?)",
+                                    ((token, fid, data) for token, data in postings.items()))
+        self._cache.clear()
+        return len(todo), len(gone), len(seen) - len(todo)
+
+    def scope(self, root: Path) -> Dict[int, Path]:
+        """Bestanden onder root (id → pad); queries kijken alleen daarnaar."""
+        prefix = str(root).rstrip("/") + "/"
+        self.root = root
+        self.paths = {fid: Path(p) for fid, p in self.db.execute("SELECT id, path FROM files")
+                      if p.startswith(prefix)}
+        return self.paths
+
+    def counts(self) -> Tuple[int, int, int]:
+        """(bestanden, woorden, unieke woorden) binnen de huidige scope."""
+        tokens = sum(n for fid, n in self.db.execute("SELECT id, tokens FROM files") if fid in self.paths)
+        unique = self.db.execute("SELECT COUNT(DISTINCT token) FROM postings").fetchone()[0]
+        return len(self.paths), tokens, unique
+
+    # ------------------------------------------------------------
+    # Opzoeken
+    # ------------------------------------------------------------
+
+    def postings(self, term: Tuple[str, bool]) -> Dict[int, List[Occurrence]]:
+        """Voorkomens van één woord (of prefix) per bestand in de scope, op positie gesorteerd."""
+        cached = self._cache.get(term)
+        if cached is not None:
+            return cached
+        token, prefix = term
+        if prefix:
+            rows = self.db.execute("SELECT file, data FROM postings WHERE token >= ? AND token < ?",
+                                   (token, token + "\U0010ffff"))
+        else:
+            rows = self.db.execute("SELECT file, data FROM postings WHERE token = ?", (token,))
+        out: Dict[int, List[Occurrence]] = {}
+        for fid, data in rows:
+            if fid in self.paths:
+                out.setdefault(fid, []).extend(_occurrences(data))
+        if prefix:
+            for occ in out.values():
+                occ.sort()
+        self._cache[term] = out
+        return out
+
+    def phrase(self, phrase: Phrase) -> Dict[int, List[Occurrence]]:
+        """Begin van elk voorkomen van het zinsdeel (opeenvolgende woorden) per bestand."""
+        terms = [(i, t) for i, t in enumerate(phrase) if t is not None]
+        if not terms or phrase[0] is None:
+            raise ValueError("zinsdeel moet met een woord beginnen")
+        lists = [(i, self.postings(t)) for i, t in terms]
+        first = lists[0][1]
+        if len(lists) == 1:
+            return first
+        out: Dict[int, List[Occurrence]] = {}
+        for fid in sorted(set(first).intersection(*(p for _, p in lists[1:]))):
+            rest = [(i, {occ[0] for occ in p[fid]}) for i, p in lists[1:]]
+            starts = [occ for occ in first[fid] if all(occ[0] + i in pos for i, pos in rest)]
+            if starts:
+                out[fid] = starts
+        return out
+
+    def near(self, a: Phrase, b: Phrase, within: int, ordered: bool = False) -> Dict[int, List[Occurrence]]:
+        """Voorkomens van a met b binnen `within` woorden (tussen einde en begin)."""
+        hits_a = self.phrase(a)
+        hits_b = self.phrase(b)
+        out: Dict[int, List[Occurrence]] = {}
+        for fid in sorted(set(hits_a) & set(hits_b)):
+            starts_b = [occ[0] for occ in hits_b[fid]]
+            found = []
+            for occ in hits_a[fid]:
+                # b erna: begin b - einde a ≤ within + 1; b ervoor: begin a - einde b ≤ within + 1.
+                lo = occ[0] - (within + len(b)) if not ordered else occ[0] + len(a)
+                hi = occ[0] + len(a) - 1 + within + 1
+                k = bisect_left(starts_b, lo)
+                while k < len(starts_b) and starts_b[k] <= hi:
+                    pb = starts_b[k]
+                    if pb >= occ[0] + len(a) or pb + len(b) <= occ[0]:
+                        found.append(occ)
+                        break
+                    k += 1
+            if found:
+                out[fid] = found
+        return out
+
+    def candidate_lines(self, plan: Plan) -> Dict[int, Set[int]]:
+        """Regels waarop het plan kan matchen: per alternatief alle zinsdelen op één regel."""
+        out: Dict[int, Set[int]] = {}
+        for alt in plan:
+            per_file: Optional[Dict[int, Set[int]]] = None
+            for phrase in alt:
+                lines: Dict[int, Set[int]] = {}
+                for fid, occs in self.phrase(phrase).items():
+                    if per_file is None or fid in per_file:
+                        lines[fid] = {occ[1] for occ in occs}
+                if per_file is not None:
+                    lines = {fid: per_file[fid] & ls for fid, ls in lines.items()}
+                per_file = {fid: ls for fid, ls in lines.items() if ls}
+                if not per_file:
+                    break
+            for fid, ls in (per_file or {}).items():
+                out.setdefault(fid, set()).update(ls)
+        return out
+
+# ============================================================
+# Queries
+# ============================================================
+
+def parse_phrase(text: str) -> Phrase:
+    """Query-tekst → zinsdeel; "woord*" is een prefix, leestekens scheiden woorden."""
+    terms: List[Term] = []
+    for chunk in text.split():
+        words = [token for _, token in tokenize(chunk)]
+        if not words:
+            continue
+        terms.extend((w, False) for w in words)
+        if chunk.endswith("*"):
+            terms[-1] = (terms[-1][0], True)
+    if not terms:
+        raise QueryError(f"geen woorden in {text!r}")
+    return tuple(terms)
+
+
+def phrase_text(phrase: Phrase) -> str:
+    return " ".join("?" if t is None else t[0] + ("*" if t[1] else "") for t in phrase)
+
+# ============================================================
+# Regex → plan
+# ============================================================
+
+# Markers in de uitgeschreven taal van een patroon: woordgrens, willekeurig stuk, woordteken.
+_BOUND, _GAP, _WILD = "\x00", "\x01", "\x02"
+_SEP = " "
+MAX_EXPANSIONS = 64
+
+_WORD_CHAR = re.compile(r"\w")
+_SEP_CATEGORIES = {sre_constants.CATEGORY_SPACE, sre_constants.CATEGORY_NOT_WORD}
+_WORD_CATEGORIES = {sre_constants.CATEGORY_WORD, sre_constants.CATEGORY_DIGIT}
+_BOUNDARIES = {sre_constants.AT_BOUNDARY, sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_STRING,
+               sre_constants.AT_END, sre_constants.AT_END_STRING}
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT,
+            getattr(sre_constants, "POSSESSIVE_REPEAT", sre_constants.MAX_REPEAT)}
+
+
+def _char_class(op, av) -> Optional[List[str]]:
+    """Eén teken: [_SEP] (geen woordteken), letterlijke woordtekens, [_WILD] of None (gemengd)."""
+    if op is sre_constants.LITERAL:
+        c = chr(av)
+        return [c] if _WORD_CHAR.match(c) else [_SEP]
+    if op is not sre_constants.IN:
+        return None
+    word: List[str] = []
+    sep = wild = False
+    for iop, iav in av:
+        if iop is sre_constants.LITERAL:
+            c = chr(iav)
+            if _WORD_CHAR.match(c):
+                word.append(c)
+            else:
+                sep = True
+        elif iop is sre_constants.RANGE:
+            chars = [chr(c) for c in range(iav[0], iav[1] + 1)]
+            if all(_WORD_CHAR.match(c) for c in chars):
+                wild = True
+            elif not any(_WORD_CHAR.match(c) for c in chars):
+                sep = True
+            else:
+                return None
+        elif iop is sre_constants.CATEGORY and iav in _SEP_CATEGORIES:
+            sep = True
+        elif iop is sre_constants.CATEGORY and iav in _WORD_CATEGORIES:
+            wild = True
+        else:
+            return None
+    if sep and (word or wild):
+        return None
+    if sep:
+        return [_SEP]
+    return [_WILD] if wild or len(word) > 8 else word
+
+
+def _expand(items) -> List[str]:
+    out = [""]
+    for op, av in items:
+        alts = _expand_item(op, av)
+        out = list(dict.fromkeys(a + b for a in out for b in alts))
+        if len(out) > MAX_EXPANSIONS:
+            raise OverflowError
+    return out
+
+
+def _expand_item(op, av) -> List[str]:
+    """Een patroon-item als lijst van alternatieven; wat we niet kennen wordt een _GAP."""
+    if op is sre_constants.AT:
+        # Begin/einde van de regel begrenst een woord net zo goed als \b.
+        return [_BOUND] if av in _BOUNDARIES else [""]
+    if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        return [""]
+    if op is sre_constants.SUBPATTERN:
+        return _expand(av[-1])
+    if op is sre_constants.BRANCH:
+        return list(dict.fromkeys(s for seq in av[1] for s in _expand(seq)))
+    if op in _REPEATS:
+        lo, hi, seq = av
+        if hi == 0:
+            return [""]
+        one = _char_class(*seq[0]) if len(seq) == 1 else None
+        if one == [_SEP]:
+            return [_SEP] if lo else [_SEP, ""]
+        if one is not None:
+            # Woordtekens van onbekende lengte: het woord loopt door.
+            return [_WILD] if lo else [_WILD, ""]
+        if hi <= 3:
+            out = [""] if lo == 0 else []
+            for n in range(max(lo, 1), hi + 1):
+                out.extend(_expand(list(seq) * n))
+            return list(dict.fromkeys(out))
+        return [_GAP]
+    one = _char_class(op, av)
+    return one if one is not None else [_GAP]
+
+
+def _piece_phrase(piece: str) -> Optional[Phrase]:
+    """Woorden van een stuk tussen _GAPs; een woord zonder grens aan de voorkant is onbekend."""
+    terms: List[Term] = []
+    for m in re.finditer(f"[^{_BOUND}{_SEP}]+", piece):
+        run = m.group()
+        text = run.split(_WILD, 1)[0]
+        if m.start() == 0 or not text:
+            terms.append(None)
+            continue
+        prefix = _WILD in run or m.end() == len(piece)
+        terms.append((normalize(text), prefix))
+    while terms and terms[0] is None:
+        terms.pop(0)
+    while terms and terms[-1] is None:
+        terms.pop()
+    return tuple(terms) or None
+
+
+def regex_plan(pattern: str, flags: int = 0) -> Optional[Plan]:
+    """
+    Vertaal een patroon naar woordgroepen voor candidate_lines, of None als dat niet
+    kan. Het plan is ruim (elke regel waarop het patroon matcht is een kandidaat);
+    de regex zelf beslist daarna.
+    """
+    try:
+        expansions = _expand(sre_parse.parse(pattern, flags))
+    except (OverflowError, re.error):
+        return None
+    plan: Plan = []
+    for s in expansions:
+        alt = tuple(dict.fromkeys(p for p in map(_piece_phrase, s.split(_GAP)) if p))
+        if not alt:
+            return None
+        plan.append(alt)
+    return list(dict.fromkeys(plan))
+
+# ============================================================
+# Audit via het index
+# ============================================================
+
+def index_audit(index: CopyIndex, rules: List[Tuple[str, str]], flags: int, candidate,
+                line_filter: Optional[Callable[[str], Optional[str]]] = None, per_line: bool = False,
+                changed: ChangedLines | None = None,
+                changed_lines_only: bool = False) -> Tuple[List[Tuple[str, Path, int, str]], int]:
+    """
+    (categorie, pad, regel, tekst) voor elke regel waarop een patroon matcht, plus het
+    aantal patronen dat volledig gescand moest worden. Kandidaat-regels uit het index,
+    bevestigd door de regex op de regels uit iter_lines (dus ook onder --visible-only).
+
+    line_filter(regel) is de tekst die de scanner van het script ziet (None = overslaan);
+    per_line: één hit per regel (de eerste regel die matcht), zoals funnelcheck telt.
+    changed beperkt tot die bestanden, met changed_lines_only ook tot die regels. Bij
+    --staged kent het index alleen de werkboom: gestagede bestanden gaan dan volledig
+    door alle patronen, op de inhoud uit de index van git.
+    """
+    ruleset = RuleSet(rules, flags)
+    wanted: Dict[int, Dict[int, Set[int]]] = {}
+    full: List[int] = []
+    for k, (_, pat) in enumerate(rules):
+        plan = regex_plan(pat, flags)
+        if plan is None:
+            full.append(k)
+            continue
+        for fid, lines in index.candidate_lines(plan).items():
+            for line_no in lines:
+                wanted.setdefault(fid, {}).setdefault(line_no, set()).add(k)
+
+    staged = staged_blobs(changed)
+    fids = sorted(index.paths, key=lambda fid: str(index.paths[fid])) if full or staged else sorted(
+        wanted, key=lambda fid: str(index.paths[fid]))
+    hits: List[Tuple[str, Path, int, str]] = []
+    options = index.scan_options()
+    options.blobs = staged
+    with scan_context(options):
+        for fid in fids:
+            path = index.paths[fid]
+            if changed is not None and path not in changed:
+                continue
+            if not candidate(path):
+                continue
+            only = changed[path] if changed is not None and changed_lines_only else None
+            lines = wanted.get(fid, {})
+            every = set(range(len(rules))) if staged is not None and path in staged else None
+            try:
+                for line_no, text in iter_lines(path):
+                    ks = every if every is not None else lines.get(line_no)
+                    if ks is None and not full:
+                        continue
+                    if only is not None and line_no not in only:
+                        continue
+                    if line_filter is not None:
+                        text = line_filter(text)
+                        if text is None:
+                            continue
+                    for k in sorted((ks or set()).union(full)):
+                        cat, creg, _ = ruleset.rules[k]
+                        if creg.search(text):
+                            hits.append((cat, path, line_no, text.strip()))
+                            if per_line:
+                                break
+            except OSError:
+                continue
+    return hits, len(full)
+
+
+def line_filter(report: str) -> Optional[Callable[[str], Optional[str]]]:
+    """Het regelfilter van de scanner van een content_suite-rapport (None = elke regel ongewijzigd)."""
+    if report == "conscious":
+        from content_conscious_audit import scanned_line
+
+        return scanned_line
+    return None
+
+# ============================================================
+# Main
+# ============================================================
+
+def _scope_paths(root: Path, ignored) -> List[Path]:
+    # Zelfde selectie als content_suite: elk bestand dat minstens één audit zou scannen.
+    from content_suite import REPORTS, iter_items
+
+    return [p for p, _, _ in iter_items(root, REPORTS, ignored=ignored)]
+
+
+def _line_text(path: Path, line_no: int, cache: Dict[Path, List[str]]) -> str:
+    lines = cache.get(path)
+    if lines is None:
+        try:
+            lines = cache[path] = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+        except OSError:
+            lines = cache[path] = []
+    return lines[line_no - 1].strip() if 0 < line_no <= len(lines) else ""
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Copy-index: zinsdeel- en nabijheidsqueries over de site-copy")
+    ap.add_argument("cmd", choices=["build", "query", "audit"])
+    ap.add_argument("terms", nargs="*", help="query: zinsdelen (OF); audit: regelsets")
+    ap.add_argument("--root", default=DEFAULT_ROOT)
+    ap.add_argument("--index", default=str(DEFAULT_INDEX_PATH), help="pad naar het index")
+    ap.add_argument("--no-update", action="store_true", help="index niet eerst bijwerken")
+    ap.add_argument("--rebuild", action="store_true", help="index weggooien en opnieuw opbouwen")
+    ap.add_argument("--near", default=None, help="query: tweede zinsdeel dat in de buurt moet staan")
+    ap.add_argument("--within", type=int, default=5, help="query: maximaal aantal woorden ertussen")
+    ap.add_argument("--ordered", action="store_true", help="query: --near alleen ná het zinsdeel")
+    ap.add_argument("--regex", action="append", default=[], help="query: patroon (via het index, regex-exact)")
+    ap.add_argument("--limit", type=int, default=250, help="query: maximaal aantal regels tonen (0 = alles)")
+    ap.add_argument("--format", choices=["text", "json"], default="text")
+    add_jobs_argument(ap)
+    add_git_arguments(ap)
+    add_visible_argument(ap)
+    args = ap.parse_args()
+
+    root = Path(args.root).resolve()
+    if not root.exists():
+        print("Root bestaat niet:", root)
+        return 1
+    if not 0 <= args.within < SEGMENT_GAP:
+        print(f"--within moet tussen 0 en {SEGMENT_GAP - 1} liggen")
+        return 2
+
+    try:
+        changed = git_scope(args, root)
+    except GitScopeError as e:
+        print("git diff mislukt:", e)
+        return 1
+
+    index_path = Path(args.index)
+    if args.rebuild:
+        index_path.unlink(missing_ok=True)
+    try:
+        index = CopyIndex(index_path, text_mode(args))
+    except (OSError, sqlite3.Error) as e:
+        print("Index niet te openen:", e)
+        return 1
+
+    try:
+        t0 = time.perf_counter()
+        if args.cmd == "build" or not args.no_update:
+            updated, removed, same = index.update(_scope_paths(root, walk_ignored(args, root)), root, args.jobs,
+                                                  args.prefetch)
+            if args.cmd == "build":
+                index.scope(root)
+                files, tokens, unique = index.counts()
+                print(f"📇 Index {index_path}: {files} bestanden, {tokens} woorden ({unique} uniek)")
+                print(f"   {updated} (opnieuw) geïndexeerd, {removed} verwijderd, {same} ongewijzigd "
+                      f"in {(time.perf_counter() - t0) * 1000:.0f} ms")
+                return 0
+        index.scope(root)
+        if args.cmd == "query":
+            return run_query(index, args, changed)
+        return run_audit(index, args, changed)
+    except QueryError as e:
+        print("Query:", e)
+        return 2
+    finally:
+        index.close()
+
+
+def run_query(index: CopyIndex, args, changed: ChangedLines | None = None) -> int:
+    if not args.terms and not args.regex:
+        raise QueryError("geef een zinsdeel of --regex")
+    t0 = time.perf_counter()
+    found: Dict[Tuple[int, int], int] = {}   # (bestand, regel) → kolom
+    near = parse_phrase(args.near) if args.near else None
+    for text in args.terms:
+        phrase = parse_phrase(text)
+        result = index.near(phrase, near, args.within, args.ordered) if near else index.phrase(phrase)
+        for fid, occs in result.items():
+            for _, line_no, col in occs:
+                if _in_changed(changed, args.changed_lines_only, index.paths[fid], line_no):
+                    found.setdefault((fid, line_no), col)
+    if args.regex:
+        rules = [(pat, pat) for pat in args.regex]
+        try:
+            hits, _ = index_audit(index, rules, re.IGNORECASE, lambda p: True, changed=changed,
+                                  changed_lines_only=args.changed_lines_only)
+        except re.error as e:
+            raise QueryError(f"ongeldig patroon: {e}") from None
+        by_path = {p: fid for fid, p in index.paths.items()}
+        for _, path, line_no, _ in hits:
+            found.setdefault((by_path[path], line_no), 1)
+    ms = (time.perf_counter() - t0) * 1000
+
+    rows = sorted(found.items(), key=lambda kv: (str(index.paths[kv[0][0]]), kv[0][1]))
+    texts: Dict[Path, List[str]] = {}
+    label = " | ".join([*(phrase_text(parse_phrase(t)) for t in args.terms), *args.regex])
+    if near:
+        label += f"  ~{args.within} {'→ ' if args.ordered else ''}{phrase_text(near)}"
+    if args.format == "json":
+        print(json.dumps({
+            "query": label,
+            "hits": [{"path": display_path(index.paths[fid]), "line": line_no, "column": col,
+                      "text": _line_text(index.paths[fid], line_no, texts)}
+                     for (fid, line_no), col in rows],
+            "files": len({fid for (fid, _), _ in rows}),
+            "ms": round(ms, 2),
+        }, ensure_ascii=False))
+        return 0
+
+    shown = rows if args.limit <= 0 else rows[:args.limit]
+    for (fid, line_no), col in shown:
+        path = index.paths[fid]
+        print(f"{display_path(path)}:{line_no}:{col}: {_line_text(path, line_no, texts)}")
+    if len(rows) > len(shown):
+        print(f"... ({len(rows) - len(shown)} extra regels verborgen)")
+    print(f"🔎 {label}: {len(rows)} regels in {len({fid for (fid, _), _ in rows})} bestanden ({ms:.1f} ms)")
+    return 0
+
+
+def _in_changed(changed: ChangedLines | None, only_lines: bool, path: Path, line_no: int) -> bool:
+    if changed is None:
+        return True
+    lines = changed.get(path)
+    return lines is not None and (not only_lines or line_no in lines)
+
+
+def audit_ruleset(index: CopyIndex, name: str, changed: ChangedLines | None = None,
+                  changed_lines_only: bool = False) -> Tuple[int, List[Tuple[str, Path, int, str]], int]:
+    """Eén regelset uit de rule-packs via het index: (aantal patronen, hits, volledig gescand)."""
+    from content_rules import RulePackError, rule_pack
+    from content_suite import candidate
+
+    if name not in AUDIT_REPORTS:
+        raise QueryError(f"onbekende regelset {name!r} (kies uit {', '.join(AUDIT_REPORTS)})")
+    pack = rule_pack()
+    try:
+        spec = pack.rulesets.get(name, {})
+        if "categories" in spec:
+            rules = [(cat, pat) for cat, pats in pack.categories(name).items() for pat in pats]
+        else:
+            rules = [(name, pat) for pat in pack.patterns(name)]
+        flags = pack.flags(name)
+    except (RulePackError, KeyError) as e:
+        raise QueryError(str(e)) from None
+    report = AUDIT_REPORTS[name]
+    hits, full = index_audit(index, rules, flags, candidate(report, index.root), line_filter(report), name in PER_LINE,
+                             changed, changed_lines_only)
+    return len(rules), hits, full
+
+
+def run_audit(index: CopyIndex, args, changed: ChangedLines | None = None) -> int:
+    total = 0
+    for name in args.terms or list(AUDIT_REPORTS):
+        t0 = time.perf_counter()
+        n_rules, hits, full = audit_ruleset(index, name, changed, args.changed_lines_only)
+        ms = (time.perf_counter() - t0) * 1000
+        total += len(hits)
+
+        if args.format == "json":
+            print(json.dumps({"ruleset": name, "patterns": n_rules, "full_scan": full, "ms": round(ms, 2),
+                              "hits": [{"category": cat, "path": display_path(p), "line": i, "text": text}
+                                       for cat, p, i, text in hits]}, ensure_ascii=False))
+            continue
+        print("=" * 90)
+        print(f"{name} via index: {n_rules} patronen, {n_rules - full} via index, "
+              f"{full} volledig gescand — {len(hits)} hits ({ms:.1f} ms)")
+        print("=" * 90)
+        by_cat: Dict[str, List[Tuple[str, Path, int, str]]] = {}
+        for hit in hits:
+            by_cat.setdefault(hit[0], []).append(hit)
+        for cat in sorted(by_cat):
+            cat_hits = by_cat[cat]
+            print(f"[{cat}] hits: {len(cat_hits)}")
+            shown = cat_hits if args.limit <= 0 else cat_hits[:args.limit]
+            for _, p, i, text in shown:
+                print(f"{display_path(p)}:{i}: {text}")
+            if len(cat_hits) > len(shown):
+                print(f"... ({len(cat_hits) - len(shown)} extra hits verborgen)")
+            print()
+    # Zelfde exitcode als de audits zelf: 2 = hits gevonden.
+    return 2 if total else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+--profile voor de content-audits: kosten per patroon en per bestand.
+
+Per gecompileerd patroon (plus de regel-prefilter van elke RuleSet): aantal geteste
+regels, aantal matches en cumulatieve tijd in search(). Per bestand: tijd in lezen
+en decoderen (iter_lines). Uit staat er niets tussen: RuleSet en iter_lines krijgen
+alleen getimede varianten als de scan een Profile in zijn ScanOptions heeft.
+
+Profileren draait serieel en zonder cache; anders zien we de helft niet.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import content_scan
+
+# ============================================================
+# Tellers
+# ============================================================
+
+class PatternStats:
+    __slots__ = ("label", "pattern", "tested", "matches", "seconds")
+
+    def __init__(self, label: str, pattern: str):
+        self.label = label
+        self.pattern = pattern
+        self.tested = 0
+        self.matches = 0
+        self.seconds = 0.0
+
+
+class TimedPattern:
+    """Vervangt een re.Pattern in een RuleSet; alleen search() wordt gebruikt."""
+
+    __slots__ = ("compiled", "stats")
+
+    def __init__(self, compiled, stats: PatternStats):
+        self.compiled = compiled
+        self.stats = stats
+
+    @property
+    def pattern(self) -> str:
+        return self.compiled.pattern
+
+    def search(self, line: str, *args):
+        t0 = time.perf_counter()
+        m = self.compiled.search(line, *args)
+        st = self.stats
+        st.seconds += time.perf_counter() - t0
+        st.tested += 1
+        if m is not None:
+            st.matches += 1
+        return m
+
+
+class Profile:
+    def __init__(self) -> None:
+        self.patterns: Dict[Tuple[str, str], PatternStats] = {}
+        self.files: Dict[str, float] = {}
+        self.lines = 0
+
+    def _stats(self, label: str, pattern: str) -> PatternStats:
+        key = (label, pattern)
+        st = self.patterns.get(key)
+        if st is None:
+            st = self.patterns[key] = PatternStats(label, pattern)
+        return st
+
+    def instrument(self, rules: "content_scan.RuleSet") -> None:
+        """Getimede patronen in een (net gecompileerde) RuleSet zetten."""
+        rules.rules = [(cat, TimedPattern(creg, self._stats(cat, pat)), pat) for cat, creg, pat in rules.rules]
+        if rules.prefilter is not None:
+            label = f"<prefilter, {len(rules.rules)} regels>"
+            rules.prefilter = TimedPattern(rules.prefilter, self._stats(label, rules.prefilter.pattern))
+
+    def timed_lines(self, path: Path, lines: Iterator[Tuple[int, str]]) -> Iterator[Tuple[int, str]]:
+        """iter_lines met de lees/decode-tijd per bestand (alleen de tijd ín de generator)."""
+        spent = 0.0
+        try:
+            while True:
+                t0 = time.perf_counter()
+                try:
+                    item = next(lines)
+                except StopIteration:
+                    spent += time.perf_counter() - t0
+                    return
+                spent += time.perf_counter() - t0
+                self.lines += 1
+                yield item
+        finally:
+            key = str(path)
+            self.files[key] = self.files.get(key, 0.0) + spent
+
+    # ============================================================
+    # Rapport
+    # ============================================================
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "patterns": [
+                {"label": st.label, "pattern": st.pattern, "tested": st.tested, "matches": st.matches,
+                 "seconds": round(st.seconds, 6)}
+                for st in sorted(self.patterns.values(), key=lambda st: -st.seconds)
+            ],
+            "files": [
+                {"path": p, "read_seconds": round(s, 6)}
+                for p, s in sorted(self.files.items(), key=lambda kv: -kv[1])
+            ],
+            "lines_read": self.lines,
+            "read_seconds": round(sum(self.files.values()), 6),
+        }
+
+    def report(self, top: int = 20, out=None) -> None:
+        out = out or sys.stdout
+        pats = sorted(self.patterns.values(), key=lambda st: -st.seconds)
+        print("\n" + "=" * 90, file=out)
+        print(f"PROFILE – top {top} patronen op tijd in search()", file=out)
+        print("=" * 90, file=out)
+        print(f"{'ms':>9} {'µs/regel':>9} {'getest':>9} {'matches':>8}  patroon", file=out)
+        for st in pats[:top]:
+            per_line = st.seconds / st.tested * 1e6 if st.tested else 0.0
+            pattern = st.pattern if len(st.pattern) <= 70 else st.pattern[:67] + "..."
+            print(f"{st.seconds * 1e3:>9.1f} {per_line:>9.2f} {st.tested:>9} {st.matches:>8}  "
+                  f"[{st.label}] {pattern}", file=out)
+
+        total = sum(self.files.values())
+        print(f"\nLezen/decoderen: {total * 1e3:.1f} ms over {len(self.files)} bestanden, "
+              f"{self.lines} regels", file=out)
+        for p, s in sorted(self.files.items(), key=lambda kv: -kv[1])[:min(top, 10)]:
+            print(f"{s * 1e3:>9.2f} ms  {p}", file=out)
+
+# ============================================================
+# CLI
+# ============================================================
+
+def add_profile_arguments(parser) -> None:
+    g = parser.add_argument_group("profiel")
+    g.add_argument("--profile", action="store_true",
+                   help="tijd/hits per patroon en leestijd per bestand meten (serieel, zonder cache)")
+    g.add_argument("--profile-top", type=int, default=20, metavar="N", help="aantal patronen in de tabel")
+    g.add_argument("--profile-json", default=None, metavar="PAD", help="profiel als JSON wegschrijven")
+
+
+def start_profile(args) -> Optional[Profile]:
+    """Profile volgens de CLI-opties (of None) voor scan_options; zet --jobs 1 en --no-cache."""
+    if not args.profile and not args.profile_json:
+        return None
+    args.jobs = 1
+    args.no_cache = True
+    return Profile()
+
+
+def finish_profile(profile: Optional[Profile], args, out=None) -> None:
+    if profile is None:
+        return
+    if args.profile_json:
+        import json
+
+        Path(args.profile_json).write_text(json.dumps(profile.to_dict(), ensure_ascii=False, indent=2) + "\n",
+                                           encoding="utf-8")
+    if args.profile:
+        profile.report(args.profile_top, out)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Machineleesbare rapportage voor de content-audits (--format json|ndjson|sarif).
+
+Hits worden weggeschreven zodra ze uit de scan komen; alleen de tellingen per
+categorie blijven in het geheugen. Geen afkapping op 250/50/--show zoals in de
+tekstrapporten. De exitcodes (0/2/3) bepaalt het script zelf, net als bij text.
+
+  json    één document: {"tool", "hits": [...], "extra": [...], "summary", "exit_code"}
+  ndjson  één object per regel: {"type": "hit"|<extra>|"summary", ...}
+  sarif   SARIF 2.1.0, één run; categorieën zijn de rules, extra's krijgen een eigen rule
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, TextIO
+
+FORMATS = ["text", "json", "ndjson", "sarif"]
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
+def add_format_argument(parser) -> None:
+    parser.add_argument("--format", choices=FORMATS, default="text",
+                        help="text (standaard) of streamende json/ndjson/sarif-uitvoer")
+
+
+def display_path(p: Path | str) -> str:
+    """Pad relatief aan de werkmap (posix), anders absoluut."""
+    p = Path(p)
+    if p.is_absolute():
+        try:
+            p = p.relative_to(Path.cwd())
+        except ValueError:
+            pass
+    return p.as_posix()
+
+
+def _dumper() -> Callable[[Any], str]:
+    # json pas laden als er echt machineleesbare uitvoer komt; de tekstrapporten laden het niet.
+    import json
+
+    return json.JSONEncoder(ensure_ascii=False).encode
+
+
+class HitStream:
+    """Schrijft hits direct naar `out`; houdt alleen tellingen per categorie bij."""
+
+    def __init__(self, fmt: str, tool: str, categories: Iterable[str] = (),
+                 level_of: Callable[[str], str] = lambda category: "warning",
+                 out: Optional[TextIO] = None):
+        if fmt not in FORMATS[1:]:
+            raise ValueError(f"onbekend formaat: {fmt}")
+        self.fmt = fmt
+        self.tool = tool
+        self.level_of = level_of
+        self.out = out or sys.stdout
+        self._dump = _dumper()
+        self.counts: Dict[str, int] = {}
+        self.extra_counts: Dict[str, int] = {}
+        self._rules = {c: None for c in categories}
+        self._hits_open = False
+        self._first = True
+
+        if fmt == "json":
+            self.out.write(f'{{"tool": {self._dump(tool)}, "hits": [')
+            self._hits_open = True
+        elif fmt == "sarif":
+            driver = {"name": tool, "rules": [{"id": c, "shortDescription": {"text": c}} for c in self._rules]}
+            self.out.write(f'{{"$schema": {self._dump(SARIF_SCHEMA)}, "version": "2.1.0", "runs": [{{'
+                           f'"tool": {{"driver": {self._dump(driver)}}}, "results": [')
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def _item(self, text: str) -> None:
+        if self.fmt == "ndjson":
+            self.out.write(text + "\n")
+            return
+        self.out.write(("\n" if self._first else ",\n") + text)
+        self._first = False
+
+    def _sarif_result(self, rule: str, level: str, path: str, line_no: Optional[int],
+                      message: str, properties: Dict[str, Any]) -> str:
+        location: Dict[str, Any] = {"artifactLocation": {"uri": path}}
+        if line_no is not None:
+            location["region"] = {"startLine": line_no}
+        result: Dict[str, Any] = {"ruleId": rule, "level": level, "message": {"text": message},
+                                  "locations": [{"physicalLocation": location}]}
+        if properties:
+            result["properties"] = properties
+        return self._dump(result)
+
+    def hit(self, category: str, path: Path | str, line_no: Optional[int], text: Optional[str] = None,
+            pattern: Optional[str] = None) -> None:
+        self.counts[category] = self.counts.get(category, 0) + 1
+        path = display_path(path)
+        if self.fmt == "sarif":
+            props = {"pattern": pattern} if pattern else {}
+            self._item(self._sarif_result(category, self.level_of(category), path, line_no,
+                                          text if text is not None else category, props))
+            return
+        record: Dict[str, Any] = {"category": category, "path": path, "line": line_no}
+        if text is not None:
+            record["text"] = text
+        if pattern is not None:
+            record["pattern"] = pattern
+        if self.fmt == "ndjson":
+            record = {"type": "hit", **record}
+        self._item(self._dump(record))
+
+    def extra(self, kind: str, path: Path | str, message: str, level: str = "note") -> None:
+        """Bevinding op bestandsniveau (bv. CTA-pagina zonder reflectievragen)."""
+        self.extra_counts[kind] = self.extra_counts.get(kind, 0) + 1
+        path = display_path(path)
+        if self.fmt == "json":
+            if self._hits_open:
+                self.out.write('\n], "extra": [')
+                self._hits_open = False
+                self._first = True
+            self._item(self._dump({"type": kind, "path": path, "message": message}))
+        elif self.fmt == "ndjson":
+            self._item(self._dump({"type": kind, "path": path, "message": message}))
+        else:
+            self._item(self._sarif_result(kind, level, path, None, message, {}))
+
+    def close(self, exit_code: int, **summary: Any) -> None:
+        summary = {"total": self.total, "by_category": self.counts, **summary}
+        if self.extra_counts:
+            summary["extra"] = self.extra_counts
+        if self.fmt == "json":
+            if self._hits_open:
+                self.out.write('\n], "extra": [')
+            self.out.write(f'\n], "summary": {self._dump(summary)}, "exit_code": {exit_code}}}\n')
+        elif self.fmt == "ndjson":
+            self._item(self._dump({"type": "summary", **summary, "exit_code": exit_code}))
+        else:
+            props = {"summary": summary, "exit_code": exit_code}
+            self.out.write(f'\n], "properties": {self._dump(props)}}}]}}\n')
+        self.out.flush()
+
+
+def stats_out(fmt: str) -> TextIO:
+    """Waar de --stats footer heen moet: bij machine-uitvoer naar stderr."""
+    return sys.stdout if fmt == "text" else sys.stderr
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Herschrijf-engine voor freeze_site_copy apply/soften.
+
+Het resultaat is dat van de oude keten van re.sub's: regels lopen in volgorde en een
+latere regel ziet de uitvoer van een eerdere. Opeenvolgende regels die elkaar niet
+kunnen raken gaan samen in één alternation met een named group per regel, zodat één
+re.sub met een dispatch-callback ze in één pass afhandelt. Of twee regels elkaar
+kunnen raken, volgt uit hun woorden (_Phrase): een latere regel mag niets van de
+vervanging van een eerdere kunnen matchen, en hun matches mogen nooit overlappen.
+Wat niet te bewijzen is (templates, optionele scheidingstekens, lookarounds, ...)
+krijgt een eigen pass. Bestanden zonder enig trefwoord van de regels slaat de
+bytes-prefilter over voordat er iets gedecodeerd wordt. Schrijven gaat via een
+tempbestand plus os.replace, zodat een crash nooit een half geschreven pagina achterlaat.
+
+Dezelfde pass levert ook de --preview (unified diff of JSON-patchlijst, met per
+wijziging de regel die vuurde) en tellingen per regel. Regelnummers worden alleen
+geteld als een preview ze nodig heeft, incrementeel vanaf de vorige match.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from content_scan import FilePrefilter, compile_pattern, read_text, required_keywords, sre_constants, sre_parse
+
+# (?i) e.d. aan het begin van een patroon: in een alternation moet dat een scoped group worden.
+LEADING_FLAGS_RE = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
+
+FLAG_LETTERS = [(re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"),
+                (re.VERBOSE, "x"), (re.ASCII, "a")]
+
+WORD_RE = re.compile(r"\w+")
+
+
+class Edit(NamedTuple):
+    rule: int       # index in de regellijst
+    line: int       # regelnummer in de tekst zoals die regel hem zag (0 = niet geteld)
+    old: str
+    replacement: str
+
+
+class Stage(NamedTuple):
+    pattern: re.Pattern     # het losse patroon, of de alternation met een group r<idx> per regel
+    rules: Tuple[int, ...]
+
+# ============================================================
+# Welke regels kunnen in één pass
+# ============================================================
+
+class _Phrase(NamedTuple):
+    """
+    Woorden die een match (of vervanging) van links naar rechts bevat, met alleen
+    niet-woordtekens ertussen. Een open kant mag midden in een langer woord van de
+    tekst liggen (geen \\b ervoor/erna).
+    """
+    words: Tuple[str, ...]
+    left_open: bool
+    right_open: bool
+
+
+def _is_word(ch: str) -> bool:
+    return WORD_RE.match(ch) is not None
+
+
+def _separator(op, av) -> bool:
+    """Eén teken dat nooit een woordteken is: letterlijk, of een klasse als [-\\s]."""
+    if op is sre_constants.LITERAL:
+        return not _is_word(chr(av))
+    if op is not sre_constants.IN:
+        return False
+    for item_op, item_av in av:
+        if item_op is sre_constants.LITERAL:
+            if _is_word(chr(item_av)):
+                return False
+        elif item_op is sre_constants.CATEGORY:
+            if item_av is not sre_constants.CATEGORY_SPACE:
+                return False
+        elif item_op is sre_constants.RANGE:
+            lo, hi = item_av
+            if hi - lo > 256 or any(_is_word(chr(c)) for c in range(lo, hi + 1)):
+                return False
+        else:
+            return False
+    return True
+
+
+def _phrase(pattern: str, flags: int = 0) -> Optional[_Phrase]:
+    """
+    De woorden van een patroon dat alleen uit letterlijke woorden en verplichte
+    niet-woord-scheidingen bestaat (bv. `\\bBouw\\s+mee\\s+aan\\b`); anders None.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return None
+    if parsed.state.groupdict or parsed.state.flags & (re.ASCII | re.LOCALE):
+        return None
+
+    items: List[Any] = []
+
+    def flatten(seq) -> bool:
+        for op, av in seq:
+            if op is sre_constants.SUBPATTERN:
+                _, add_flags, del_flags, sub = av
+                if (add_flags | del_flags) & ~re.IGNORECASE or not flatten(sub):
+                    return False
+            else:
+                items.append((op, av))
+        return True
+
+    if not flatten(parsed):
+        return None
+
+    words: List[str] = []
+    run: List[str] = []
+    left_open = right_open = True
+    in_word = False
+    for pos, (op, av) in enumerate(items):
+        if op is sre_constants.LITERAL and _is_word(chr(av)):
+            run.append(chr(av))
+            in_word = True
+            continue
+        if run:
+            words.append("".join(run))
+            run.clear()
+        if op is sre_constants.AT and av is sre_constants.AT_BOUNDARY:
+            if not words:
+                left_open = False
+            elif pos == len(items) - 1:
+                right_open = False
+            continue
+        if not words:
+            return None         # een match moet met een woordteken beginnen
+        in_word = False
+        if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            low, _, sub = av
+            if low < 1 or len(sub) != 1 or not _separator(*sub[0]):
+                return None     # bv. [-\s]? : twee woorden kunnen aan elkaar komen
+        elif not _separator(op, av):
+            return None
+    if not in_word:
+        return None             # ... en met een woordteken eindigen
+    if run:
+        words.append("".join(run))
+    return _Phrase(tuple(w.casefold() for w in words), left_open, right_open)
+
+
+def _replacement_phrase(repl: str, rule: _Phrase) -> Optional[_Phrase]:
+    """
+    De woorden van een vaste vervanging, met de randen van de match die hij vervangt:
+    na een \\b-grens staat er een niet-woordteken naast, anders misschien een woordteken.
+    """
+    if "\\" in repl:
+        return None
+    words = tuple(w.casefold() for w in WORD_RE.findall(repl))
+    if not words:
+        return None     # leeg of alleen leestekens: de woorden eromheen komen naast elkaar
+    # Een rand die van woord- naar niet-woordteken wisselt, kan ernaast een \b laten ontstaan.
+    if rule.left_open and not _is_word(repl[0]) or rule.right_open and not _is_word(repl[-1]):
+        return None
+    return _Phrase(words, rule.left_open and _is_word(repl[0]), rule.right_open and _is_word(repl[-1]))
+
+
+def _words_meet(w: str, w_left: bool, w_right: bool, u: str, u_left: bool, u_right: bool) -> bool:
+    """
+    Kunnen w en u overlappend in hetzelfde woord van de tekst staan? Een open kant mag
+    verder in dat woord liggen, een gesloten kant valt samen met de woordgrens.
+    """
+    for offset in range(1 - len(w), len(u)):
+        if offset < 0 and not u_left or offset > 0 and not w_left:
+            continue
+        end = offset + len(w)
+        if end > len(u) and not u_right or end < len(u) and not w_right:
+            continue
+        lo, hi = max(offset, 0), min(end, len(u))
+        if w[lo - offset:hi - offset] == u[lo:hi]:
+            return True
+    return False
+
+
+def _phrases_meet(a: _Phrase, b: _Phrase) -> bool:
+    """
+    Kunnen a en b overlappen? Overlap deelt een woord van de tekst; de woorden ernaast
+    moeten dan ook paarsgewijs passen, tot een van beide frasen ophoudt.
+    """
+    last_a, last_b = len(a.words) - 1, len(b.words) - 1
+    for shift in range(-last_a, last_b + 1):
+        pairs = [(k, k + shift) for k in range(len(a.words)) if 0 <= k + shift <= last_b]
+        if all(_words_meet(a.words[k], k == 0 and a.left_open, k == last_a and a.right_open,
+                           b.words[j], j == 0 and b.left_open, j == last_b and b.right_open)
+               for k, j in pairs):
+            return True
+    return False
+
+
+def _independent(earlier: int, later: int, phrases: Sequence[Optional[_Phrase]],
+                 outputs: Sequence[Optional[_Phrase]]) -> bool:
+    """
+    Geeft één alternation voor deze twee regels hetzelfde als na elkaar toepassen? Ja als
+    hun matches nooit overlappen en de latere niets van de vervanging van de eerdere raakt.
+    """
+    a, b, out = phrases[earlier], phrases[later], outputs[earlier]
+    if a is None or b is None or out is None:
+        return False
+    return not _phrases_meet(a, b) and not _phrases_meet(b, out)
+
+
+class Rewriter:
+    """Vervangregels met het resultaat van de oude keten van re.sub's, in zo weinig mogelijk passes."""
+
+    def __init__(self, rules: Iterable[Tuple[str, str]], flags: int = 0):
+        self.rules: List[Tuple[str, str]] = list(rules)
+        self.compiled = [compile_pattern(pat, flags) for pat, _ in self.rules]
+        # Vervangingen met \1 / \g<name> moeten via de match ge-expand worden.
+        self._templated = [("\\" in repl) for _, repl in self.rules]
+        self.stages = self._stages(flags)
+
+        keywords = [required_keywords(pat, flags) for pat, _ in self.rules]
+        union: Optional[FrozenSet[str]] = frozenset().union(*keywords) if all(keywords) else None
+        self.file_filter = FilePrefilter(union)
+
+    def _stages(self, flags: int) -> List[Stage]:
+        """Opeenvolgende regels die onderling onafhankelijk zijn, elk groepje in één pass."""
+        phrases = [_phrase(pat, flags) for pat, _ in self.rules]
+        outputs = [None if ph is None else _replacement_phrase(repl, ph)
+                   for ph, (_, repl) in zip(phrases, self.rules)]
+        groups: List[List[int]] = []
+        for idx in range(len(self.rules)):
+            if groups and all(_independent(prev, idx, phrases, outputs) for prev in groups[-1]):
+                groups[-1].append(idx)
+            else:
+                groups.append([idx])
+
+        letters = "".join(ch for flag, ch in FLAG_LETTERS if flags & flag)
+        stages = []
+        for group in groups:
+            if len(group) == 1:
+                stages.append(Stage(self.compiled[group[0]], (group[0],)))
+                continue
+            parts = []
+            for idx in group:
+                pat = self.rules[idx][0]
+                m = LEADING_FLAGS_RE.match(pat)
+                scoped = letters + (m.group(1) if m else "")
+                body = pat[m.end():] if m else pat
+                parts.append(f"(?P<r{idx}>(?{scoped}:{body}))" if scoped else f"(?P<r{idx}>{body})")
+            stages.append(Stage(compile_pattern("|".join(parts)), tuple(group)))
+        return stages
+
+    def rewrite(self, text: str, lines: bool = True) -> Tuple[str, List[Edit]]:
+        """
+        Nieuwe tekst plus de toegepaste edits, op regelnummer en regel. Zonder lines blijft elk
+        regelnummer 0 (tellingen per regel hebben ze niet nodig) en de volgorde die van de passes.
+        """
+        edits: List[Edit] = []
+        for stage in self.stages:
+            text = self._pass(stage, text, edits, lines)
+        if lines:
+            edits.sort(key=lambda e: (e.line, e.rule))
+        return text, edits
+
+    def _pass(self, stage: Stage, text: str, edits: List[Edit], lines: bool) -> str:
+        single = stage.rules[0] if len(stage.rules) == 1 else None
+        templated = single is not None and self._templated[single]
+        # Matches komen van links naar rechts: tel alleen de newlines sinds de vorige.
+        pos, line = 0, 1
+
+        def dispatch(m: re.Match) -> str:
+            nonlocal pos, line
+            idx = single if single is not None else int(m.lastgroup[1:])
+            repl = self.rules[idx][1]
+            new = m.expand(repl) if templated else repl
+            if lines:
+                line += text.count("\n", pos, m.start())
+                pos = m.start()
+            edits.append(Edit(idx, line if lines else 0, m.group(), new))
+            return new
+
+        return stage.pattern.sub(dispatch, text)
+
+# ============================================================
+# Atomisch schrijven
+# ============================================================
+
+def write_atomic(p: Path, text: str, backup_suffix: str | None = None) -> None:
+    """Schrijf via tempbestand + os.replace; optioneel eerst een backup naast het origineel."""
+    # Pas hier: audit/funnelcheck importeren deze module ook, maar schrijven nooit.
+    import shutil
+    import tempfile
+
+    if backup_suffix:
+        shutil.copy2(p, p.with_suffix(p.suffix + backup_suffix))
+    fd, tmp = tempfile.mkstemp(prefix=f".{p.name}.", suffix=".tmp", dir=str(p.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        shutil.copymode(p, tmp)
+        os.replace(tmp, p)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class FileRewrite(NamedTuple):
+    changed: bool
+    counts: Dict[int, int]          # regel-index → aantal vervangingen
+    preview: Any = None             # unified diff (str) of lijst wijzigingen (json)
+
+
+def unchanged() -> FileRewrite:
+    return FileRewrite(False, {})
+
+
+def rule_label(idx: int) -> str:
+    return f"R{idx + 1}"
+
+
+def unified_preview(label: str, old: str, new: str, edits: List[Edit]) -> str:
+    """Unified diff; elke hunk-header krijgt de regels die erin gevuurd hebben."""
+    import difflib
+
+    fired = [(e.line, e.rule) for e in edits]
+    out: List[str] = []
+    diff = difflib.unified_diff(old.splitlines(keepends=True), new.splitlines(keepends=True),
+                                f"a/{label}", f"b/{label}")
+    for line in diff:
+        m = HUNK_RE.match(line)
+        if m:
+            start = int(m.group(1))
+            count = 1 if m.group(2) is None else int(m.group(2))
+            rules = sorted({r for ln, r in fired if start <= ln < start + max(count, 1)})
+            line = line.rstrip("\n") + " " + ", ".join(rule_label(r) for r in rules) + "\n"
+        out.append(line if line.endswith("\n") else line + "\n")
+    return "".join(out)
+
+
+def json_preview(rewriter: Rewriter, old: str, edits: List[Edit]) -> List[Dict[str, Any]]:
+    return [
+        {"rule": rule_label(e.rule), "pattern": rewriter.rules[e.rule][0], "line": e.line,
+         "old": e.old, "new": e.replacement}
+        for e in edits
+    ]
+
+
+def rewrite_file(p: Path, rewriter: Rewriter, backup_suffix: str, dry_run: bool,
+                 preview: str | None = None, root: Path | None = None) -> Optional[FileRewrite]:
+    """
+    Herschrijf één bestand (of alleen niet, bij dry_run). Diff/patch-preview en
+    tellingen per regel komen uit dezelfde pass; None = overgeslagen door de prefilter.
+    """
+    if not rewriter.file_filter.could_match(p):
+        return None
+    text = read_text(p)
+    new, edits = rewriter.rewrite(text, lines=preview is not None)
+    if new == text:
+        return unchanged()
+
+    counts: Dict[int, int] = {}
+    for e in edits:
+        counts[e.rule] = counts.get(e.rule, 0) + 1
+
+    shown = None
+    if preview == "diff":
+        label = str(p.relative_to(root) if root else p).replace("\\", "/")
+        shown = unified_preview(label, text, new, edits)
+    elif preview == "json":
+        shown = json_preview(rewriter, text, edits)
+
+    if not dry_run:
+        write_atomic(p, new, backup_suffix)
+    return FileRewrite(True, counts, shown)
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rule-packs voor de content-audits.
+
+De regels van content_audit (PATTERNS), content_conscious_audit (AUDIT_RULES) en
+freeze_site_copy (PATTERNS, funnel, REPLACEMENTS, SOFTENER_RULES) staan in
+rules/*.json, in dezelfde vorm als probrandwacht-copyonly.config.json:
+
+  "shared":   {"dba-proof": "\\\\bDBA[-\\\\s]?proof\\\\b", ...}
+  "rulesets": {"content_audit": {"flags": "i", "categories": [{"name", "note", "patterns"}]},
+               "funnel_soft":   {"flags": "i", "patterns": [...]},
+               "soften":        {"flags": "",  "replacements": [{"pattern", "replace"}]}, ...}
+
+Een patroon "@naam" verwijst naar "shared", zodat een regel die meerdere scripts delen
+maar op één plek staat. Packs worden op bestandsnaam gesorteerd samengevoegd; een
+latere pack vervangt een regelset (of shared patroon) met dezelfde naam in z'n geheel,
+bv. rules/zz-lokaal.json voor een lokale variant.
+
+Compileren gaat via content_scan.compile_pattern: elk uniek (patroon, flags) één keer
+re.compile per proces, ook als audit, funnel, conscious en de suite het delen. De
+geparste packs en de trefwoorden voor de prefilters (een extra parse per patroon)
+staan in een artefact, .cache/content-rules.marshal in de repo-root, gekeyd op de
+hash van de ruwe pack-bytes en de Python-versie; een audit met een actueel artefact
+laadt json niet eens. Alleen dit script schrijft het; de audits lezen het alleen, en
+zonder (geldig) artefact parsen ze de packs en leiden ze de trefwoorden zelf af.
+
+  python scripts/content/content_rules.py            # overzicht van packs, artefact bijwerken
+  python scripts/content/content_rules.py --rebuild  # artefact opnieuw opbouwen
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import marshal
+import os
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from content_scan import add_known_keywords, known_keywords
+
+RULES_DIR = Path(__file__).resolve().parent / "rules"
+REPO_ROOT = RULES_DIR.parents[2]
+ARTIFACT_PATH = REPO_ROOT / ".cache" / "content-rules.marshal"
+
+# Ophogen als de vorm van het artefact (of de trefwoord-afleiding) verandert.
+ARTIFACT_VERSION = 3
+
+FLAG_LETTERS = {"i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL, "x": re.VERBOSE, "a": re.ASCII}
+
+
+class RulePackError(ValueError):
+    pass
+
+# ============================================================
+# Packs
+# ============================================================
+
+class RulePack:
+    """Samengevoegde rule-packs; levert de regels in de vormen die de scripts al gebruikten."""
+
+    def __init__(self, paths: Sequence[Path], artifact: Optional[Artifact] = None):
+        self.paths = list(paths)
+        raws = [path.read_bytes() for path in self.paths]
+        h = hashlib.sha256(f"v{ARTIFACT_VERSION}".encode())
+        for path, raw in zip(self.paths, raws):
+            h.update(b"\0" + path.name.encode("utf-8") + b"\0" + raw)
+        self.hash = h.hexdigest()[:16]
+        parsed = artifact.packs(self) if artifact is not None else None
+        self.shared, self.rulesets = parsed if parsed is not None else self._parse(raws)
+
+    def _parse(self, raws: List[bytes]) -> Tuple[Dict[str, str], Dict[str, Dict[str, Any]]]:
+        import json
+
+        shared: Dict[str, str] = {}
+        rulesets: Dict[str, Dict[str, Any]] = {}
+        for path, raw in zip(self.paths, raws):
+            try:
+                data = json.loads(raw)
+            except ValueError as e:
+                raise RulePackError(f"{path}: geen geldige JSON ({e})") from None
+            shared.update(data.get("shared", {}))
+            rulesets.update(data.get("rulesets", {}))
+        return shared, rulesets
+
+    def _ruleset(self, name: str) -> Dict[str, Any]:
+        try:
+            return self.rulesets[name]
+        except KeyError:
+            raise RulePackError(f"regelset {name!r} ontbreekt in {RULES_DIR}") from None
+
+    def _resolve(self, pattern: str) -> str:
+        if not pattern.startswith("@"):
+            return pattern
+        try:
+            return self.shared[pattern[1:]]
+        except KeyError:
+            raise RulePackError(f"onbekend shared patroon {pattern!r}") from None
+
+    def flags(self, name: str) -> int:
+        flags = 0
+        for letter in self._ruleset(name).get("flags", ""):
+            try:
+                flags |= FLAG_LETTERS[letter]
+            except KeyError:
+                raise RulePackError(f"regelset {name!r}: onbekende flag {letter!r}") from None
+        return flags
+
+    def categories(self, name: str) -> Dict[str, List[str]]:
+        return {cat["name"]: [self._resolve(p) for p in cat["patterns"]]
+                for cat in self._ruleset(name)["categories"]}
+
+    def patterns(self, name: str) -> List[str]:
+        return [self._resolve(p) for p in self._ruleset(name)["patterns"]]
+
+    def replacements(self, name: str) -> List[Tuple[str, str]]:
+        return [(self._resolve(r["pattern"]), r["replace"]) for r in self._ruleset(name)["replacements"]]
+
+    def all_patterns(self) -> List[Tuple[str, str, int]]:
+        """(regelset, patroon, flags) over alle regelsets, in pack-volgorde."""
+        out = []
+        for name, spec in self.rulesets.items():
+            flags = self.flags(name)
+            if "categories" in spec:
+                pats = [p for ps in self.categories(name).values() for p in ps]
+            elif "patterns" in spec:
+                pats = self.patterns(name)
+            else:
+                pats = [p for p, _ in self.replacements(name)]
+            out.extend((name, p, flags) for p in pats)
+        return out
+
+
+def pack_paths(rules_dir: Path = RULES_DIR) -> List[Path]:
+    return sorted(rules_dir.glob("*.json"))
+
+
+@lru_cache(maxsize=None)
+def rule_pack() -> RulePack:
+    """De packs uit rules/, één keer per proces; geparst en met trefwoorden uit het artefact als dat kan."""
+    pack = RulePack(pack_paths(), _ARTIFACT)
+    _ARTIFACT.load(pack)
+    return pack
+
+# ============================================================
+# Artefact
+# ============================================================
+
+class Artifact:
+    """Geparste packs en afgeleide trefwoorden op schijf (marshal: alleen data); alleen main() schrijft het."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.key: Optional[str] = None
+        self.pack: Optional[RulePack] = None
+        self.loaded = 0
+        self._data: Any = None
+        self._read = False
+
+    @staticmethod
+    def key_for(pack: RulePack) -> str:
+        # marshal en de sre-parse-boom horen bij één Python-versie.
+        return f"{pack.hash}:{sys.version_info[:2]}"
+
+    def _entry(self, pack: RulePack) -> Optional[Dict[str, Any]]:
+        """De inhoud van het artefact als die bij deze packs hoort, anders None."""
+        if not self._read:
+            self._read = True
+            try:
+                with open(self.path, "rb") as fh:
+                    self._data = marshal.load(fh)
+            except Exception:
+                self._data = None
+        data = self._data
+        if isinstance(data, dict) and data.get("key") == self.key_for(pack):
+            return data
+        return None
+
+    def packs(self, pack: RulePack) -> Optional[Tuple[Dict[str, str], Dict[str, Dict[str, Any]]]]:
+        """(shared, rulesets) zoals _parse ze zou geven, of None (dan parsen)."""
+        data = self._entry(pack)
+        if data is None or not isinstance(data.get("shared"), dict) or not isinstance(data.get("rulesets"), dict):
+            return None
+        return data["shared"], data["rulesets"]
+
+    def load(self, pack: RulePack) -> int:
+        self.key = self.key_for(pack)
+        self.pack = pack
+        data = self._entry(pack)
+        if data is not None and isinstance(data.get("keywords"), dict):
+            add_known_keywords(data["keywords"])
+            self.loaded = len(data["keywords"])
+        return self.loaded
+
+    def save(self) -> bool:
+        if self.key is None or self.pack is None:
+            return False
+        keywords = dict(known_keywords())
+        entry = {"key": self.key, "shared": self.pack.shared, "rulesets": self.pack.rulesets, "keywords": keywords}
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "wb") as fh:
+                marshal.dump(entry, fh)
+            os.replace(tmp, self.path)
+        except OSError:
+            # Read-only checkout e.d.: dan leiden de audits de trefwoorden zelf af.
+            return False
+        self.loaded = len(keywords)
+        return True
+
+
+_ARTIFACT = Artifact(ARTIFACT_PATH)
+
+# ============================================================
+# Compiler
+# ============================================================
+
+def compile_pack(pack: RulePack) -> Dict[str, Any]:
+    """Alle regelsets als RuleSet/Rewriter, zoals de scripts ze bouwen (vult het artefact)."""
+    from content_rewrite import Rewriter
+    from content_scan import RuleSet
+
+    out: Dict[str, Any] = {}
+    for name, spec in pack.rulesets.items():
+        flags = pack.flags(name)
+        if "categories" in spec:
+            out[name] = RuleSet.from_mapping(pack.categories(name), flags=flags)
+        elif "patterns" in spec:
+            out[name] = RuleSet(((name, p) for p in pack.patterns(name)), flags)
+        else:
+            out[name] = Rewriter(pack.replacements(name), flags)
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Rule-packs en het gecompileerde artefact")
+    ap.add_argument("--rebuild", action="store_true", help="artefact opnieuw opbouwen uit de packs")
+    args = ap.parse_args()
+
+    if args.rebuild:
+        try:
+            ARTIFACT_PATH.unlink()
+        except FileNotFoundError:
+            pass
+    try:
+        pack = rule_pack()
+        compile_pack(pack)
+    except (RulePackError, re.error) as e:
+        print("Rule-pack fout:", e)
+        return 1
+
+    patterns = pack.all_patterns()
+    unique = {(p, f) for _, p, f in patterns}
+    shared: Dict[Tuple[str, int], List[str]] = {}
+    for name, p, f in patterns:
+        shared.setdefault((p, f), []).append(name)
+
+    print("Packs:", ", ".join(str(p.relative_to(RULES_DIR.parent)) for p in pack.paths) or "(geen)")
+    print(f"Regelsets: {len(pack.rulesets)}  patronen: {len(patterns)}  uniek: {len(unique)}  "
+          f"hash: {pack.hash}")
+    for name in pack.rulesets:
+        count = sum(1 for n, _, _ in patterns if n == name)
+        print(f"  {name:<16} {count:>3}")
+    multi = {k: v for k, v in shared.items() if len(set(v)) > 1}
+    if multi:
+        print("Gedeeld (één keer gecompileerd):")
+        for (p, _), names in multi.items():
+            print(f"  {p}  ← {', '.join(dict.fromkeys(names))}")
+
+    saved = _ARTIFACT.save()
+    where = ARTIFACT_PATH if saved else "niet geschreven"
+    print(f"Artefact: trefwoorden van {len(known_keywords())} patronen ({where})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
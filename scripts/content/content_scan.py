@@ -0,0 +1,980 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gedeelde scan-engine voor de content-audits (content_audit, content_conscious_audit,
+freeze_site_copy).
+
+Kern: een RuleSet bundelt alle regels achter een goedkope prefilter. Uit elk patroon
+worden de letterlijke trefwoorden afgeleid die in iedere match moeten voorkomen
+("prosafetymatch", "dba", "gezag", "exclusief", ...). Eén literal-search over de
+(casefolded) regel beslist of de losse patronen nog moeten draaien. Lukt dat afleiden
+niet voor alle regels, dan valt de prefilter terug op één gecombineerde alternation.
+Gerapporteerde categorieën/patronen blijven in beide gevallen identiek.
+
+Co-occurrence-regels (`\\bA\\b.*\\bB\\b`) zoeken hun woordsets na elkaar in plaats
+van over `.*` te backtracken (CooccurrencePattern); zelfde uitkomst, lineair.
+
+Daarvóór zit een bestands-prefilter (FilePrefilter): gemmapte bytes-search op
+dezelfde trefwoorden, zodat schone bestanden niet eens gedecodeerd worden.
+
+run_scan verdeelt bestanden over een procespool (--jobs N) en levert resultaten in
+vaste volgorde terug, zodat rapporten byte-identiek blijven aan een seriële run.
+Binnen elk proces lezen een paar threads de volgende bestanden alvast in (--prefetch,
+begrensd venster); de prefilter en iter_lines gebruiken die bytes in plaats van
+opnieuw te lezen, het matchen blijft op de scan-thread.
+"""
+
+from __future__ import annotations
+
+import argparse
+import codecs
+import mmap
+import os
+import re
+import sys
+from array import array
+from collections import deque
+from functools import partial
+from pathlib import Path
+from typing import AbstractSet, Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+try:  # Python 3.11+
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # pragma: no cover - oudere Pythons
+    import sre_constants, sre_parse  # type: ignore
+
+R = TypeVar("R")
+
+# Prefetch: zoveel bestanden vooruit (0 = uit), met zoveel lees-threads. Grotere
+# bestanden leest de scan zelf; het geheugen blijft zo begrensd op diepte × max.
+PREFETCH_DEPTH = 32
+PREFETCH_THREADS = 4
+PREFETCH_MAX_BYTES = 4 * 1024 * 1024
+
+TextFilter = Callable[[Path], Optional[Iterator[Tuple[int, str]]]]
+
+
+class ScanOptions:
+    """
+    Scan-opties uit de CLI, expliciet aan run_scan meegegeven: prefetch-diepte,
+    tekstfilter (--visible-only/--sentences, content_extract: path → (regelnummer,
+    tekst) of None = gewone regels), het actieve --profile (content_profile.Profile)
+    en bij --staged de inhoud per pad uit de index (content_git.staged_blobs).
+    """
+
+    __slots__ = ("prefetch", "text_filter", "profile", "blobs")
+
+    def __init__(self, prefetch: int = PREFETCH_DEPTH, text_filter: Optional[TextFilter] = None,
+                 profile: Any = None, blobs: Optional[Dict[Path, bytes]] = None):
+        self.prefetch = max(prefetch, 0)
+        self.text_filter = text_filter
+        self.profile = profile
+        self.blobs = blobs
+
+
+# Opties van de scan die nu loopt (scan_context); iter_lines en RuleSet lezen ze hier,
+# zodat de scan-functies van de scripts ze niet zelf hoeven door te geven.
+_ACTIVE = ScanOptions()
+
+# (pad, bytes) van het bestand dat nu gescand wordt, als de prefetch het al las.
+_PRELOADED: Optional[Tuple[Any, bytes]] = None
+
+
+class _ScanContext:
+    def __init__(self, options: Optional[ScanOptions]):
+        self.options = options
+        self.saved: Optional[ScanOptions] = None
+
+    def __enter__(self) -> ScanOptions:
+        global _ACTIVE
+        self.saved = _ACTIVE
+        if self.options is not None:
+            _ACTIVE = self.options
+        return _ACTIVE
+
+    def __exit__(self, *exc: Any) -> None:
+        global _ACTIVE
+        _ACTIVE = self.saved
+
+
+def scan_context(options: Optional[ScanOptions]) -> _ScanContext:
+    """`with scan_context(options):` – options gelden binnen het blok (None = ongewijzigd)."""
+    return _ScanContext(options)
+
+
+def text_filter_for(mode: str) -> Optional[TextFilter]:
+    """Het content_extract-filter voor een tekstmodus ("visible", "sentences"); None voor gewone regels."""
+    if not mode:
+        return None
+    # De tokenizer pas laden als iemand erom vraagt; een gewone run importeert hem niet.
+    import content_extract
+
+    return content_extract.sentence_lines if mode == "sentences" else content_extract.visible_lines
+
+
+def text_mode(args) -> str:
+    # --sentences wint van --visible-only.
+    if getattr(args, "sentences", False):
+        return "sentences"
+    return "visible" if getattr(args, "visible_only", False) else ""
+
+
+def scan_options(args, profile: Any = None) -> ScanOptions:
+    """ScanOptions volgens --prefetch, --visible-only/--sentences en het Profile van start_profile."""
+    return ScanOptions(getattr(args, "prefetch", PREFETCH_DEPTH), text_filter_for(text_mode(args)), profile)
+
+
+def preloaded(path: Path) -> Optional[bytes]:
+    """
+    Al ingelezen bytes van path: de gestagede blob bij --staged, anders wat de prefetch
+    las (alleen tijdens de scan van precies dat bestand).
+    """
+    blobs = _ACTIVE.blobs
+    if blobs is not None:
+        data = blobs.get(path)
+        if data is not None:
+            return data
+    if _PRELOADED is not None and _PRELOADED[0] == path:
+        return _PRELOADED[1]
+    return None
+
+
+def set_preloaded(path: Any, data: Optional[bytes]) -> None:
+    """Laat iter_lines, read_text en de bestands-prefilter voor path deze bytes lezen (bv. een git-blob)."""
+    global _PRELOADED
+    _PRELOADED = None if data is None else (path, data)
+
+# ============================================================
+# Trefwoord-afleiding
+# ============================================================
+
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, "POSSESSIVE_REPEAT"):
+    _REPEATS.add(sre_constants.POSSESSIVE_REPEAT)
+
+
+def _score(words: FrozenSet[str]) -> Tuple[int, int]:
+    # Liever lange trefwoorden (selectiever), daarna zo min mogelijk alternatieven.
+    return (min(len(w) for w in words), -len(words))
+
+
+def _required(seq) -> Optional[FrozenSet[str]]:
+    best: Optional[FrozenSet[str]] = None
+    run: List[str] = []
+
+    def consider(cand: Optional[FrozenSet[str]]) -> None:
+        nonlocal best
+        if cand and (best is None or _score(cand) > _score(best)):
+            best = cand
+
+    def flush() -> None:
+        if run:
+            consider(frozenset(["".join(run)]))
+            run.clear()
+
+    for op, av in seq:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        flush()
+        if op is sre_constants.SUBPATTERN:
+            consider(_required(av[-1]))
+        elif op in _REPEATS and av[0] >= 1:
+            consider(_required(av[2]))
+        elif op is sre_constants.BRANCH:
+            alts = [_required(branch) for branch in av[1]]
+            if all(alts):
+                consider(frozenset().union(*alts))
+        elif getattr(sre_constants, "ATOMIC_GROUP", None) is op:
+            consider(_required(av))
+    flush()
+    return best
+
+
+def required_keywords(pattern: str, flags: int = 0) -> Optional[FrozenSet[str]]:
+    """Letterlijke trefwoorden waarvan er minstens één in elke match zit (of None)."""
+    key = (pattern, int(flags))
+    try:
+        return _KEYWORDS[key]
+    except KeyError:
+        pass
+    try:
+        words = _required(sre_parse.parse(pattern, flags))
+    except Exception:
+        words = None
+    _KEYWORDS[key] = words
+    return words
+
+def _keyword_regex(words: Iterable[str], flags: int = 0) -> re.Pattern:
+    ordered = sorted(words, key=lambda w: (-len(w), w))
+    return compile_pattern("|".join(re.escape(w) for w in ordered), flags)
+
+# ============================================================
+# Gecompileerde patronen (gedeeld, trefwoorden via content_rules)
+# ============================================================
+
+# Elk uniek (patroon, flags) wordt per proces één keer gecompileerd, ook als audit,
+# funnel, conscious en de suite het allemaal gebruiken.
+_COMPILED: Dict[Tuple[str, int], re.Pattern] = {}
+
+# (patroon, flags) → afgeleide trefwoorden (of None). content_rules bewaart dit op schijf,
+# zodat een volgend proces de extra parse voor de prefilters overslaat.
+_KEYWORDS: Dict[Tuple[str, int], Optional[FrozenSet[str]]] = {}
+
+
+def compile_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """re.compile, maar gedeeld per proces."""
+    key = (pattern, int(flags))
+    compiled = _COMPILED.get(key)
+    if compiled is None:
+        compiled = _COMPILED[key] = re.compile(pattern, flags)
+    return compiled
+
+
+def known_keywords() -> Dict[Tuple[str, int], Optional[FrozenSet[str]]]:
+    return _KEYWORDS
+
+
+def add_known_keywords(entries: Dict[Tuple[str, int], Optional[FrozenSet[str]]]) -> None:
+    for key, words in entries.items():
+        _KEYWORDS.setdefault(key, words)
+
+# ============================================================
+# Bestands-prefilter (bytes, vóór het decoderen)
+# ============================================================
+
+_NON_ASCII_RE = re.compile(rb"[\x80-\xff]")
+
+# could_match lowercaset/decodeert per stuk van deze grootte: nooit een kopie van het hele bestand.
+PREFILTER_CHUNK = 1 << 20
+_Utf8Decoder = codecs.getincrementaldecoder("utf-8")
+
+
+def _pieces(data, overlap: int = 0) -> Iterator[bytes]:
+    """data (bytes of mmap) in stukken van PREFILTER_CHUNK, elk met `overlap` bytes van het vorige ervoor."""
+    for start in range(0, len(data), PREFILTER_CHUNK):
+        yield data[max(0, start - overlap):start + PREFILTER_CHUNK]
+
+
+class FilePrefilter:
+    """
+    Beslist per bestand of het überhaupt een hit kán opleveren, zonder te decoderen
+    of in regels te splitsen. Het bestand wordt gemmapt en per stuk (ASCII-)gelowercased
+    op de trefwoorden doorzocht; een handvol `in`-checks is hier veel sneller dan één
+    bytes-regex met re.IGNORECASE. De stukken overlappen met de lengte van het langste
+    trefwoord, zodat een trefwoord op een grens niet gemist wordt.
+
+    Exact t.o.v. de regelscan: puur ASCII-bestanden decoderen 1-op-1, dus daar is
+    de bytes-check sluitend. Bevat een bestand niet-ASCII bytes (é, maar ook ſ/ı/K
+    die onder re.IGNORECASE met s/i/k matchen, of ongeldige UTF-8 die errors="ignore"
+    wegfiltert), dan valt het terug op (incrementeel) decoderen + dezelfde check op de
+    casefolded tekst. Niet-ASCII trefwoorden gaan altijd via de tekst-route met re.IGNORECASE.
+    """
+
+    def __init__(self, keywords: Optional[FrozenSet[str]]):
+        self.keywords = keywords
+        self.ascii = bool(keywords) and all(w.isascii() for w in keywords)
+        self._text_words: Tuple[str, ...] = ()
+        self._bytes_words: Tuple[bytes, ...] = ()
+        self._text_re: Optional[re.Pattern] = None
+        # Een trefwoord over een stukgrens heeft hoogstens zoveel tekens in het vorige stuk.
+        self._overlap = max(map(len, keywords), default=1) - 1 if keywords else 0
+        if self.ascii:
+            self._text_words = tuple(sorted({w.lower() for w in keywords}))
+            self._bytes_words = tuple(w.encode("ascii") for w in self._text_words)
+        elif keywords:
+            self._text_re = _keyword_regex(keywords, re.IGNORECASE)
+
+    def could_match(self, path: Path) -> bool:
+        if self.keywords is None:
+            return True
+        if not self.keywords:
+            return False
+        data = preloaded(path)
+        if data is not None:
+            return bool(data) and self._search(data)
+        try:
+            with open(path, "rb") as fh:
+                if os.fstat(fh.fileno()).st_size == 0:
+                    return False
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    return self._search(buf)
+        except (OSError, ValueError):
+            return True
+
+    def _search(self, data) -> bool:
+        if self.ascii:
+            for piece in _pieces(data, self._overlap):
+                lowered = piece.lower()
+                if any(w in lowered for w in self._bytes_words):
+                    return True
+            if _NON_ASCII_RE.search(data) is None:
+                return False
+
+        decoder = _Utf8Decoder()
+        tail = ""
+        try:
+            for piece in _pieces(data):
+                text = decoder.decode(piece)
+                if self._text_re is not None:
+                    text = tail + text
+                    if self._text_re.search(text) is not None:
+                        return True
+                else:
+                    text = tail + text.casefold().replace("ı", "i")
+                    if any(w in text for w in self._text_words):
+                        return True
+                tail = text[-self._overlap:] if self._overlap else ""
+            decoder.decode(b"", final=True)   # afgebroken UTF-8-reeks aan het eind
+        except UnicodeDecodeError:
+            return True
+        return False
+
+# ============================================================
+# Co-occurrence zonder backtracking
+# ============================================================
+
+# Onder deze lengte is de backtracking goedkoper dan de extra searches vanuit Python.
+COOC_MIN_CHARS = 160
+
+_COOC_PART_RE = re.compile(r"\\b(?:\((?:\?:)?(\w+(?:\|\w+)*)\)|(\w+))\\b", re.ASCII)
+
+
+def cooccurrence_parts(pattern: str) -> Optional[Tuple[str, ...]]:
+    """
+    De woordsets van `\\bA\\b.*\\b(B|C)\\b` (twee of meer delen) als losse
+    `\\b(...)\\b`-patronen, in volgorde; None voor elke andere vorm.
+    """
+    pieces = pattern.split(".*")
+    if len(pieces) < 2 or not all(_COOC_PART_RE.fullmatch(piece) for piece in pieces):
+        return None
+    return tuple(pieces)
+
+
+class CooccurrencePattern:
+    """
+    Vervangt `\\bA\\b.*\\bB\\b` in een RuleSet. De regex zoekt A, loopt met `.*` naar
+    het eind van de regel en backtrackt teken voor teken op zoek naar B, voor elk
+    voorkomen van A opnieuw: kwadratisch op lange regels/zinnen. Hier zoeken we per
+    woordset het eerste voorkomen ná het vorige (zo vroeg mogelijk laat de meeste
+    ruimte), dus één lineaire pass. Elk deel is hetzelfde subpatroon met dezelfde flags
+    en `\\b` kijkt ook bij pos naar het teken ervóór: exact dezelfde uitkomst. Alleen bij
+    een treffer draait de regex zelf, voor het gewone Match-object.
+    """
+
+    __slots__ = ("compiled", "parts")
+
+    def __init__(self, compiled: re.Pattern, parts: Iterable[str]):
+        self.compiled = compiled
+        self.parts = [compile_pattern(part, compiled.flags) for part in parts]
+
+    @property
+    def pattern(self) -> str:
+        return self.compiled.pattern
+
+    def search(self, line: str):
+        if len(line) < COOC_MIN_CHARS or ("\n" in line and not self.compiled.flags & re.DOTALL):
+            return self.compiled.search(line)
+        pos = 0
+        for part in self.parts:
+            m = part.search(line, pos)
+            if m is None:
+                return None
+            pos = m.end()
+        return self.compiled.search(line)
+
+# ============================================================
+# RuleSet
+# ============================================================
+
+class RuleSet:
+    """Gecompileerde (categorie, patroon)-regels met een gecombineerde prefilter."""
+
+    def __init__(self, rules: Iterable[Tuple[str, str]], flags: int = re.IGNORECASE,
+                 prefilter_extra: Iterable[str] = ()):
+        rules = list(rules)
+        self.flags = flags
+        # (categorie, patroon) per regel-id; FileHits bewaart alleen de id.
+        self.labels: List[Tuple[str, str]] = rules
+        self.rules: List[Tuple[str, re.Pattern, str]] = []
+        for cat, pat in rules:
+            creg = compile_pattern(pat, flags)
+            parts = cooccurrence_parts(pat)
+            self.rules.append((cat, CooccurrencePattern(creg, parts) if parts else creg, pat))
+        self.keywords: Optional[FrozenSet[str]] = None
+        self.prefilter: Optional[re.Pattern] = None
+        self._casefold = True
+        if rules:
+            per_rule = [required_keywords(pat, flags) for _, pat in rules]
+            if all(per_rule):
+                # Trefwoorden-set: een regel zonder één van deze woorden kan nergens matchen.
+                self.keywords = frozenset().union(*per_rule)
+                if all(w.isascii() for w in self.keywords):
+                    self.prefilter = _keyword_regex(w.lower() for w in self.keywords)
+                else:
+                    # casefold() volgt re.IGNORECASE niet voor alle niet-ASCII tekens.
+                    self.prefilter = _keyword_regex(self.keywords, re.IGNORECASE)
+                    self._casefold = False
+            else:
+                # Eén alternation over alle patronen: matcht precies als minstens één regel matcht.
+                self.prefilter = compile_pattern("|".join(f"(?:{pat})" for _, pat in rules), flags)
+                self._casefold = False
+
+        # Bestandsfilter: ook extra patronen (bv. CTA-detectie) die het resultaat bepalen.
+        parts = [required_keywords(pat, flags) for pat in prefilter_extra]
+        if rules:
+            parts.append(self.keywords)
+        self.file_filter = FilePrefilter(frozenset().union(*parts) if all(parts) else None)
+
+        if _ACTIVE.profile is not None:
+            _ACTIVE.profile.instrument(self)
+
+    @classmethod
+    def from_mapping(cls, mapping: Dict[str, List[str]], only: str | None = None,
+                     flags: int = re.IGNORECASE, prefilter_extra: Iterable[str] = ()) -> "RuleSet":
+        return cls(rule_labels(mapping, only), flags, prefilter_extra)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def candidate(self, line: str) -> bool:
+        """False als geen enkele regel op deze regel kan matchen."""
+        if self.prefilter is None:
+            return False
+        if self._casefold:
+            line = line.casefold()
+            if "ı" in line:
+                # dotless i matcht onder re.IGNORECASE met "i", maar casefold laat hem staan
+                line = line.replace("ı", "i")
+        return self.prefilter.search(line) is not None
+
+    def could_match_file(self, path: Path) -> bool:
+        """Goedkope bytes-check vooraf: False als het bestand gegarandeerd 0 hits geeft."""
+        return self.file_filter.could_match(path)
+
+    def match(self, line: str) -> List[Tuple[str, str]]:
+        """Alle (categorie, patroon)-paren die op deze regel matchen, in regelvolgorde."""
+        if not self.candidate(line):
+            return []
+        return [(cat, pat) for cat, creg, pat in self.rules if creg.search(line)]
+
+    def match_ids(self, line: str) -> List[int]:
+        """Als match, maar de regel-id's (index in labels)."""
+        if not self.candidate(line):
+            return []
+        return [idx for idx, (_, creg, _) in enumerate(self.rules) if creg.search(line)]
+
+    def any(self, line: str) -> bool:
+        return self.candidate(line) and any(creg.search(line) for _, creg, _ in self.rules)
+
+
+def rule_labels(mapping: Dict[str, List[str]], only: str | None = None) -> List[Tuple[str, str]]:
+    """De (categorie, patroon)-paren van RuleSet.from_mapping, zonder te compileren."""
+    return [
+        (cat, pat)
+        for cat, pats in mapping.items()
+        if not only or only.lower() in cat.lower()
+        for pat in pats
+    ]
+
+# ============================================================
+# Compacte hits
+# ============================================================
+
+class FileHits:
+    """
+    Hits van één bestand zonder een object per hit: (regel-id, regelnummer, begin, eind)
+    in één array("I"), de geraakte regels één keer achter elkaar in `text`. Raken
+    meerdere regels dezelfde regel, dan delen ze begin/eind. Categorie en patroon zijn
+    de regel-id in RuleSet.labels; een Hit ontstaat pas in HitList.
+    """
+
+    __slots__ = ("rows", "text", "_parts", "_end")
+
+    def __init__(self, rows: Optional[array] = None, text: str = "") -> None:
+        self.rows = array("I") if rows is None else rows
+        self.text = text
+        self._parts: List[str] = []
+        self._end = len(text)
+
+    def add(self, ids: List[int], line_no: int, line: str) -> None:
+        begin = self._end
+        self._end += len(line)
+        self._parts.append(line)
+        for idx in ids:
+            self.rows.extend((idx, line_no, begin, self._end))
+
+    def _flush(self) -> None:
+        if self._parts:
+            self.text += "".join(self._parts)
+            self._parts = []
+
+    def __len__(self) -> int:
+        return len(self.rows) // 4
+
+    def __iter__(self) -> Iterator[Tuple[int, int, str]]:
+        """(regel-id, regelnummer, regel) per hit, in scanvolgorde."""
+        self._flush()
+        rows, text = self.rows, self.text
+        for k in range(0, len(rows), 4):
+            yield rows[k], rows[k + 1], text[rows[k + 2]:rows[k + 3]]
+
+    def subset(self, keep: Callable[[int], bool]) -> "FileHits":
+        """Alleen de hits op regelnummers waarvoor keep(regelnummer) waar is (zelfde buffer)."""
+        self._flush()
+        rows = self.rows
+        kept = array("I")
+        for k in range(0, len(rows), 4):
+            if keep(rows[k + 1]):
+                kept.extend(rows[k:k + 4])
+        return FileHits(kept, self.text)
+
+    def __getstate__(self) -> Tuple[array, str]:
+        self._flush()
+        return self.rows, self.text
+
+    def __setstate__(self, state: Tuple[array, str]) -> None:
+        self.rows, self.text = state
+        self._parts = []
+        self._end = len(self.text)
+
+
+class HitList:
+    """
+    Alle hits van een run: per bestand de plaats (pad of relpad) en z'n FileHits.
+    make(categorie, patroon, plaats, regelnummer, regel) bouwt een Hit pas bij het
+    uitlezen; een rapport dat per categorie 50 regels toont, of alleen telt, maakt er
+    dus ook maar zoveel.
+
+    Regel-id's in `counted` worden bij add() alleen per categorie geteld: hun rijen en
+    regeltekst blijven niet bewaard. len() en by_category() tellen ze mee, itereren
+    levert ze niet.
+    """
+
+    __slots__ = ("labels", "make", "places", "files", "total", "counted", "counts", "order")
+
+    def __init__(self, labels: List[Tuple[str, str]], make: Callable[..., Any],
+                 counted: AbstractSet[int] = frozenset()):
+        self.labels = labels
+        self.make = make
+        self.places: List[Any] = []
+        self.files: List[FileHits] = []
+        self.total = 0
+        self.counted = counted
+        self.counts: Dict[str, int] = {}
+        # Categorieën in volgorde van de eerste hit; alleen bijgehouden met counted.
+        self.order: Dict[str, None] = {}
+
+    def add(self, place: Any, file_hits: Optional[FileHits], keep: Optional[Callable[[int], bool]] = None) -> None:
+        if file_hits and keep is not None:
+            file_hits = file_hits.subset(keep)
+        if file_hits and self.counted:
+            file_hits = self._count(file_hits)
+        if not file_hits:
+            return
+        self.places.append(place)
+        self.files.append(file_hits)
+        self.total += len(file_hits)
+
+    def _count(self, file_hits: FileHits) -> Optional[FileHits]:
+        """Telt de hits van `counted` en geeft de rest terug, met alleen hún regeltekst."""
+        labels, counted, counts, order = self.labels, self.counted, self.counts, self.order
+        for idx in file_hits.rows[0::4]:
+            order.setdefault(labels[idx][0])
+        if not any(idx in counted for idx in file_hits.rows[0::4]):
+            return file_hits
+        kept = FileHits()
+        ids: List[int] = []
+        last = None
+        for idx, line_no, line in file_hits:
+            if idx in counted:
+                cat = labels[idx][0]
+                counts[cat] = counts.get(cat, 0) + 1
+                self.total += 1
+                continue
+            # Hits op dezelfde regel staan achter elkaar; ze delen weer één stuk tekst.
+            if last is not None and last[0] != line_no:
+                kept.add(ids, *last)
+                ids = []
+            ids.append(idx)
+            last = (line_no, line)
+        if last is not None:
+            kept.add(ids, *last)
+        return kept
+
+    def each(self, place: Any, file_hits: Optional[FileHits],
+             keep: Optional[Callable[[int], bool]] = None) -> Iterator[Any]:
+        """De Hits van één bestand, zonder ze op te slaan (streamen, --watch)."""
+        labels, make = self.labels, self.make
+        for idx, line_no, line in file_hits or ():
+            if keep is None or keep(line_no):
+                cat, pat = labels[idx]
+                yield make(cat, pat, place, line_no, line)
+
+    def _hit(self, f: int, k: int) -> Any:
+        file_hits = self.files[f]
+        file_hits._flush()
+        rows = file_hits.rows
+        cat, pat = self.labels[rows[k]]
+        return self.make(cat, pat, self.places[f], rows[k + 1], file_hits.text[rows[k + 2]:rows[k + 3]])
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __iter__(self) -> Iterator[Any]:
+        for place, file_hits in zip(self.places, self.files):
+            yield from self.each(place, file_hits)
+
+    def by_category(self) -> Dict[str, "HitGroup"]:
+        """Per categorie (volgorde van eerste hit) alleen (bestand, rij)-verwijzingen."""
+        groups: Dict[str, HitGroup] = {}
+        labels = self.labels
+        for f, file_hits in enumerate(self.files):
+            rows = file_hits.rows
+            for k in range(0, len(rows), 4):
+                cat = labels[rows[k]][0]
+                group = groups.get(cat)
+                if group is None:
+                    group = groups[cat] = HitGroup(self)
+                group.refs.extend((f, k))
+        if not self.counted:
+            return groups
+        for cat, n in self.counts.items():
+            group = groups.get(cat)
+            if group is None:
+                group = groups[cat] = HitGroup(self)
+            group.extra += n
+        return {cat: groups[cat] for cat in self.order if cat in groups}
+
+
+class HitGroup:
+    """
+    Hits van één categorie uit een HitList; len() telt zonder Hits te maken, ook de
+    alleen-getelde (extra) die niet te slicen zijn.
+    """
+
+    __slots__ = ("hits", "refs", "extra")
+
+    def __init__(self, hits: HitList):
+        self.hits = hits
+        self.refs = array("I")
+        self.extra = 0
+
+    def __len__(self) -> int:
+        return len(self.refs) // 2 + self.extra
+
+    def __getitem__(self, index: slice) -> List[Any]:
+        refs = self.refs
+        return [self.hits._hit(refs[2 * j], refs[2 * j + 1]) for j in range(len(refs) // 2)[index]]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self[:])
+
+# ============================================================
+# Streamende regel-lezer
+# ============================================================
+
+READ_BLOCK_CHARS = 1 << 16
+
+
+def iter_lines(path: Path) -> Iterator[Tuple[int, str]]:
+    """
+    Zie _iter_lines; onder --profile met lees/decode-tijd per bestand. Met een
+    tekstfilter (--visible-only) de zichtbare segmenten met hun bronregel.
+    """
+    text_filter = _ACTIVE.text_filter
+    lines = text_filter(path) if text_filter is not None else None
+    if lines is None:
+        data = preloaded(path)
+        if data is not None:
+            # Zelfde regels als _iter_lines: utf-8 met errors="ignore" decodeert in één keer
+            # hetzelfde als incrementeel, en er is geen newline-vertaling.
+            lines = enumerate(data.decode("utf-8", errors="ignore").splitlines(), 1)
+        else:
+            lines = _iter_lines(path)
+    if _ACTIVE.profile is not None:
+        return _ACTIVE.profile.timed_lines(path, lines)
+    return lines
+
+
+def read_text(path: Path) -> str:
+    """Als path.read_text(encoding="utf-8", errors="ignore"), uit de prefetch als die er is."""
+    data = preloaded(path)
+    if data is None:
+        return path.read_text(encoding="utf-8", errors="ignore")
+    # read_text vertaalt \r\n en \r naar \n (universal newlines).
+    return data.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _iter_lines(path: Path) -> Iterator[Tuple[int, str]]:
+    r"""
+    (regelnummer, regel) zoals enumerate(path.read_text(...).splitlines(), 1), maar
+    zonder de hele tekst plus regellijst in het geheugen te houden.
+
+    We knippen elk blok na de laatste "\n": daar eindigt altijd een regel (ook bij
+    "\r\n"), dus splitlines per stuk geeft exact dezelfde regels en nummers als
+    splitlines over de hele tekst, inclusief \r, \v, \f, \u2028 enz.
+    """
+    i = 0
+    carry = ""
+    with open(path, encoding="utf-8", errors="ignore", newline="") as fh:
+        while True:
+            block = fh.read(READ_BLOCK_CHARS)
+            if not block:
+                break
+            text = carry + block
+            cut = text.rfind("\n") + 1
+            if not cut:
+                carry = text
+                continue
+            carry = text[cut:]
+            for line in text[:cut].splitlines():
+                i += 1
+                yield i, line
+    for line in carry.splitlines():
+        i += 1
+        yield i, line
+
+
+# ============================================================
+# Parallelle scan-driver
+# ============================================================
+
+_WORKER_STATE = None
+
+
+def _init_worker(setup: Callable[[], Any], options: ScanOptions) -> None:
+    # Eén keer per worker: regels compileren e.d.; de opties expliciet (spawn erft niets).
+    global _ACTIVE, _WORKER_STATE
+    _ACTIVE = options
+    _WORKER_STATE = setup()
+
+
+def _scan_chunk(scan: Callable[[Any, Any], R], path_of: Callable[[Any], Path], depth: int,
+                chunk: List[Any]) -> List[R]:
+    return list(_scan_items(scan, chunk, lambda: _WORKER_STATE, path_of, depth))
+
+
+def identity(item: Any) -> Any:
+    return item
+
+
+def _read_ahead(path: Path) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size > PREFETCH_MAX_BYTES:
+                return None
+            return fh.read()
+    except OSError:
+        return None   # de scan zelf leest opnieuw en gedraagt zich zoals altijd
+
+
+class _Prefetch:
+    __slots__ = ("path", "data", "done")
+
+    def __init__(self, path: Path, done: Any):
+        self.path = path
+        self.data: Optional[bytes] = None
+        self.done = done
+
+
+def _prefetch_reader(tasks: Any) -> None:
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        task.data = _read_ahead(task.path)
+        task.done.set()
+
+
+def _prefetched(items: Iterable[Any], path_of: Callable[[Any], Path],
+                depth: int) -> Iterator[Tuple[Any, Optional[bytes]]]:
+    """(item, bytes) in invoervolgorde; hoogstens `depth` bestanden tegelijk in het geheugen."""
+    # Kale threads i.p.v. concurrent.futures: dat trekt logging e.d. mee (~25 ms opstart).
+    import threading
+    from queue import SimpleQueue
+
+    tasks: SimpleQueue = SimpleQueue()
+    readers = [threading.Thread(target=_prefetch_reader, args=(tasks,), name=f"prefetch-{i}", daemon=True)
+               for i in range(PREFETCH_THREADS)]
+    for t in readers:
+        t.start()
+    try:
+        window: deque = deque()
+        for item in items:
+            task = _Prefetch(path_of(item), threading.Event())
+            if task.path is None:
+                # Niets op schijf (bv. een git-blob die de scan zelf aanlevert).
+                task.done.set()
+            else:
+                tasks.put(task)
+            window.append((item, task))
+            if len(window) >= depth:
+                item, task = window.popleft()
+                task.done.wait()
+                yield item, task.data
+        while window:
+            item, task = window.popleft()
+            task.done.wait()
+            yield item, task.data
+    finally:
+        for _ in readers:
+            tasks.put(None)
+        for t in readers:
+            t.join()
+
+
+def _scan_items(scan: Callable[[Any, Any], Optional[R]], items: Iterable[Any], setup: Callable[[], Any],
+                path_of: Callable[[Any], Path], depth: int) -> Iterator[Optional[R]]:
+    """Seriële scan op deze thread, met (tenzij uit of onder --profile) prefetch ervoor."""
+    global _PRELOADED
+    state = None
+    if depth <= 0 or _ACTIVE.profile is not None:
+        for item in items:
+            if state is None:
+                # Pas compileren als er echt iets te scannen is (bv. alles uit cache).
+                state = setup()
+            yield scan(item, state)
+        return
+
+    for item, data in _prefetched(items, path_of, depth):
+        if state is None:
+            state = setup()
+        _PRELOADED = None if data is None else (path_of(item), data)
+        try:
+            result = scan(item, state)
+        finally:
+            _PRELOADED = None
+        yield result
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def resolve_jobs(jobs: int) -> int:
+    """--jobs 0 (of negatief) betekent: alle cores."""
+    return jobs if jobs > 0 else (os.cpu_count() or 1)
+
+
+class ScanStats:
+    """Tellers voor de --stats footer."""
+
+    def __init__(self) -> None:
+        self.files = 0
+        self.skipped = 0
+        self.cached = 0
+        self.store_hits = 0
+        self.store_misses = 0
+
+    @property
+    def scanned(self) -> int:
+        return self.files - self.skipped - self.cached
+
+    def footer(self) -> str:
+        line = (f"📊 {self.files} bestanden: {self.scanned} gescand, "
+                f"{self.skipped} overgeslagen door prefilter, {self.cached} uit cache")
+        if self.store_hits or self.store_misses:
+            # Alleen met --store: hoeveel van de rest de content-store leverde.
+            share = 100 * self.cached // max(self.files, 1)
+            line += f" ({share}%); content-store: {self.store_hits} hits, {self.store_misses} misses"
+        return line
+
+
+def run_scan(scan: Callable[[Any, Any], Optional[R]], items: Iterable[Any], setup: Callable[[], Any],
+             jobs: int = 1, chunksize: int = 64, empty: Callable[[], R] = list,
+             stats: Optional[ScanStats] = None, path_of: Callable[[Any], Path] = identity,
+             options: Optional[ScanOptions] = None) -> Iterator[R]:
+    """
+    Roep scan(item, state) aan voor elk item; resultaten komen in invoervolgorde terug,
+    zodat rapporten byte-identiek zijn aan een seriële run. state = setup(), één keer
+    per proces. Met jobs > 1 moeten scan, setup en path_of picklebaar zijn
+    (module-functies, operator.itemgetter of functools.partial daarvan).
+
+    path_of(item) is het bestand dat de prefetch alvast inleest (None = niets inlezen).
+    options (scan_options(args)) gelden tijdens de scan, ook in de workers; None = de
+    opties van een omringende scan_context, anders de defaults.
+
+    Geeft scan None terug, dan heeft de bestands-prefilter het bestand overgeslagen;
+    de aanroeper krijgt dan empty() en stats telt het mee.
+    """
+    with scan_context(options) as active:
+        for result in _run_scan(scan, items, setup, jobs, chunksize, path_of, active):
+            if stats is not None:
+                stats.files += 1
+            if result is None:
+                if stats is not None:
+                    stats.skipped += 1
+                result = empty()
+            yield result
+
+
+def _run_scan(scan: Callable[[Any, Any], Optional[R]], items: Iterable[Any], setup: Callable[[], Any],
+              jobs: int, chunksize: int, path_of: Callable[[Any], Path],
+              options: ScanOptions) -> Iterator[Optional[R]]:
+    jobs = resolve_jobs(jobs)
+    if jobs == 1:
+        yield from _scan_items(scan, items, setup, path_of, options.prefetch)
+        return
+
+    items = list(items)
+    if not items:
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Het profiel blijft in dit proces (--profile zet --jobs 1).
+    worker_options = ScanOptions(options.prefetch, options.text_filter, blobs=options.blobs)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(setup, worker_options)) as pool:
+        chunk_scan = partial(_scan_chunk, scan, path_of, min(options.prefetch, chunksize))
+        for results in pool.map(chunk_scan, _chunks(items, chunksize)):
+            yield from results
+
+
+class HelpFormatter(argparse.HelpFormatter):
+    """
+    argparse.HelpFormatter zonder `import shutil`: argparse maakt bij elke add_argument
+    al een formatter, en shutil (plus zlib/bz2/lzma) alleen voor de terminalbreedte is
+    bij een gewone run pure opstarttijd. Zelfde breedte als shutil.get_terminal_size.
+    """
+
+    def __init__(self, prog, indent_increment=2, max_help_position=24, width=None):
+        if width is None:
+            try:
+                width = int(os.environ.get("COLUMNS", "0"))
+            except ValueError:
+                width = 0
+            if width <= 0:
+                try:
+                    width = os.get_terminal_size(sys.__stdout__.fileno()).columns
+                except (AttributeError, ValueError, OSError):
+                    width = 0
+            width = (width if width > 0 else 80) - 2
+        super().__init__(prog, indent_increment, max_help_position, width)
+
+
+def add_jobs_argument(parser) -> None:
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="aantal worker-processen (0 = alle cores)")
+    parser.add_argument("--prefetch", type=int, default=PREFETCH_DEPTH, metavar="N",
+                        help="bestanden die lees-threads vooruit inlezen (0 = uit)")
+
+
+def add_visible_argument(parser) -> None:
+    parser.add_argument("--visible-only", action="store_true",
+                        help="alleen zichtbare tekst uit .tsx/.jsx/.ts/.js/.mdx/.md scannen "
+                             "(JSX-tekst, strings, frontmatter; geen imports/classNames/JSON-LD)")
+    parser.add_argument("--sentences", action="store_true",
+                        help="als --visible-only, maar de regels draaien per zin in plaats van per segment")
+
+
+def add_stats_argument(parser) -> None:
+    parser.add_argument("--stats", action="store_true",
+                        help="footer met aantallen gescande/overgeslagen bestanden")
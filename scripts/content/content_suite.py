@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Alle content-audits in één walk en één read per bestand.
+
+  python scripts/content/content_suite.py all
+  python scripts/content/content_suite.py audit funnelcheck
+
+Elke regel gaat langs alle gevraagde regelsets: freeze_site_copy audit (PATTERNS),
+freeze_site_copy funnelcheck (SOFT/HARD), content_conscious_audit (AUDIT_RULES +
+CTA/vragen) en content_audit (PATTERNS). De rapporten zijn gelijk aan die van de losse
+commando's, in die volgorde; de exitcode is die van het eerste commando dat faalt.
+
+Met --manifest sites.json draait dezelfde suite over meerdere sites of checkouts (bv.
+git worktrees van verschillende branches) in één scan: één pool, één regelcompilatie
+per proces. Daarna volgt per site het gewone rapport en tot slot een totaaltabel.
+
+  python scripts/content/content_suite.py all --manifest sites.json --jobs 0
+"""
+
+from __future__ import annotations
+
+import argparse
+from functools import partial
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from typing import AbstractSet, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import content_audit
+import content_conscious_audit
+import freeze_site_copy
+from content_cache import add_cache_arguments, fingerprint, open_cache, run_cached_scan
+from content_git import ChangedLines, GitScopeError, add_git_arguments, git_scope, on_changed_line, staged_blobs, walk_ignored
+from content_profile import add_profile_arguments, finish_profile, start_profile
+from content_scan import FilePrefilter, HelpFormatter, ScanOptions, ScanStats, add_jobs_argument, add_stats_argument, iter_lines, scan_options
+from content_walk import scope_filter, walk_files
+
+DEFAULT_ROOT = "app/(site)"
+
+# Volgorde = volgorde van de losse commando's in CI.
+REPORTS = ["audit", "funnelcheck", "conscious", "content"]
+
+EXCLUDE_DIRS = (freeze_site_copy.EXCLUDE_DIRS | content_conscious_audit.EXCLUDE_DIRS
+                | content_audit.EXCLUDE_DIRS)
+
+INCLUDE_EXT = (freeze_site_copy.INCLUDE_EXT | content_conscious_audit.INCLUDE_EXT
+               | content_audit.INCLUDE_EXT)
+
+# Welke bestanden elk rapport normaal zou scannen.
+CANDIDATE = {
+    "audit": freeze_site_copy.is_candidate,
+    "funnelcheck": freeze_site_copy.is_candidate,
+    "conscious": content_conscious_audit.is_candidate,
+    "content": content_audit.is_candidate,
+}
+
+# Rapporten met een scope relatief aan de root, zoals hun eigen walk die aanhoudt.
+SCOPE = {
+    "content": content_audit.SITE_ROOT_FRAGMENT,
+}
+
+
+def candidate(report: str, root: Path) -> Callable[[Path], bool]:
+    """CANDIDATE[report] plus de scope van het rapport relatief aan root."""
+    test = CANDIDATE[report]
+    if report not in SCOPE:
+        return test
+    in_scope = scope_filter(root, SCOPE[report])
+    roots = (root, root.resolve())
+
+    def check(p: Path) -> bool:
+        for r in roots:
+            try:
+                rel = p.relative_to(r)
+            except ValueError:
+                continue
+            return in_scope(rel.as_posix()) and test(p)
+        return False
+
+    return check
+
+# ============================================================
+# Regels
+# ============================================================
+
+class SuiteRules:
+    """Alle gecompileerde regelsets plus één gezamenlijke bestands-prefilter."""
+
+    def __init__(self, reports: Sequence[str]):
+        self.rules: Dict[str, Any] = {}
+        if "audit" in reports:
+            self.rules["audit"] = freeze_site_copy.compile_audit_rules()
+        if "funnelcheck" in reports:
+            self.rules["funnelcheck"] = freeze_site_copy.compile_funnel_rules()
+        if "conscious" in reports:
+            self.rules["conscious"] = content_conscious_audit.compile_rules()
+        if "content" in reports:
+            self.rules["content"] = content_audit.compile_rules()
+
+        filters = [
+            (r[0] if isinstance(r, tuple) else r).file_filter.keywords
+            for r in self.rules.values()
+        ]
+        self.file_filter = FilePrefilter(frozenset().union(*filters) if all(filters) else None)
+
+    def scanner(self, report: str, p: Path, rel: str):
+        rules = self.rules[report]
+        if report == "audit":
+            return freeze_site_copy.AuditFileScan(p, rules)
+        if report == "funnelcheck":
+            return freeze_site_copy.FunnelFileScan(rules)
+        if report == "conscious":
+            return content_conscious_audit.FileScan(rel, rules)
+        return content_audit.FileScan(p, rules)
+
+
+def rules_fingerprint(reports: Sequence[str]) -> str:
+    # conscious' fingerprint bevat de hash van alle packs plus z'n eigen regexen.
+    return fingerprint(list(reports), content_conscious_audit.rules_fingerprint())
+
+# ============================================================
+# Scan
+# ============================================================
+
+SuiteItem = Tuple[Path, str, Tuple[str, ...]]
+
+
+def iter_items(root: Path, reports: Sequence[str], changed: ChangedLines | None = None,
+               ignored: AbstractSet[str] | None = None) -> List[SuiteItem]:
+    """(pad, relpad, rapporten) voor elk bestand dat minstens één rapport zou scannen."""
+    if changed is None:
+        # Alleen extensies die een rapport kan willen; de rest van is_candidate per rapport.
+        paths = list(walk_files(root, EXCLUDE_DIRS, INCLUDE_EXT, ignored=ignored))
+    else:
+        paths = []
+        for p in sorted(changed):
+            try:
+                rel = p.relative_to(root)
+            except ValueError:
+                continue
+            if p.is_file() and not any(part in EXCLUDE_DIRS for part in rel.parts[:-1]):
+                paths.append(p)
+
+    tests = [(r, candidate(r, root)) for r in reports]
+    items: List[SuiteItem] = []
+    for p in paths:
+        applies = tuple(r for r, test in tests if test(p))
+        if applies:
+            items.append((p, str(p.relative_to(root)).replace("\\", "/"), applies))
+    return items
+
+
+def scan_file(item: SuiteItem, suite: SuiteRules) -> Optional[Dict[str, Any]]:
+    """Per rapport het resultaat voor één bestand; None = overgeslagen door prefilter."""
+    p, rel, applies = item
+    if not suite.file_filter.could_match(p):
+        return None
+
+    scanners = [(report, suite.scanner(report, p, rel)) for report in applies]
+    try:
+        for i, line in iter_lines(p):
+            for _, scan in scanners:
+                scan.feed(i, line)
+    except Exception:
+        # freeze_site_copy laat leesfouten door; content_audit/conscious slaan het bestand over.
+        if "audit" in applies or "funnelcheck" in applies:
+            raise
+        return {}
+    return {report: scan.result() for report, scan in scanners}
+
+
+def applies_key(item: SuiteItem) -> str:
+    """Welke rapporten op het bestand draaien: bepaalt het resultaat naast de inhoud (content-store)."""
+    return ",".join(item[2])
+
+# ============================================================
+# Rapporten per site
+# ============================================================
+
+class SiteResult:
+    """Hits van één root, verzameld zoals de losse commando's ze rapporteren."""
+
+    def __init__(self, root: Path, changed: ChangedLines | None = None, changed_lines_only: bool = False,
+                 name: str | None = None):
+        self.root = root
+        self.name = name or str(root)
+        self.changed = changed
+        self.changed_lines_only = changed_lines_only
+        self.audit_hits = freeze_site_copy.new_hits(summary=True)
+        self.soft_hits = 0
+        self.hard_hits = 0
+        self.conscious_hits = content_conscious_audit.new_hits()
+        self.cta_files: Dict[str, bool] = {}
+        self.question_files: Dict[str, bool] = {}
+        self.content_hits = content_audit.new_hits()
+        self.code = 0
+
+    def keep(self, p: Path, line_no: int) -> bool:
+        return on_changed_line(self.changed, self.changed_lines_only, p, line_no)
+
+    def add(self, item: SuiteItem, result: Dict[str, Any]) -> None:
+        p, rel, _ = item
+        keep_line = partial(self.keep, p) if self.changed is not None and self.changed_lines_only else None
+        if "audit" in result:
+            self.audit_hits.add(p, result["audit"], keep_line)
+        if "funnelcheck" in result:
+            soft_lines, hard_lines = result["funnelcheck"]
+            self.soft_hits += sum(1 for i in soft_lines if self.keep(p, i))
+            self.hard_hits += sum(1 for i in hard_lines if self.keep(p, i))
+        if "conscious" in result:
+            hits, has_cta, has_questions = result["conscious"]
+            self.conscious_hits.add(rel, hits, keep_line)
+            if has_cta:
+                self.cta_files[rel] = True
+            if has_questions:
+                self.question_files[rel] = True
+        if "content" in result:
+            self.content_hits.add(p, result["content"], keep_line)
+
+    def missing_questions(self) -> List[str]:
+        return sorted(f for f in self.cta_files if f not in self.question_files)
+
+    def print_reports(self, reports: Sequence[str], show: int) -> int:
+        """De rapporten in CI-volgorde; exitcode van het eerste dat faalt."""
+        codes: List[int] = []
+        for report in reports:
+            if report == "audit":
+                codes.append(freeze_site_copy.print_audit(self.root, self.audit_hits))
+            elif report == "funnelcheck":
+                codes.append(freeze_site_copy.print_funnelcheck(self.root, self.soft_hits, self.hard_hits))
+            elif report == "conscious":
+                codes.append(content_conscious_audit.print_report(self.conscious_hits, self.missing_questions(),
+                                                                  show=show))
+            elif report == "content":
+                codes.append(content_audit.print_report([self.root], self.content_hits))
+        self.code = next((c for c in codes if c != 0), 0)
+        return self.code
+
+# ============================================================
+# Batch (meerdere sites)
+# ============================================================
+
+def load_manifest(path: Path) -> List[Tuple[str, Path]]:
+    """
+    (naam, root) per site uit een JSON-manifest:
+
+      {"sites": [{"name": "probrandwacht", "path": "../probrandwacht"},
+                 {"name": "main", "path": "../worktrees/main", "root": "app/(site)"},
+                 "../andere-site/app/(site)"]}
+
+    Relatieve paden gelden vanaf de map van het manifest. Een checkout met
+    app/(site) wordt op die map gescand, tenzij "root" iets anders zegt.
+    """
+    import json
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ValueError(f"{path}: {e}") from None
+    entries = data.get("sites") if isinstance(data, dict) else data
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: geen \"sites\"-lijst")
+
+    sites: List[Tuple[str, Path]] = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"path": entry}
+        if not isinstance(entry, dict) or "path" not in entry:
+            raise ValueError(f"{path}: site zonder \"path\": {entry!r}")
+        base = (path.parent / entry["path"]).resolve()
+        if "root" in entry:
+            root = (base / entry["root"]).resolve()
+        else:
+            root = base / DEFAULT_ROOT if (base / DEFAULT_ROOT).is_dir() else base
+        sites.append((entry.get("name") or entry["path"], root))
+    return sites
+
+
+def scan_sites(sites: List[SiteResult], reports: Sequence[str], items_per_site: List[List[SuiteItem]],
+               cache: Any, jobs: int = 1, stats: ScanStats | None = None,
+               options: ScanOptions | None = None) -> None:
+    """
+    Alle sites in één run_cached_scan: één regelcompilatie per proces en één pool, en de
+    chunks lopen over sitegrenzen heen. Resultaten komen in volgorde terug en worden per
+    site verdeeld.
+    """
+    items = [item for site_items in items_per_site for item in site_items]
+    results = run_cached_scan(scan_file, items, partial(SuiteRules, tuple(reports)), cache,
+                              jobs=jobs, path_of=itemgetter(0), empty=dict, stats=stats, variant_of=applies_key,
+                              options=options)
+    for site, site_items in zip(sites, items_per_site):
+        for item, result in zip(site_items, islice(results, len(site_items))):
+            site.add(item, result)
+
+
+def print_batch_summary(sites: List[SiteResult], reports: Sequence[str]) -> None:
+    columns = [("audit", "audit", lambda s: len(s.audit_hits)),
+               ("funnelcheck", "soft", lambda s: s.soft_hits),
+               ("funnelcheck", "hard", lambda s: s.hard_hits),
+               ("conscious", "conscious", lambda s: len(s.conscious_hits)),
+               ("conscious", "cta-zonder-?", lambda s: len(s.missing_questions())),
+               ("content", "content", lambda s: len(s.content_hits))]
+    columns = [(label, count) for report, label, count in columns if report in reports]
+    width = max([len("totaal")] + [len(s.name) for s in sites])
+
+    print("\n" + "=" * 90)
+    print(f"BATCH: {len(sites)} sites")
+    print("=" * 90)
+    print(f"{'site':<{width}} " + " ".join(f"{label:>12}" for label, _ in columns) + f" {'exit':>5}")
+    totals = [0] * len(columns)
+    for site in sites:
+        counts = [count(site) for _, count in columns]
+        totals = [t + c for t, c in zip(totals, counts)]
+        print(f"{site.name:<{width}} " + " ".join(f"{c:>12}" for c in counts) + f" {site.code:>5}")
+    print(f"{'totaal':<{width}} " + " ".join(f"{t:>12}" for t in totals))
+
+
+def run_batch(args, reports: Sequence[str], options: ScanOptions | None = None) -> int:
+    if options is None:
+        options = scan_options(args)
+    try:
+        manifest = load_manifest(Path(args.manifest))
+    except ValueError as e:
+        print("Manifest ongeldig:", e)
+        return 1
+
+    sites: List[SiteResult] = []
+    items_per_site: List[List[SuiteItem]] = []
+    for name, root in manifest:
+        if not root.exists():
+            print(f"Root bestaat niet ({name}):", root)
+            return 1
+        try:
+            changed = git_scope(args, root)
+        except GitScopeError as e:
+            print(f"git diff mislukt ({name}):", e)
+            return 1
+        blobs = staged_blobs(changed)
+        if blobs is not None:
+            # Paden zijn absoluut: de blobs van alle sites kunnen in één mapping.
+            options.blobs = {**(options.blobs or {}), **blobs}
+        sites.append(SiteResult(root, changed, args.changed_lines_only, name))
+        items_per_site.append(iter_items(root, reports, changed, walk_ignored(args, root) if changed is None else None))
+
+    # Paden zijn absoluut, dus één namespace voor alle sites.
+    cache = open_cache(args, "content_suite:batch", rules_fingerprint(reports))
+    stats = ScanStats()
+    try:
+        scan_sites(sites, reports, items_per_site, cache, args.jobs, stats, options)
+    finally:
+        if cache:
+            cache.close()
+
+    for idx, site in enumerate(sites, 1):
+        print(f"\n{'#' * 90}\n# SITE {idx}/{len(sites)}: {site.name} ({site.root})\n{'#' * 90}")
+        site.print_reports(reports, args.show)
+    print_batch_summary(sites, reports)
+    if args.stats:
+        print(stats.footer())
+    return next((s.code for s in sites if s.code != 0), 0)
+
+# ============================================================
+# Main
+# ============================================================
+
+def main() -> int:
+    ap = argparse.ArgumentParser(formatter_class=HelpFormatter)
+    ap.add_argument("reports", nargs="+", choices=["all", *REPORTS])
+    ap.add_argument("--root", default=DEFAULT_ROOT)
+    ap.add_argument("--manifest", default=None,
+                    help="JSON met meerdere sites/checkouts: alles in één scan, rapport per site plus totaal")
+    ap.add_argument("--show", type=int, default=25, help="conscious: aantal regels per categorie tonen")
+    add_jobs_argument(ap)
+    add_cache_arguments(ap)
+    add_git_arguments(ap)
+    add_stats_argument(ap)
+    add_profile_arguments(ap)
+    args = ap.parse_args()
+    profile = start_profile(args)
+    options = scan_options(args, profile)
+
+    reports = REPORTS if "all" in args.reports else [r for r in REPORTS if r in args.reports]
+
+    if args.manifest:
+        code = run_batch(args, reports, options)
+        finish_profile(profile, args)
+        return code
+
+    root = Path(args.root).resolve()
+    if not root.exists():
+        print("Root bestaat niet:", root)
+        return 1
+
+    try:
+        changed = git_scope(args, root)
+    except GitScopeError as e:
+        print("git diff mislukt:", e)
+        return 1
+
+    options.blobs = staged_blobs(changed)
+    site = SiteResult(root, changed, args.changed_lines_only)
+    items = iter_items(root, reports, changed, walk_ignored(args, root) if changed is None else None)
+    cache = open_cache(args, f"content_suite:{root}", rules_fingerprint(reports))
+    stats = ScanStats()
+    try:
+        scan_sites([site], reports, [items], cache, args.jobs, stats, options)
+    finally:
+        if cache:
+            cache.close()
+
+    code = site.print_reports(reports, args.show)
+    if args.stats:
+        print(stats.footer())
+    finish_profile(profile, args)
+    return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gedeelde bestands-walker voor de content-audits, op os.scandir.
+
+Levert de bestanden in os.walk-volgorde, maar goedkoper dan os.walk + is_candidate:
+  * extensie, ignore-fragmenten en scope worden op de padstring getest vóórdat er een
+    Path of stat() aan te pas komt; de grootte komt uit DirEntry.stat();
+  * mappen in EXCLUDE_DIRS, mappen waarvan het pad al een ignore-fragment bevat
+    (content/blog) en, met --gitignore, door git genegeerde mappen
+    (content_git.gitignored_paths) worden in hun geheel overgeslagen.
+
+De scope (app/(site)) ligt relatief aan de root: root/app/(site), of root/(site) als
+root zelf al …/app is. Een map die daar niet in ligt en er ook niet naartoe leidt,
+wordt niet betreden; een run vanaf de repo-root kost zo bij grote asset-mappen
+(public/img/…) niets extra. Ligt root al in de scope, dan wordt er niet gesnoeid.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import AbstractSet, Callable, Iterable, Iterator, List, Optional, Tuple
+
+_NORMALIZE_SEP = os.sep != "/"
+
+
+def _posix(s: str) -> str:
+    return s.replace("\\", "/") if _NORMALIZE_SEP else s
+
+
+def _scope_dirs(root: str, fragment: str) -> Optional[List[str]]:
+    """
+    Mappen (posix, relatief aan root) waar de scope begint; None als root er al in ligt.
+    fragment = "app/(site)", root = …/site  → ["app/(site)"]
+                                 root = …/app   → ["app/(site)", "(site)"]
+    """
+    head = "/" + _posix(root).strip("/") + "/"
+    if fragment in head:
+        return None
+    parts = fragment.strip("/").split("/")
+    return ["/".join(parts[k:]) for k in range(len(parts))
+            if k == 0 or head.endswith("/" + "/".join(parts[:k]) + "/")]
+
+
+def _in_scope(rel: str, scopes: List[str]) -> Optional[bool]:
+    """True: rel ligt in een scope; False: rel leidt naar een scope; None: snoeien."""
+    for scope in scopes:
+        if rel == scope or rel.startswith(scope + "/"):
+            return True
+    for scope in scopes:
+        if scope.startswith(rel + "/"):
+            return False
+    return None
+
+
+def scope_filter(root: Path, fragment: str) -> Callable[[str], bool]:
+    """Test voor een pad (posix, relatief aan root): ligt het in de scope die walk_files aanhoudt?"""
+    scopes = _scope_dirs(str(root.resolve()), fragment)
+    if scopes is None:
+        return lambda rel: True
+    return lambda rel: _in_scope(rel, scopes) is True
+
+
+def walk_files(root: Path, exclude_dirs: AbstractSet[str], include_ext: Optional[AbstractSet[str]] = None,
+               max_bytes: Optional[int] = None, ignore_fragments: Iterable[str] = (),
+               scope_fragment: Optional[str] = None,
+               ignored: Optional[AbstractSet[str]] = None) -> Iterator[Path]:
+    """
+    Bestanden onder root, in os.walk-volgorde (top-down, bestanden van een map vóór
+    zijn submappen, symlinks naar mappen niet gevolgd).
+
+    include_ext   kleine-letter-extensies (".tsx"); None = alles
+    max_bytes     grotere bestanden (of onleesbare stat) vallen af
+    ignore_fragments / scope_fragment
+                  ignore-fragmenten zoals content_audit.is_ignored op het hele pad; de
+                  scope relatief aan root (zie scope_filter), daarbuiten wordt niet betreden
+    ignored       absolute paden (mappen en bestanden) die overgeslagen worden
+    """
+    fragments = list(ignore_fragments)
+    scopes = _scope_dirs(str(root.resolve()), scope_fragment) if scope_fragment else None
+    prefix = len(str(root)) + 1
+    # (map, al in de scope?) – onder de scope hoeft er niet meer gesnoeid te worden.
+    stack: List[Tuple[str, bool]] = [(str(root), scopes is None)]
+    while stack:
+        top, inside = stack.pop()
+        try:
+            with os.scandir(top) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        subdirs: List[Tuple[str, bool]] = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if is_dir:
+                if entry.name in exclude_dirs:
+                    continue
+                path = entry.path
+                if ignored and path in ignored:
+                    continue
+                # Bevat map + "/" al een ignore-fragment, dan elk bestand eronder ook.
+                if fragments and any(f in _posix(path) + "/" for f in fragments):
+                    continue
+                try:
+                    if entry.is_symlink():
+                        continue
+                except OSError:
+                    pass
+                sub_inside = inside
+                if not inside:
+                    state = _in_scope(_posix(path[prefix:]), scopes)
+                    if state is None:
+                        continue
+                    sub_inside = state
+                subdirs.append((path, sub_inside))
+                continue
+
+            name = entry.name
+            if include_ext is not None and os.path.splitext(name)[1].lower() not in include_ext:
+                continue
+            path = entry.path
+            if not inside:
+                continue
+            if fragments and any(f in _posix(path) for f in fragments):
+                continue
+            if ignored and path in ignored:
+                continue
+            if max_bytes is not None:
+                try:
+                    if entry.stat().st_size > max_bytes:
+                        continue
+                except OSError:
+                    continue
+            yield Path(path)
+
+        stack.extend(reversed(subdirs))
+
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+--watch voor de content-audits: regels en resultaten per bestand blijven in het
+geheugen; na elke save wordt alleen het gewijzigde bestand opnieuw gescand en
+tonen we welke hits erbij kwamen (+) en welke opgelost zijn (-).
+
+Wakker worden gaat via inotify (Linux, via ctypes; geen extra dependency) of,
+als dat niet kan, door elke --watch-interval seconden te pollen. Met inotify komen
+de kandidaten uit de paden in de events: alleen die worden opnieuw gestat. Een
+nieuw bestand, een nieuwe of verplaatste map of een overgelopen event-queue kost
+één volledige walk. Bij pollen worden elke interval alleen de bekende bestanden
+opnieuw gestat en volgt om de paar seconden een walk voor nieuwe bestanden. Wat er
+veranderd is, bepalen we in beide gevallen uit (mtime_ns, size) per bestand.
+"""
+
+from __future__ import annotations
+
+import os
+import select
+import struct
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+
+class WatchHit(NamedTuple):
+    key: Tuple       # identiteit over edits heen (zonder regelnummer)
+    line_no: int
+    text: str        # wat we tonen, zonder pad en regelnummer
+
+
+Snapshot = Dict[Path, Tuple[int, int]]
+
+# Zonder inotify: elke interval een stat per bekend bestand.
+DEFAULT_INTERVAL = 0.5
+
+# ============================================================
+# Wakker worden: inotify of polling
+# ============================================================
+
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF)
+
+
+class Inotify:
+    """
+    Minimale inotify-binding: welke paden in deze mappen zijn veranderd. Nieuwe
+    submappen krijgen meteen zelf een watch, anders zien we bestanden daarin pas bij
+    de volgende volledige walk.
+    """
+
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self) -> None:
+        # ctypes alleen voor --watch; de gewone scan hoeft het niet te laden.
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 faalde")
+        self.watched: Set[str] = set()
+        self.paths: Dict[int, str] = {}
+
+    def watch(self, dirs: Iterable[str]) -> None:
+        for d in dirs:
+            if d in self.watched:
+                continue
+            wd = self._add_watch(self.fd, os.fsencode(d), WATCH_MASK)
+            if wd >= 0:
+                self.watched.add(d)
+                self.paths[wd] = d
+
+    def _watch_tree(self, top: str) -> None:
+        for dirpath, _, _ in os.walk(top):
+            self.watch([dirpath])
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """True als er events klaarstaan (None = wachten tot het zover is); drain() leest ze."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        return bool(ready)
+
+    def drain(self) -> Tuple[Set[str], bool]:
+        """
+        Lees de buffer leeg: (paden van bestanden met een event, opnieuw walken?). Dat
+        laatste bij events op mappen (hun inhoud kwam of ging zonder eigen events) en
+        bij een overgelopen queue.
+        """
+        paths: Set[str] = set()
+        rescan = False
+        new_dirs = []
+        try:
+            while True:
+                buf = os.read(self.fd, 65536)
+                if not buf:
+                    break
+                pos = 0
+                while pos + self.EVENT.size <= len(buf):
+                    wd, mask, _, length = self.EVENT.unpack_from(buf, pos)
+                    pos += self.EVENT.size
+                    name = buf[pos:pos + length].rstrip(b"\0")
+                    pos += length
+                    if mask & IN_Q_OVERFLOW:
+                        rescan = True
+                        continue
+                    top = self.paths.get(wd)
+                    if top is None:
+                        continue
+                    if mask & IN_IGNORED:
+                        # Map weg (of niet meer te volgen): bij terugkomst opnieuw een watch.
+                        self.watched.discard(self.paths.pop(wd))
+                        continue
+                    if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                        continue
+                    path = os.path.join(top, os.fsdecode(name))
+                    if mask & IN_ISDIR:
+                        rescan = True
+                        if mask & (IN_CREATE | IN_MOVED_TO):
+                            new_dirs.append(path)
+                    else:
+                        paths.add(path)
+        except BlockingIOError:
+            pass
+        for d in new_dirs:
+            self._watch_tree(d)
+        return paths, rescan
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def open_inotify() -> Optional[Inotify]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return Inotify()
+    except (OSError, AttributeError):
+        return None
+
+# ============================================================
+# Diff
+# ============================================================
+
+def snapshot(paths: Iterable[Path]) -> Snapshot:
+    snap: Snapshot = {}
+    for p in paths:
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        snap[p] = (st.st_mtime_ns, st.st_size)
+    return snap
+
+
+def diff_hits(old: List[WatchHit], new: List[WatchHit]) -> Tuple[List[WatchHit], List[WatchHit]]:
+    """(erbij, opgelost) als multiset op key; verschoven regels tellen niet als wijziging."""
+    remaining = Counter(h.key for h in old)
+    added = []
+    for h in new:
+        if remaining[h.key]:
+            remaining[h.key] -= 1
+        else:
+            added.append(h)
+    remaining = Counter(h.key for h in new)
+    resolved = []
+    for h in old:
+        if remaining[h.key]:
+            remaining[h.key] -= 1
+        else:
+            resolved.append(h)
+    return added, resolved
+
+# ============================================================
+# Loop
+# ============================================================
+
+def watched_dirs(roots: Sequence[Path], files: Iterable[Path]) -> Set[str]:
+    """Roots plus elke map tussen een root en een gescand bestand."""
+    roots = [r.resolve() for r in roots]
+    dirs: Set[str] = {str(r) for r in roots}
+    for p in files:
+        d = p.parent
+        while str(d) not in dirs and any(d == r or r in d.parents for r in roots):
+            dirs.add(str(d))
+            d = d.parent
+    return dirs
+
+
+def watch_loop(roots: Sequence[Path], list_files: Callable[[], List[Path]],
+               scan: Callable[[Path], List[WatchHit]], display: Callable[[Path], str] = str,
+               interval: float = DEFAULT_INTERVAL, full_every: float = 5.0, out=None) -> int:
+    """
+    Scan alles één keer, en daarna alleen wat verandert, tot Ctrl-C.
+
+    list_files  de normale selectie van het script (walk + scope)
+    scan        hits van één bestand; regels zitten al gecompileerd in de closure
+    full_every  zonder inotify: seconden tussen twee volledige walks
+    """
+    out = out or sys.stdout
+    snap = snapshot(list_files())
+    results: Dict[Path, List[WatchHit]] = {p: scan(p) for p in snap}
+    total = sum(len(h) for h in results.values())
+
+    notify = open_inotify()
+    if notify:
+        notify.watch(watched_dirs(roots, snap))
+    mode = "inotify" if notify else f"polling elke {interval:g}s"
+    print(f"👀 watch ({mode}): {len(snap)} bestanden, {total} hits – Ctrl-C om te stoppen", file=out, flush=True)
+
+    # Event-paden die na een walk niet bij de selectie bleken te horen (swap-bestanden e.d.).
+    rejected: Set[Path] = set()
+    last_full = time.monotonic()
+    try:
+        while True:
+            if notify:
+                notify.wait(None)
+                time.sleep(0.02)   # editors schrijven vaak in meerdere stappen
+                paths, rescan = notify.drain()
+                known = set()
+                unknown = []
+                for s in paths:
+                    p = Path(s)
+                    if p in snap:
+                        known.add(p)
+                    elif p not in rejected and os.path.isfile(s):
+                        # Nieuw bestand: of het meedoet, weet alleen de selectie van het script.
+                        unknown.append(p)
+                rescan = rescan or bool(unknown)
+            else:
+                time.sleep(interval)
+                rescan = time.monotonic() - last_full >= full_every
+                known = snap.keys()
+
+            if rescan:
+                last_full = time.monotonic()
+                current = snapshot(list_files())
+                if notify:
+                    rejected = {p for p in unknown if p not in current}
+                    notify.watch(watched_dirs(roots, current))
+                changed = sorted(p for p, sig in current.items() if snap.get(p) != sig)
+                removed = sorted(p for p in snap if p not in current)
+                snap = current
+            else:
+                fresh = snapshot(known)
+                changed = sorted(p for p, sig in fresh.items() if snap[p] != sig)
+                removed = sorted(p for p in known if p not in fresh)
+                snap.update(fresh)
+                for p in removed:
+                    del snap[p]
+            if not changed and not removed:
+                continue
+
+            t0 = time.perf_counter()
+            stamp = time.strftime("%H:%M:%S")
+            for p in changed + removed:
+                old = results.get(p, [])
+                new = scan(p) if p in snap else []
+                if new:
+                    results[p] = new
+                else:
+                    results.pop(p, None)
+                added, resolved = diff_hits(old, new)
+                if not added and not resolved:
+                    continue
+                print(f"[{stamp}] {display(p)}", file=out)
+                for sign, hits in (("-", resolved), ("+", added)):
+                    for h in hits:
+                        where = f"{h.line_no}: " if h.line_no else ""
+                        print(f"  {sign} {where}{h.text}", file=out)
+            total = sum(len(h) for h in results.values())
+            ms = (time.perf_counter() - t0) * 1000
+            print(f"  ({len(changed) + len(removed)} bestand(en) in {ms:.0f} ms; totaal {total} hits)",
+                  file=out, flush=True)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        if notify:
+            notify.close()
+
+
+def add_watch_arguments(parser) -> None:
+    g = parser.add_argument_group("watch")
+    g.add_argument("--watch", action="store_true",
+                   help="blijf draaien en scan alleen gewijzigde bestanden opnieuw (Ctrl-C stopt)")
+    g.add_argument("--watch-interval", type=float, default=DEFAULT_INTERVAL, metavar="SEC",
+                   help="poll-interval zonder inotify (alleen bekende bestanden; nieuwe om de paar seconden)")
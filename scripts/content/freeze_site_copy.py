@@ -4,12 +4,20 @@
 from __future__ import annotations
 
 import argparse
-import os
-import re
-import shutil
-from dataclasses import dataclass
+import sys
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import AbstractSet, Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+from content_cache import ScanCache, add_cache_arguments, fingerprint, open_cache, run_cached_scan
+from content_git import ChangedLines, GitScopeError, add_git_arguments, git_scope, on_changed_line, select_changed, staged_blobs, walk_ignored
+from content_profile import add_profile_arguments, finish_profile, start_profile
+from content_report import HitStream, add_format_argument, stats_out
+from content_rewrite import Rewriter, rewrite_file, rule_label, unchanged
+from content_rules import rule_pack
+from content_scan import FileHits, HelpFormatter, HitList, RuleSet, ScanOptions, ScanStats, add_jobs_argument, add_stats_argument, add_visible_argument, iter_lines, rule_labels, scan_context, scan_options
+from content_walk import walk_files
+from content_watch import DEFAULT_INTERVAL, WatchHit, add_watch_arguments, watch_loop
 
 # ============================================================
 # Config
@@ -25,159 +33,152 @@ EXCLUDE_DIRS = {
 MAX_FILE_SIZE_MB = 3
 
 # ============================================================
-# Audit patterns (gesplitst voor rust)
+# Regels: rules/site-copy.json (regelsets freeze_audit, funnel_soft/funnel_hard,
+# apply en soften; zie content_rules)
 # ============================================================
 
-PATTERNS: Dict[str, List[str]] = {
-    "ProSafetyMatch CTA / funnel": [
-        r"meld\s+je\s+gratis\s+aan\s+voor\s+prosafetymatch",
-        r"bouw\s+mee\s+aan\s+prosafetymatch",
-        r"blijf\s+op\s+de\s+hoogte\s+van\s+prosafetymatch",
-        r"interesselijst\s+voor\s+prosafetymatch",
-        r"wachtlijst\s+voor\s+prosafetymatch",
-    ],
-    "ProSafetyMatch feature-claim (moet SOFT)": [
-        r"\bprosafetymatch\b.*\b(bundelt|helpt|automatiseert|regelt|levert|brengt)\b",
-        r"\bzo\s+kan\s+samenwerking\s+via\s+prosafetymatch\b",
-        r"\bkun\s+je\s+straks\b.*\bprosafetymatch\b",
-    ],
-    "ProSafetyMatch merkvermelding (oké)": [
-        r"\bprosafetymatch\b",
-    ],
-    "Harde DBA / juridische claim": [
-        r"\bDBA[-\s]?proof\b",
-        r"\b100%\s+DBA\b",
-        r"\bgarandeer(t)?\b",
-        r"\bgeen\s+enkel\s+risico\b",
-    ],
-    "Arbeidsrelatie / gezag-framing": [
-        r"\bgezag\b",
-    ],
-    "Exclusiviteit / druk": [
-        r"\balleen\s+via\b|\buitsluitend\s+via\b",
-        r"\bniet\s+meer\s+welkom\b",
-    ],
-}
+RULES = rule_pack()
 
-# ============================================================
-# Funnelcheck (SOFT vs HARD)
-# ============================================================
+# Audit patterns (gesplitst voor rust)
+PATTERNS: Dict[str, List[str]] = RULES.categories("freeze_audit")
+LABELS = rule_labels(PATTERNS)
 
-SOFT_FUNNEL_PATTERNS = [
-    r"\bin\s+ontwikkeling\b",
-    r"\bconcept\b",
-    r"\bkan\b|\bkunnen\b|\bstraks\b",
-    r"\bblijf\s+op\s+de\s+hoogte\b",
-    r"\binteresselijst\b|\bwachtlijst\b",
-]
-
-HARD_FUNNEL_PATTERNS = [
-    r"\bvoorloper\b|\bfundament\b",
-    r"\bbouw\s+mee\b",
-    r"\bzo\s+werkt\s+prosafetymatch\b",
-    r"\bprosafetymatch\b.*\b(levert|regelt|doet)\b",
-    r"\bDBA[-\s]?proof\b",
-]
+# Categorieën die het tekstrapport alleen telt.
+SUMMARY_CATEGORY = "merkvermelding"
+SUMMARY_IDS = frozenset(i for i, (cat, _) in enumerate(LABELS) if SUMMARY_CATEGORY in cat.lower())
 
-# ============================================================
-# Apply – terminologie (ronde 1)
-# ============================================================
+# Funnelcheck (SOFT vs HARD)
+SOFT_FUNNEL_PATTERNS: List[str] = RULES.patterns("funnel_soft")
+HARD_FUNNEL_PATTERNS: List[str] = RULES.patterns("funnel_hard")
 
-REPLACEMENTS: List[Tuple[str, str]] = [
-    (r"\bDBA[-\s]?proof\b", "DBA-bewust"),
-    (r"\bgezag\b", "rolverdeling"),
-    (r"privacy@prosafetymatch\.nl", "privacy@probrandwacht.nl"),
-    (r"info@prosafetymatch\.nl", "info@probrandwacht.nl"),
-]
+# Apply – terminologie (ronde 1)
+REPLACEMENTS: List[Tuple[str, str]] = RULES.replacements("apply")
 
-# ============================================================
 # Soften – ALLE rondes gecombineerd
-# ============================================================
-
-SOFTENER_RULES: List[Tuple[str, str]] = [
-    # positionering
-    (r"(?i)\bvoorloper\s+van\s+ProSafetyMatch\b",
-     "basis voor een initiatief in ontwikkeling"),
-    (r"(?i)\bfundament\s+voor\s+ProSafetyMatch\b",
-     "aansluiting op een initiatief in ontwikkeling"),
-
-    # CTA verzachten
-    (r"(?i)\bBouw\s+mee\s+aan\s+ProSafetyMatch\b",
-     "Blijf op de hoogte van ProSafetyMatch"),
-
-    # feature claims → concept
-    (r"(?i)\bProSafetyMatch\s+helpt\s+je\b",
-     "ProSafetyMatch is in ontwikkeling om te helpen"),
-    (r"(?i)\bProSafetyMatch\s+bundelt\b",
-     "ProSafetyMatch is in ontwikkeling om te bundelen"),
-    (r"(?i)\bZo\s+ziet\s+een\s+samenwerking\s+via\s+ProSafetyMatch\s+eruit\b",
-     "Zo kan samenwerking via ProSafetyMatch eruitzien (concept in ontwikkeling)"),
-    (r"(?i)\bVia\s+ProSafetyMatch\s+kom\s+je\s+rechtstreeks\s+met\s+elkaar\s+in\s+contact\b",
-     "Via ProSafetyMatch kun je straks rechtstreeks met elkaar in contact komen (concept in ontwikkeling)"),
-
-    # spoed-funnel
-    (r"(?i)\bDeze\s+spoed-funnel\s+is\s+een\s+vroege\s+voorloper\s+van\s+de\s+directe\s+opdrachtmatching\s+in\s+ProSafetyMatch\b",
-     "Deze spoed-funnel verkent hoe directe aanvragen kunnen werken; ProSafetyMatch is daarbij een concept in ontwikkeling"),
-
-    # metadata hype
-    (r"(?i)\bVoorproef\s+van\s+ProSafetyMatch\b",
-     "Concept van ProSafetyMatch (in ontwikkeling)"),
-    (r"(?i)\bclaimen\b", "aanvragen"),
-]
+SOFTENER_RULES: List[Tuple[str, str]] = RULES.replacements("soften")
 
 # ============================================================
 # Data classes
 # ============================================================
 
-@dataclass
-class Hit:
+class Hit(NamedTuple):
     category: str
     path: Path
     line_no: int
     line: str
 
-@dataclass
-class FunnelHit:
+class FunnelHit(NamedTuple):
     level: str
     path: Path
     line_no: int
     line: str
 
+def make_hit(category: str, pattern: str, path: Path, line_no: int, line: str) -> Hit:
+    return Hit(category, path, line_no, line)
+
+def new_hits(summary: bool = False) -> HitList:
+    # summary: voor print_audit; de merkvermeldingen worden dan alleen geteld.
+    return HitList(LABELS, make_hit, SUMMARY_IDS if summary else frozenset())
+
 # ============================================================
 # Helpers
 # ============================================================
 
-def iter_files(root: Path) -> Iterable[Path]:
-    for dirpath, dirnames, filenames in os.walk(root):
-        dirnames[:] = [d for d in dirnames if d not in EXCLUDE_DIRS]
-        for fn in filenames:
-            p = Path(dirpath) / fn
-            if p.suffix.lower() not in INCLUDE_EXT:
-                continue
-            try:
-                if p.stat().st_size > MAX_FILE_SIZE_MB * 1024 * 1024:
-                    continue
-            except OSError:
-                continue
-            yield p
+def is_candidate(p: Path) -> bool:
+    if p.suffix.lower() not in INCLUDE_EXT:
+        return False
+    try:
+        if p.stat().st_size > MAX_FILE_SIZE_MB * 1024 * 1024:
+            return False
+    except OSError:
+        return False
+    return True
+
+def iter_files(root: Path, ignored: AbstractSet[str] | None = None) -> Iterable[Path]:
+    return walk_files(root, EXCLUDE_DIRS, INCLUDE_EXT, MAX_FILE_SIZE_MB * 1024 * 1024, ignored=ignored)
+
+def select_files(root: Path, changed: ChangedLines | None = None,
+                 ignored: AbstractSet[str] | None = None) -> Iterable[Path]:
+    """Volledige walk (zonder --gitignore-paden), of alleen de gewijzigde bestanden bij --changed-since/--staged."""
+    if changed is None:
+        return iter_files(root, ignored)
+    return select_changed(changed, [root], EXCLUDE_DIRS, is_candidate)
 
 # ============================================================
 # Audit
 # ============================================================
 
-def audit(root: Path) -> List[Hit]:
-    compiled = [(cat, re.compile(p, re.I)) for cat, pats in PATTERNS.items() for p in pats]
-    hits: List[Hit] = []
-    for p in iter_files(root):
-        text = p.read_text(encoding="utf-8", errors="ignore")
-        for i, line in enumerate(text.splitlines(), 1):
-            for cat, creg in compiled:
-                if creg.search(line):
-                    hits.append(Hit(cat, p, i, line.strip()))
+@lru_cache(maxsize=None)
+def compile_audit_rules() -> RuleSet:
+    # Eén keer per proces; de daemon (content_daemon) houdt ze zo warm.
+    return RuleSet.from_mapping(PATTERNS, flags=RULES.flags("freeze_audit"))
+
+def rules_fingerprint(cmd: str) -> str:
+    # De hash van alle packs: flags en shared patronen bepalen het resultaat ook.
+    return fingerprint(RULES.hash, cmd)
+
+class AuditFileScan:
+    """Per-regel audit van één bestand; ook gevoed door content_suite."""
+
+    def __init__(self, p: Path, rules: RuleSet):
+        self.path = p
+        self.rules = rules
+        self.hits = FileHits()
+
+    def feed(self, i: int, line: str) -> None:
+        ids = self.rules.match_ids(line)
+        if ids:
+            self.hits.add(ids, i, line.strip())
+
+    def result(self) -> FileHits:
+        return self.hits
+
+def audit_file(p: Path, rules: RuleSet) -> FileHits | None:
+    if not rules.could_match_file(p):
+        return None
+    scan = AuditFileScan(p, rules)
+    for i, line in iter_lines(p):
+        scan.feed(i, line)
+    return scan.result()
+
+def audit(root: Path, jobs: int = 1, cache: ScanCache | None = None,
+          changed: ChangedLines | None = None, changed_lines_only: bool = False,
+          stats: ScanStats | None = None, ignored: AbstractSet[str] | None = None,
+          on_hit: Callable[[Hit], None] | None = None, options: ScanOptions | None = None,
+          summary: bool = False) -> HitList:
+    """
+    Alle hits onder root; met on_hit gaat elke hit direct daarheen en blijft de lijst leeg.
+    Met summary telt de lijst de merkvermeldingen alleen (zie new_hits).
+    """
+    hits = new_hits(summary)
+    files = list(select_files(root, changed, ignored))
+    results = run_cached_scan(audit_file, files, compile_audit_rules, cache, jobs=jobs, empty=FileHits,
+                              stats=stats, options=options)
+    for p, file_hits in zip(files, results):
+        keep = partial(on_changed_line, changed, True, p) if changed is not None and changed_lines_only else None
+        if on_hit is None:
+            hits.add(p, file_hits, keep)
+        else:
+            for h in hits.each(p, file_hits, keep):
+                on_hit(h)
     return hits
 
-def command_audit(root: Path) -> int:
-    hits = audit(root)
+def command_audit(root: Path, jobs: int = 1, cache: ScanCache | None = None,
+                  changed: ChangedLines | None = None, changed_lines_only: bool = False,
+                  stats: ScanStats | None = None, fmt: str = "text",
+                  ignored: AbstractSet[str] | None = None, options: ScanOptions | None = None) -> int:
+    if fmt == "text":
+        return print_audit(root, audit(root, jobs, cache, changed, changed_lines_only, stats, ignored,
+                                       options=options, summary=True))
+
+    stream = HitStream(fmt, "freeze_site_copy audit", PATTERNS)
+    audit(root, jobs, cache, changed, changed_lines_only, stats, ignored,
+          on_hit=lambda h: stream.hit(h.category, h.path, h.line_no, h.line), options=options)
+    code = 2 if stream.total else 0
+    stream.close(code, root=str(root))
+    return code
+
+def print_audit(root: Path, hits: HitList) -> int:
     print("=" * 90)
     print("AUDIT:", root)
     print("=" * 90)
@@ -186,13 +187,10 @@ def command_audit(root: Path) -> int:
         print("✅ Geen hits")
         return 0
 
-    grouped: Dict[str, List[Hit]] = {}
-    for h in hits:
-        grouped.setdefault(h.category, []).append(h)
-
-    for cat, bucket in grouped.items():
+    for cat, bucket in hits.by_category().items():
         print(f"\n[{cat}] {len(bucket)} hits")
-        if "merkvermelding" in cat.lower():
+        if SUMMARY_CATEGORY in cat.lower():
+            # Alleen geteld: van deze categorie zijn (met new_hits(summary=True)) geen regels bewaard.
             print("(samenvatting – details verborgen)")
             continue
         for h in bucket[:50]:
@@ -205,54 +203,165 @@ def command_audit(root: Path) -> int:
 # Apply (terminologie)
 # ============================================================
 
-def command_apply(root: Path, dry_run: bool) -> int:
-    for p in iter_files(root):
-        text = p.read_text(encoding="utf-8", errors="ignore")
-        new = text
-        for pat, repl in REPLACEMENTS:
-            new = re.sub(pat, repl, new, flags=re.I)
-        if new != text:
-            print(f"🛠 {p.relative_to(root)}")
-            if not dry_run:
-                shutil.copy2(p, p.with_suffix(p.suffix + ".bak"))
-                p.write_text(new, encoding="utf-8")
-    return 0
+@lru_cache(maxsize=None)
+def compile_apply_rules() -> Rewriter:
+    return Rewriter(REPLACEMENTS, RULES.flags("apply"))
+
+def command_apply(root: Path, dry_run: bool, changed: ChangedLines | None = None, jobs: int = 1,
+                  preview: str | None = None, ignored: AbstractSet[str] | None = None,
+                  options: ScanOptions | None = None, stats: ScanStats | None = None) -> int:
+    return run_rewrite(root, compile_apply_rules, REPLACEMENTS, ".bak", "🛠", dry_run, changed, jobs, preview,
+                       ignored, options=options, stats=stats)
 
 # ============================================================
 # Soften
 # ============================================================
 
-def command_soften(root: Path, dry_run: bool) -> int:
-    for p in iter_files(root):
-        text = p.read_text(encoding="utf-8", errors="ignore")
-        new = text
-        for pat, repl in SOFTENER_RULES:
-            new = re.sub(pat, repl, new)
-        if new != text:
-            print(f"🪶 {p.relative_to(root)}")
-            if not dry_run:
-                shutil.copy2(p, p.with_suffix(p.suffix + ".bak2"))
-                p.write_text(new, encoding="utf-8")
-    return 0
+@lru_cache(maxsize=None)
+def compile_soften_rules() -> Rewriter:
+    return Rewriter(SOFTENER_RULES, RULES.flags("soften"))
+
+def command_soften(root: Path, dry_run: bool, changed: ChangedLines | None = None, jobs: int = 1,
+                   preview: str | None = None, ignored: AbstractSet[str] | None = None,
+                   cache: ScanCache | None = None, options: ScanOptions | None = None,
+                   stats: ScanStats | None = None) -> int:
+    return run_rewrite(root, compile_soften_rules, SOFTENER_RULES, ".bak2", "🪶", dry_run, changed, jobs, preview,
+                       ignored, cache, options, stats)
 
 # ============================================================
-# Funnelcheck
+# Herschrijven + preview
 # ============================================================
 
-def command_funnelcheck(root: Path) -> int:
-    soft = [re.compile(p, re.I) for p in SOFT_FUNNEL_PATTERNS]
-    hard = [re.compile(p, re.I) for p in HARD_FUNNEL_PATTERNS]
+def run_rewrite(root: Path, setup, rules: List[Tuple[str, str]], backup_suffix: str, icon: str,
+                dry_run: bool, changed: ChangedLines | None = None, jobs: int = 1,
+                preview: str | None = None, ignored: AbstractSet[str] | None = None,
+                cache: ScanCache | None = None, options: ScanOptions | None = None,
+                stats: ScanStats | None = None) -> int:
+    """
+    apply/soften: één pass per bestand; preview en tellingen per regel uit dezelfde edits.
+    Een cache (per preview-vorm) alleen bij dry_run: bij schrijven moet elk bestand erdoor.
+    """
+    files = list(select_files(root, changed, ignored))
+    scan = partial(rewrite_file, backup_suffix=backup_suffix, dry_run=dry_run, preview=preview, root=root)
+    totals: Dict[int, int] = {}
+    patches = []
+    results = run_cached_scan(scan, files, setup, cache if dry_run else None, jobs=jobs, empty=unchanged,
+                              stats=stats, options=options)
+    for p, result in zip(files, results):
+        if not result.changed:
+            continue
+        for idx, n in result.counts.items():
+            totals[idx] = totals.get(idx, 0) + n
+        rel = str(p.relative_to(root)).replace("\\", "/")
+        if preview == "json":
+            patches.append({"file": rel, "changes": result.preview})
+            continue
+        print(f"{icon} {rel}")
+        if preview == "diff":
+            print(result.preview, end="")
+
+    if preview == "json":
+        import json
+
+        print(json.dumps({
+            "dry_run": dry_run,
+            "files": patches,
+            "rules": [{"rule": rule_label(idx), "pattern": rules[idx][0], "replacement": rules[idx][1],
+                       "count": totals[idx]} for idx in sorted(totals)],
+        }, ensure_ascii=False, indent=2))
+    elif preview == "diff":
+        print_rule_counts(rules, totals)
+    return 0
 
-    soft_hits = 0
-    hard_hits = 0
+def print_rule_counts(rules: List[Tuple[str, str]], totals: Dict[int, int]) -> None:
+    print("\n=== Vervangingen per regel ===")
+    if not totals:
+        print("(geen)")
+        return
+    for idx in sorted(totals):
+        pat, repl = rules[idx]
+        print(f"{rule_label(idx):>4} {totals[idx]:>5}×  {pat}  →  {repl!r}")
+    print(f"totaal: {sum(totals.values())}")
 
-    for p in iter_files(root):
-        for i, line in enumerate(p.read_text(encoding="utf-8", errors="ignore").splitlines(), 1):
-            if any(r.search(line) for r in soft):
-                soft_hits += 1
-            if any(r.search(line) for r in hard):
-                hard_hits += 1
+# ============================================================
+# Funnelcheck
+# ============================================================
 
+@lru_cache(maxsize=None)
+def compile_funnel_rules() -> Tuple[RuleSet, RuleSet]:
+    # De bestands-prefilter van soft dekt ook de HARD-patronen.
+    soft = RuleSet((("SOFT", p) for p in SOFT_FUNNEL_PATTERNS), RULES.flags("funnel_soft"),
+                   prefilter_extra=HARD_FUNNEL_PATTERNS)
+    hard = RuleSet((("HARD", p) for p in HARD_FUNNEL_PATTERNS), RULES.flags("funnel_hard"))
+    return soft, hard
+
+def empty_funnel_result() -> Tuple[List[int], List[int]]:
+    return [], []
+
+class FunnelFileScan:
+    """Regelnummers met een SOFT- resp. HARD-hit; ook gevoed door content_suite."""
+
+    def __init__(self, rules: Tuple[RuleSet, RuleSet]):
+        self.soft, self.hard = rules
+        self.soft_lines: List[int] = []
+        self.hard_lines: List[int] = []
+
+    def feed(self, i: int, line: str) -> None:
+        if self.soft.any(line):
+            self.soft_lines.append(i)
+        if self.hard.any(line):
+            self.hard_lines.append(i)
+
+    def result(self) -> Tuple[List[int], List[int]]:
+        return self.soft_lines, self.hard_lines
+
+def funnel_file(p: Path, rules: Tuple[RuleSet, RuleSet]) -> Tuple[List[int], List[int]] | None:
+    """Regelnummers met een SOFT- resp. HARD-hit (None = overgeslagen door prefilter)."""
+    if not rules[0].could_match_file(p):
+        return None
+    scan = FunnelFileScan(rules)
+    for i, line in iter_lines(p):
+        scan.feed(i, line)
+    return scan.result()
+
+def funnelcheck(root: Path, jobs: int = 1, cache: ScanCache | None = None,
+                changed: ChangedLines | None = None, changed_lines_only: bool = False,
+                stats: ScanStats | None = None, ignored: AbstractSet[str] | None = None,
+                on_hit: Callable[[str, Path, int], None] | None = None,
+                options: ScanOptions | None = None) -> Dict[str, List[Tuple[Path, int]]]:
+    """
+    (pad, regelnummer) per niveau ("SOFT", "HARD"). Met on_hit gaat elke hit direct
+    daarheen (streamen) en blijven de teruggegeven lijsten leeg.
+    """
+    found: Dict[str, List[Tuple[Path, int]]] = {"SOFT": [], "HARD": []}
+    emit = on_hit or (lambda level, p, i: found[level].append((p, i)))
+
+    files = list(select_files(root, changed, ignored))
+    results = run_cached_scan(funnel_file, files, compile_funnel_rules, cache, jobs=jobs,
+                              empty=empty_funnel_result, stats=stats, options=options)
+    for p, (soft_lines, hard_lines) in zip(files, results):
+        for level, lines in (("SOFT", soft_lines), ("HARD", hard_lines)):
+            for i in lines:
+                if on_changed_line(changed, changed_lines_only, p, i):
+                    emit(level, p, i)
+    return found
+
+def command_funnelcheck(root: Path, jobs: int = 1, cache: ScanCache | None = None,
+                        changed: ChangedLines | None = None, changed_lines_only: bool = False,
+                        stats: ScanStats | None = None, fmt: str = "text",
+                        ignored: AbstractSet[str] | None = None, options: ScanOptions | None = None) -> int:
+    if fmt == "text":
+        found = funnelcheck(root, jobs, cache, changed, changed_lines_only, stats, ignored, options=options)
+        return print_funnelcheck(root, len(found["SOFT"]), len(found["HARD"]))
+
+    stream = HitStream(fmt, "freeze_site_copy funnelcheck", ["SOFT", "HARD"],
+                       level_of=lambda level: "error" if level == "HARD" else "note")
+    funnelcheck(root, jobs, cache, changed, changed_lines_only, stats, ignored, on_hit=stream.hit, options=options)
+    code = 0 if stream.counts.get("HARD", 0) == 0 else 3
+    stream.close(code, root=str(root))
+    return code
+
+def print_funnelcheck(root: Path, soft_hits: int, hard_hits: int) -> int:
     print("=" * 90)
     print("FUNNELCHECK:", root)
     print("=" * 90)
@@ -260,32 +369,114 @@ def command_funnelcheck(root: Path) -> int:
     print(f"HARD hits: {hard_hits}")
     return 0 if hard_hits == 0 else 3
 
+# ============================================================
+# Watch
+# ============================================================
+
+def watch_audit_hits(p: Path, rules: RuleSet) -> List[WatchHit]:
+    return [WatchHit((h.category, h.line), h.line_no, f"[{h.category}] {h.line}")
+            for h in HitList(rules.labels, make_hit).each(p, audit_file(p, rules))]
+
+def watch_funnel_hits(p: Path, rules: Tuple[RuleSet, RuleSet]) -> List[WatchHit]:
+    # funnel_file levert alleen regelnummers; die zijn dus ook de sleutel.
+    soft_lines, hard_lines = funnel_file(p, rules) or empty_funnel_result()
+    return ([WatchHit(("SOFT", i), i, "SOFT") for i in soft_lines]
+            + [WatchHit(("HARD", i), i, "HARD") for i in hard_lines])
+
+def command_watch(root: Path, cmd: str, ignored: AbstractSet[str] | None = None, interval: float = DEFAULT_INTERVAL,
+                  options: ScanOptions | None = None) -> int:
+    with scan_context(options):
+        if cmd == "audit":
+            rules = compile_audit_rules()
+            scan = lambda p: watch_audit_hits(p, rules)
+        else:
+            funnel_rules = compile_funnel_rules()
+            scan = lambda p: watch_funnel_hits(p, funnel_rules)
+        return watch_loop([root], lambda: list(iter_files(root, ignored)), scan,
+                          display=lambda p: str(p.relative_to(root)), interval=interval)
+
 # ============================================================
 # Main
 # ============================================================
 
 def main() -> int:
-    parser = argparse.ArgumentParser()
+    parser = argparse.ArgumentParser(formatter_class=HelpFormatter)
     parser.add_argument("cmd", choices=["audit", "apply", "soften", "funnelcheck"])
     parser.add_argument("--root", default=DEFAULT_ROOT)
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--preview", choices=["diff", "json"], default=None,
+                        help="apply/soften: unified diff of JSON-patchlijst met de regel per wijziging")
+    add_jobs_argument(parser)
+    add_visible_argument(parser)
+    add_cache_arguments(parser)
+    add_git_arguments(parser)
+    add_stats_argument(parser)
+    add_format_argument(parser)
+    add_profile_arguments(parser)
+    add_watch_arguments(parser)
     args = parser.parse_args()
+    if args.watch and args.cmd in ("apply", "soften"):
+        # Herschrijven bij elke wijziging zou je eigen bewerkingen overschrijven.
+        parser.error(f"--watch kan niet met {args.cmd}; alleen met audit of funnelcheck")
+    if (args.profile or args.profile_json) and args.cmd in ("apply", "soften"):
+        # Het profiel meet RuleSet-patronen en iter_lines; de Rewriter gebruikt geen van beide.
+        parser.error(f"--profile/--profile-json kan niet met {args.cmd}; alleen met audit of funnelcheck")
+    if args.format != "text" and args.cmd in ("apply", "soften"):
+        # Machine-leesbare uitvoer van een herschrijving is de patchlijst van --preview json.
+        parser.error(f"--format {args.format} kan niet met {args.cmd}; gebruik --preview json")
+    profile = start_profile(args)
+    options = scan_options(args, profile)
 
     root = Path(args.root).resolve()
     if not root.exists():
         print("Root bestaat niet:", root)
         return 1
 
+    try:
+        changed = git_scope(args, root)
+    except GitScopeError as e:
+        print("git diff mislukt:", e)
+        return 1
+
+    ignored = walk_ignored(args, root) if changed is None else None
+
+    if args.watch:
+        return command_watch(root, args.cmd, ignored, args.watch_interval, options)
+
+    stats = ScanStats()
+    if args.cmd in ("apply", "soften"):
+        rewrite = command_apply if args.cmd == "apply" else command_soften
+        code = rewrite(root, args.dry_run, changed, args.jobs, args.preview, ignored, options=options, stats=stats)
+        if args.stats:
+            # Naast een JSON-patchlijst op stdout gaat de footer naar stderr.
+            print(stats.footer(), file=sys.stderr if args.preview == "json" else sys.stdout)
+        return code
+
+    # apply/soften schrijven de werkboom en lezen die dus ook; de checks lezen bij --staged de index.
+    options.blobs = staged_blobs(changed)
     if args.cmd == "audit":
-        return command_audit(root)
-    if args.cmd == "apply":
-        return command_apply(root, args.dry_run)
-    if args.cmd == "soften":
-        return command_soften(root, args.dry_run)
-    if args.cmd == "funnelcheck":
-        return command_funnelcheck(root)
+        cache = open_cache(args, "freeze_site_copy:audit", rules_fingerprint("audit"))
+        try:
+            code = command_audit(root, args.jobs, cache, changed, args.changed_lines_only, stats, args.format,
+                                 ignored, options)
+        finally:
+            if cache:
+                cache.close()
+    elif args.cmd == "funnelcheck":
+        cache = open_cache(args, "freeze_site_copy:funnelcheck", rules_fingerprint("funnelcheck"))
+        try:
+            code = command_funnelcheck(root, args.jobs, cache, changed, args.changed_lines_only, stats,
+                                       args.format, ignored, options)
+        finally:
+            if cache:
+                cache.close()
+    else:
+        return 0
 
-    return 0
+    if args.stats:
+        print(stats.footer(), file=stats_out(args.format))
+    finish_profile(profile, args, stats_out(args.format))
+    return code
 
 if __name__ == "__main__":
     raise SystemExit(main())
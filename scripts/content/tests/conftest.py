@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""De scripts importeren elkaar als top-level modules: scripts/content op sys.path."""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""run_cached_scan: resultaten in invoervolgorde, en zodra ze klaar zijn."""
+
+from content_cache import MemoryCache, run_cached_scan
+from content_scan import ScanStats
+
+scanned = []
+
+
+def scan(path, state):
+    scanned.append(path)
+    return [path.read_text(encoding="utf-8")]
+
+
+def test_streams_in_order(tmp_path):
+    paths = []
+    for i in range(200):
+        p = tmp_path / f"{i:03}.md"
+        p.write_text(f"regel {i}\n", encoding="utf-8")
+        paths.append(p)
+    cache = MemoryCache()
+    for p in paths[::3]:
+        cache.put(p, [f"cache {p.name}"])
+
+    scanned.clear()
+    stats = ScanStats()
+    results = run_cached_scan(scan, iter(paths), lambda: None, cache, stats=stats)
+    assert next(results) == ["cache 000.md"]
+    assert next(results) == ["regel 1\n"]
+    assert len(scanned) < len(paths) // 2
+    rest = list(results)
+    assert len(rest) == len(paths) - 2
+    assert all(r == ([f"cache {p.name}"] if i % 3 == 0 else [f"regel {i}\n"])
+               for i, (p, r) in enumerate(zip(paths[2:], rest), start=2))
+    assert len(scanned) == len(paths) - len(paths[::3])
+    assert (stats.files, stats.cached) == (len(paths), len(paths[::3]))
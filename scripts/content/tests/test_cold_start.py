@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Koude start: de audits laden sqlite3, subprocess en json niet op het standaardpad."""
+
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from content_rules import Artifact, RulePack, pack_paths
+
+SCRIPTS = Path(__file__).resolve().parents[1]
+
+ENTRY_POINTS = [
+    ["content_audit.py", "."],
+    ["content_conscious_audit.py"],
+    ["freeze_site_copy.py", "audit"],
+    ["freeze_site_copy.py", "funnelcheck"],
+    ["content_suite.py", "all"],
+]
+
+HEAVY = {"sqlite3", "subprocess", "json"}
+
+_IMPORT_RE = re.compile(r"^import time:\s+\d+ \|\s+\d+ \|\s*(\S+)$", re.M)
+
+
+@pytest.fixture(scope="module")
+def checkout(tmp_path_factory):
+    """Kopie van scripts/content met een actueel rule-artefact, plus een kleine site."""
+    root = tmp_path_factory.mktemp("repo")
+    scripts = root / "scripts" / "content"
+    shutil.copytree(SCRIPTS, scripts, ignore=shutil.ignore_patterns("__pycache__", "tests"))
+    subprocess.run([sys.executable, str(scripts / "content_rules.py")], cwd=root, check=True,
+                   capture_output=True)
+    page = root / "app" / "(site)" / "zzp" / "page.tsx"
+    page.parent.mkdir(parents=True)
+    page.write_text("<p>Jij kiest je tarief, zonder risico.</p>\n", encoding="utf-8")
+    return root
+
+
+def imported(checkout, argv):
+    proc = subprocess.run([sys.executable, "-X", "importtime", str(checkout / "scripts" / "content" / argv[0]),
+                           *argv[1:]], cwd=checkout, capture_output=True, text=True)
+    assert proc.returncode in (0, 2, 3), proc.stdout + proc.stderr
+    return set(_IMPORT_RE.findall(proc.stderr))
+
+
+@pytest.mark.parametrize("argv", ENTRY_POINTS, ids=" ".join)
+def test_default_path(checkout, argv):
+    assert imported(checkout, argv + ["--no-cache"]) & HEAVY == set()
+
+
+@pytest.mark.parametrize("argv", ENTRY_POINTS, ids=" ".join)
+def test_cached_path_only_needs_sqlite(checkout, argv):
+    assert imported(checkout, argv) & HEAVY == {"sqlite3"}
+
+
+def test_artifact_packs_equal_json(tmp_path):
+    artifact = Artifact(tmp_path / "rules.marshal")
+    parsed = RulePack(pack_paths())
+    artifact.load(parsed)
+    assert artifact.save()
+
+    cached = RulePack(pack_paths(), Artifact(artifact.path))
+    assert (cached.hash, cached.shared, cached.rulesets) == (parsed.hash, parsed.shared, parsed.rulesets)
+    # Ander pack-bestand = andere hash: het artefact wordt genegeerd.
+    assert Artifact(artifact.path).packs(RulePack(pack_paths()[:-1])) is None
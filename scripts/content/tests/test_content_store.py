@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Content-store: alleen data, gecontroleerd bij laden en importeren."""
+
+import io
+import os
+import pickle
+import tarfile
+from array import array
+
+import pytest
+
+from content_cache import ContentStore, decode_result, encode_result
+from content_scan import FileHits
+
+SHA = "ab" + "c" * 38
+KEY = "0123456789abcdef"
+
+
+def sample_hits():
+    hits = FileHits()
+    hits.add([0, 2], 3, "Bouw mee aan ProSafetyMatch")
+    hits.add([1], 7, "DBA-proof")
+    return hits
+
+
+@pytest.mark.parametrize("value", [
+    sample_hits(),
+    (sample_hits(), True, False),
+    ([1, 4], []),
+    {"audit": sample_hits(), "funnelcheck": ([2], [5]), "conscious": (FileHits(), False, True)},
+    {},
+])
+def test_round_trip(value):
+    assert pickle.dumps(decode_result(encode_result(value))) == pickle.dumps(value)
+
+
+@pytest.mark.parametrize("payload", [
+    b'{"hits": [0, 1, 0, 99], "text": "kort"}',
+    b'{"hits": [0, 1, 0], "text": ""}',
+    b'{"hits": [-1, 1, 0, 0], "text": ""}',
+    b'{"set": [1]}',
+    b"\x80\x05K\x01.",
+])
+def test_invalid_payloads(payload):
+    with pytest.raises(ValueError):
+        decode_result(payload)
+
+
+def add_member(tar, name, data, **fields):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    for k, v in fields.items():
+        setattr(info, k, v)
+    tar.addfile(info, io.BytesIO(data))
+
+
+class Boom:
+    def __reduce__(self):
+        return (os.mkdir, ("/tmp/content-store-pwned",))
+
+
+def test_import_rejects_pickle_and_links(tmp_path):
+    archive = tmp_path / "store.tar"
+    with tarfile.open(archive, "w") as tar:
+        add_member(tar, f"{KEY}/{SHA[:2]}/{SHA[2:]}", pickle.dumps(Boom()))
+        add_member(tar, f"{KEY}/de/{'f' * 38}", b"", type=tarfile.SYMTYPE, linkname="/etc/passwd")
+        add_member(tar, "../buiten", encode_result([]))
+        add_member(tar, f"{KEY}/12/{'3' * 38}", encode_result(([1], [])))
+
+    store = ContentStore(tmp_path / "store")
+    assert store.import_archive(archive) == (1, 3)
+    assert store.get(KEY, "12" + "3" * 38) == (True, ([1], []))
+    assert store.get(KEY, SHA) == (False, None)
+    assert not os.path.exists("/tmp/content-store-pwned")
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    store = ContentStore(tmp_path)
+    store.entry(KEY, SHA).parent.mkdir(parents=True)
+    store.entry(KEY, SHA).write_bytes(pickle.dumps(Boom()))
+    assert store.get(KEY, SHA) == (False, None)
+    assert (store.hits, store.misses) == (0, 1)
+
+
+def test_prune_removes_least_recently_used(tmp_path):
+    store = ContentStore(tmp_path)
+    shas = [f"{i:02x}" + "0" * 38 for i in range(4)]
+    for n, sha in enumerate(shas):
+        store.put(KEY, sha, "x" * 100)
+        os.utime(store.entry(KEY, sha), (1000 + n, 1000 + n))
+    store.get(KEY, shas[0])         # net gebruikt: blijft staan
+    size = store.entry(KEY, shas[0]).stat().st_size
+    assert store.prune(2 * size) == (2, 2 * size)
+    assert [store.entry(KEY, sha).exists() for sha in shas] == [True, False, False, True]
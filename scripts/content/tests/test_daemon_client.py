@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+content_daemon.send_request: elk mislukt antwoord betekent lokaal uitvoeren (None);
+keep-alives van een daemon die nog bezig is, worden afgewacht.
+"""
+
+import socket
+import threading
+import time
+
+import pytest
+
+import content_daemon
+from content_daemon import AuditDaemon, send_request
+
+
+@pytest.fixture()
+def server(tmp_path):
+    """
+    Socket die elk verzoek met `reply` beantwoordt (None = nooit antwoorden), na
+    `beats` keep-alives met 0,1 s ertussen.
+    """
+    path = tmp_path / "d.sock"
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(path))
+    sock.listen(1)
+    done = threading.Event()
+
+    def start(reply, beats=0):
+        def run():
+            conn, _ = sock.accept()
+            with conn:
+                while conn.recv(65536):
+                    pass
+                for _ in range(beats):
+                    time.sleep(0.1)
+                    conn.sendall(b"\n")
+                if reply is None:
+                    done.wait(5)
+                else:
+                    conn.sendall(reply)
+
+        threading.Thread(target=run, daemon=True).start()
+        return path
+
+    yield start
+    done.set()
+    sock.close()
+
+
+def test_no_socket(tmp_path):
+    assert send_request(tmp_path / "geen.sock", {"cmd": "status"}, timeout=1.0) is None
+
+
+@pytest.mark.parametrize("reply", [None, b"", b"{niet json", b"\xff\xfe", b"[1, 2]", b'{"output": 3}'])
+def test_falls_back(server, reply):
+    assert send_request(server(reply), {"cmd": "audit"}, timeout=0.2) is None
+
+
+def test_keepalives_outlast_the_timeout(server):
+    path = server(b'{"exit_code": 0, "output": ""}', beats=8)
+    assert send_request(path, {"cmd": "audit"}, timeout=0.3) == {"exit_code": 0, "output": ""}
+
+
+def test_silent_after_keepalives(server):
+    assert send_request(server(None, beats=2), {"cmd": "audit"}, timeout=0.3) is None
+
+
+def test_answer(server):
+    path = server(b'{"exit_code": 2, "output": "hits\\n"}')
+    assert send_request(path, {"cmd": "audit"}, timeout=1.0) == {"exit_code": 2, "output": "hits\n"}
+
+
+def test_stale_after_scan(tmp_path, monkeypatch):
+    # Regels wijzigen tijdens de scan: geen antwoord van de oude regels, de client doet het zelf.
+    daemon = AuditDaemon()
+    monkeypatch.setattr(content_daemon, "execute", lambda request, cache_for: 0)
+    monkeypatch.chdir(tmp_path)   # handle() gaat naar de werkmap van de client
+    stamps = iter([daemon.stamp, ()])
+    monkeypatch.setattr(content_daemon, "source_stamp", lambda: next(stamps))
+    request = {"cmd": "audit", "root": str(tmp_path), "gitignore": True, "cwd": str(tmp_path)}
+    assert daemon.handle(request) == {"error": "stale"}
+    assert not daemon.running
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""--visible-only: alleen JSX-tekst, zichtbare attributen en directe JSX-kinderen."""
+
+from pathlib import Path
+
+import content_scan
+from content_extract import extract_segments, file_segments
+
+PAGE = '''"use client";
+export const metadata = { title: "Meta titel" };
+export default function Page({ name }) {
+  const label = t("sleutel.tekst");
+  return (
+    <main className={cn("p-4", "text-lg")}>
+      <h1 title="Kop titel">Welkom <strong>bij</strong> ons</h1>
+      <Hero subtitle="Onder titel" variant="groot woord" />
+      <p>{ok ? "Ja hoor" : "Nee hoor"}</p>
+      <p>{`Hallo ${name}, wij regelen alles`}</p>
+      <img alt={`Foto van ${name}`} src={`/img/${name}.png`} />
+    </main>
+  );
+}
+'''
+
+
+def test_only_visible_copy():
+    assert [(s.line, s.text) for s in extract_segments(PAGE, ".tsx")] == [
+        (7, "Kop titel"),
+        (7, "Welkom bij ons"),
+        (8, "Onder titel"),
+        (9, "Ja hoor"),
+        (9, "Nee hoor"),
+        (10, "Hallo {…}, wij regelen alles"),
+        (11, "Foto van {…}"),
+    ]
+
+
+def test_template_stays_one_sentence():
+    src = "<p>{`ProSafetyMatch ${x} Regelt het`}</p>\n"
+    assert [s.text for s in extract_segments(src, ".tsx", sentences=True)] == ["ProSafetyMatch {…} Regelt het"]
+
+
+def test_blob_without_file(tmp_path):
+    # Een blob (content_history, --staged) hoeft niet op schijf te staan of daarmee te kloppen.
+    gone = tmp_path / "weg.tsx"
+    content_scan.set_preloaded(gone, b"<p>Uit de blob</p>\n")
+    try:
+        assert [s.text for s in file_segments(gone)] == ["Uit de blob"]
+    finally:
+        content_scan.set_preloaded(None, None)
+
+    page = tmp_path / "page.tsx"
+    page.write_text("<p>Op schijf</p>\n", encoding="utf-8")
+    content_scan.set_preloaded(page, b"<p>Gestaged</p>\n")
+    try:
+        assert [s.text for s in file_segments(page)] == ["Gestaged"]
+    finally:
+        content_scan.set_preloaded(None, None)
+    assert [s.text for s in file_segments(Path(page))] == ["Op schijf"]
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""Cachesleutels volgen de hele rule-pack (ook flags en shared patronen)."""
+
+import pytest
+
+import content_audit
+import content_conscious_audit
+import content_suite
+import freeze_site_copy
+
+FINGERPRINTS = [
+    lambda: content_audit.rules_fingerprint(),
+    lambda: freeze_site_copy.rules_fingerprint("audit"),
+    lambda: freeze_site_copy.rules_fingerprint("funnelcheck"),
+    lambda: content_conscious_audit.rules_fingerprint(),
+    lambda: content_suite.rules_fingerprint(["audit", "conscious"]),
+]
+
+
+@pytest.mark.parametrize("key", FINGERPRINTS)
+def test_pack_hash_changes_key(key, monkeypatch):
+    before = key()
+    # Alle scripts delen dezelfde RulePack (content_rules.rule_pack is per proces gecachet).
+    monkeypatch.setattr(content_audit.RULES, "hash", "0" * 16)
+    assert key() != before
+
+
+def test_audit_and_funnel_keys_differ():
+    assert freeze_site_copy.rules_fingerprint("audit") != freeze_site_copy.rules_fingerprint("funnelcheck")
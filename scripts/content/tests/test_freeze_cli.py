@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""freeze_site_copy: CLI-combinaties die niet kunnen, worden door argparse geweigerd."""
+
+import json
+import sys
+
+import pytest
+
+import freeze_site_copy
+
+
+@pytest.mark.parametrize("cmd", ["apply", "soften"])
+@pytest.mark.parametrize("flags, message", [
+    (["--watch"], "--watch kan niet met "),
+    (["--profile"], "--profile/--profile-json kan niet met "),
+    (["--profile-json", "p.json"], "--profile/--profile-json kan niet met "),
+    (["--format", "json"], "--format json kan niet met "),
+    (["--format", "sarif"], "--format sarif kan niet met "),
+])
+def test_rejected_for_rewrites(tmp_path, monkeypatch, capsys, cmd, flags, message):
+    monkeypatch.setattr(sys, "argv", ["freeze_site_copy.py", cmd, *flags, "--root", str(tmp_path)])
+    with pytest.raises(SystemExit) as exc:
+        freeze_site_copy.main()
+    assert exc.value.code == 2
+    assert message + cmd in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("cmd", ["apply", "soften"])
+def test_stats_footer_for_rewrites(tmp_path, monkeypatch, capsys, cmd):
+    (tmp_path / "a.tsx").write_text("<p>DBA proof</p>\n", encoding="utf-8")
+    (tmp_path / "b.tsx").write_text("<p>niets</p>\n", encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["freeze_site_copy.py", cmd, "--dry-run", "--stats", "--preview", "json",
+                                      "--root", str(tmp_path)])
+    assert freeze_site_copy.main() == 0
+    out, err = capsys.readouterr()
+    assert json.loads(out)["dry_run"] is True
+    assert err.startswith("📊 2 bestanden: ")
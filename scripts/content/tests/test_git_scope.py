@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""--changed-since/--staged: paden uit git diff en de gestagede inhoud."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import freeze_site_copy
+from content_git import parse_diff
+
+DIFF = '''\
+diff --git a/app/(site)/my page.tsx b/app/(site)/my page.tsx
+index 1111111..2222222 100644
+--- a/app/(site)/my page.tsx\t
++++ b/app/(site)/my page.tsx\t
+@@ -1,0 +2,2 @@ a
++DBA proof
++++ geen kopregel
+diff --git "a/app/(site)/q\\"uote.tsx" "b/app/(site)/q\\"uote.tsx"
+index 3333333..4444444 100644
+--- "a/app/(site)/q\\"uote.tsx"
++++ "b/app/(site)/q\\"uote.tsx"
+@@ -4 +4 @@
+-a
++b
+'''
+
+
+def test_parse_diff_paths(tmp_path):
+    shas = {}
+    changed = parse_diff(DIFF, tmp_path, shas)
+    site = tmp_path.resolve() / "app" / "(site)"
+    assert changed == {site / "my page.tsx": {2, 3}, site / 'q"uote.tsx': {4}}
+    assert shas == {site / "my page.tsx": "2222222", site / 'q"uote.tsx': "4444444"}
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "app" / "(site)"
+    root.mkdir(parents=True)
+    page = root / "my page.tsx"
+    page.write_text("<p>Neutraal.</p>\n", encoding="utf-8")
+    git = ["git", "-C", str(tmp_path), "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run(git[:3] + ["init", "-q"], check=True)
+    subprocess.run(git + ["add", "."], check=True)
+    subprocess.run(git + ["commit", "-qm", "init"], check=True)
+    return root, page, git
+
+
+def audit(monkeypatch, capsys, root, *extra):
+    monkeypatch.setattr(sys, "argv", ["freeze_site_copy.py", "audit", "--root", str(root), "--format", "json",
+                                      "--cache", str(root.parent.parent / "cache.sqlite"), *extra])
+    rc = freeze_site_copy.main()
+    return rc, [(Path(h["path"]).name, h["line"], h["text"]) for h in json.loads(capsys.readouterr().out)["hits"]]
+
+
+def test_changed_since_path_with_space(repo, monkeypatch, capsys):
+    root, page, _ = repo
+    page.write_text("<p>Neutraal.</p>\n<p>DBA proof</p>\n", encoding="utf-8")
+    assert audit(monkeypatch, capsys, root, "--changed-since", "HEAD", "--changed-lines-only") == \
+        (2, [("my page.tsx", 2, "<p>DBA proof</p>")])
+
+
+def test_staged_scans_the_index(repo, monkeypatch, capsys):
+    root, page, git = repo
+    page.write_text("<p>Neutraal.</p>\n<p>DBA proof</p>\n", encoding="utf-8")
+    subprocess.run(git + ["add", "."], check=True)
+    # Werkboom daarna anders: de hit staat er op regel 4, in de index op regel 2.
+    page.write_text("<p>Nieuw.</p>\n<p>Nieuw.</p>\n<p>Neutraal.</p>\n<p>DBA proof, gezag</p>\n", encoding="utf-8")
+    assert audit(monkeypatch, capsys, root, "--staged", "--changed-lines-only") == \
+        (2, [("my page.tsx", 2, "<p>DBA proof</p>")])
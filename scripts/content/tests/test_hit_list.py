@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""HitList: alleen-getelde categorieën bewaren geen rijen of regeltekst."""
+
+from content_scan import FileHits, HitList
+
+LABELS = [("CTA", "a"), ("merk", "b"), ("claim", "c")]
+
+
+def file_hits():
+    hits = FileHits()
+    hits.add([1], 2, "alleen merk")
+    hits.add([0, 1], 5, "cta met merk")
+    hits.add([2], 9, "claim")
+    return hits
+
+
+def test_counted_categories_keep_no_text():
+    full = HitList(LABELS, lambda *hit: hit)
+    counted = HitList(LABELS, lambda *hit: hit, counted=frozenset({1}))
+    for hits in (full, counted):
+        hits.add("a.tsx", file_hits())
+        hits.add("b.tsx", file_hits(), keep=lambda line_no: line_no != 2)
+
+    assert len(counted) == len(full) == 7
+    assert counted.files[0].__getstate__()[1] == "cta met merkclaim"
+    assert [idx for f in counted.files for idx in f.rows[0::4]] == [0, 2, 0, 2]
+
+    groups, expected = counted.by_category(), full.by_category()
+    assert list(groups) == list(expected) == ["merk", "CTA", "claim"]
+    assert {cat: len(g) for cat, g in groups.items()} == {cat: len(g) for cat, g in expected.items()}
+    assert groups["CTA"][:] == expected["CTA"][:]
+    assert groups["merk"][:] == []
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""`content_index.py audit` geeft dezelfde hits als de scripts zelf."""
+
+from argparse import Namespace
+from collections import Counter
+
+import subprocess
+import sys
+
+import pytest
+
+import content_audit
+import content_index
+import content_conscious_audit
+import freeze_site_copy
+from content_index import CopyIndex, _scope_paths, audit_ruleset, run_audit
+
+PAGE = """\
+export default function Page() {
+  return (
+    <main>
+      <p>Jij kiest je eigen tarief, zonder verplichtingen en met meerdere opdrachtgevers.</p>
+      // Jij kiest altijd: gegarandeerd zonder risico
+      {/* zonder verplichtingen, wij regelen alles */}
+      <script>{`{"@context": "https://schema.org", "description": "Jij kiest zonder risico"}`}</script>
+      <p>Het concept kan straks; blijf op de hoogte via de wachtlijst.</p>
+      <p>DBA-proof en zonder risico, ProSafetyMatch regelt het.</p>
+    </main>
+  );
+}
+"""
+
+
+@pytest.fixture()
+def site(tmp_path):
+    root = tmp_path / "app" / "(site)"
+    (root / "zzp").mkdir(parents=True)
+    (root / "zzp" / "page.tsx").write_text(PAGE, encoding="utf-8")
+    (root / "over.md").write_text("Wij doen het, altijd.\n* zonder risico\n", encoding="utf-8")
+    index = CopyIndex(tmp_path / "index.sqlite")
+    index.update(_scope_paths(root, None), root)
+    index.scope(root)
+    yield root, index
+    index.close()
+
+
+def index_counts(index, name):
+    _, hits, _ = audit_ruleset(index, name)
+    return Counter(cat for cat, _, _, _ in hits)
+
+
+def test_conscious_skips_comment_and_schema_lines(site):
+    root, index = site
+    hits, _ = content_conscious_audit.run_audit(root)
+    expected = Counter({cat: len(group) for cat, group in hits.by_category().items() if len(group)})
+    assert index_counts(index, "conscious") == expected
+    assert sum(expected.values()) > 0
+
+
+def test_funnel_counts_a_line_once(site):
+    root, index = site
+    found = freeze_site_copy.funnelcheck(root)
+    assert sum(index_counts(index, "funnel_soft").values()) == len(found["SOFT"]) > 0
+    assert sum(index_counts(index, "funnel_hard").values()) == len(found["HARD"])
+
+
+@pytest.mark.parametrize("name, run", [
+    ("content_audit", lambda root: content_audit.run_audit([root])),
+    ("freeze_audit", freeze_site_copy.audit),
+])
+def test_category_audits(site, name, run):
+    root, index = site
+    expected = Counter({cat: len(group) for cat, group in run(root).by_category().items() if len(group)})
+    assert index_counts(index, name) == expected
+
+
+def test_changed_scope(site):
+    root, index = site
+    page = (root / "zzp" / "page.tsx").resolve()
+    _, hits, _ = audit_ruleset(index, "content_audit", {page: {9}})
+    assert {p for _, p, _, _ in hits} == {page}
+    _, hits, _ = audit_ruleset(index, "content_audit", {page: {9}}, changed_lines_only=True)
+    assert hits and {i for _, _, i, _ in hits} == {9}
+    _, hits, _ = audit_ruleset(index, "content_audit", {})
+    assert hits == []
+
+
+def test_exit_code(site, capsys):
+    _, index = site
+    args = Namespace(terms=["content_audit"], changed_lines_only=False, format="json", limit=0)
+    assert run_audit(index, args) == 2
+    assert run_audit(index, args, {}) == 0
+
+
+def test_cli_changed_since(tmp_path, monkeypatch, capsys):
+    root = tmp_path / "app" / "(site)"
+    root.mkdir(parents=True)
+    page = root / "page.tsx"
+    page.write_text("<p>Neutrale tekst.</p>\n", encoding="utf-8")
+    git = ["git", "-C", str(tmp_path), "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run(git[:3] + ["init", "-q"], check=True)
+    subprocess.run(git + ["add", "."], check=True)
+    subprocess.run(git + ["commit", "-qm", "init"], check=True)
+    (root / "other.md").write_text("zonder risico\n", encoding="utf-8")
+    page.write_text(PAGE, encoding="utf-8")
+
+    def audit(*extra):
+        monkeypatch.setattr(sys, "argv", ["content_index.py", "audit", "content_audit", "--root", str(root),
+                                          "--index", str(tmp_path / "index.sqlite"), "--format", "json", *extra])
+        rc = content_index.main()
+        return rc, capsys.readouterr().out
+
+    rc, out = audit("--changed-since", "HEAD")
+    assert rc == 2 and "page.tsx" in out and "other.md" not in out
+    subprocess.run(git + ["add", "."], check=True)
+    subprocess.run(git + ["commit", "-qm", "copy"], check=True)
+    assert audit("--changed-since", "HEAD")[0] == 0
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""FilePrefilter per stuk geeft hetzelfde antwoord als de check op het hele bestand."""
+
+import random
+
+import pytest
+
+import content_scan
+from content_scan import FilePrefilter
+
+
+def whole_file(keywords, data):
+    """De check zoals hij op één kopie van het hele bestand zou gaan."""
+    if not data:
+        return False
+    if all(w.isascii() for w in keywords):
+        lowered = data.lower()
+        if any(w.lower().encode("ascii") in lowered for w in keywords):
+            return True
+        if data.isascii():
+            return False
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return True
+    if not all(w.isascii() for w in keywords):
+        return content_scan._keyword_regex(keywords, content_scan.re.IGNORECASE).search(text) is not None
+    text = text.casefold().replace("ı", "i")
+    return any(w.lower() in text for w in keywords)
+
+
+ALPHABET = ["a", "b", "e", " ", "\n", "é", "ſ", "K", "ß", "Ü", "\x80", "ris", "ICO", "gar"]
+
+
+@pytest.mark.parametrize("keywords", [
+    frozenset({"risico", "garantie"}),
+    frozenset({"zeker", "ss"}),
+    frozenset({"één", "risico"}),
+])
+def test_chunked_equals_whole_file(tmp_path, monkeypatch, keywords):
+    monkeypatch.setattr(content_scan, "PREFILTER_CHUNK", 5)
+    rnd = random.Random(7)
+    prefilter = FilePrefilter(keywords)
+    path = tmp_path / "f.txt"
+    for _ in range(400):
+        parts = [rnd.choice(ALPHABET) for _ in range(rnd.randrange(0, 12))]
+        if rnd.random() < 0.3:
+            parts.insert(rnd.randrange(len(parts) + 1), rnd.choice(sorted(keywords)).upper())
+        data = "".join(p for p in parts if p != "\x80").encode("utf-8")
+        if "\x80" in parts:
+            data += b"\x80" if rnd.random() < 0.5 else "é".encode("utf-8")[:1]
+        path.write_bytes(data)
+        assert prefilter.could_match(path) == whole_file(keywords, data), data
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""apply/soften: de Rewriter moet gelijk blijven aan de oude keten van re.sub's."""
+
+import re
+import time
+
+import pytest
+
+import freeze_site_copy
+from content_rewrite import Rewriter, rewrite_file
+
+
+def chained(rules, text, flags=0):
+    for pat, repl in rules:
+        text = re.sub(pat, repl, text, flags=flags)
+    return text
+
+
+# Geketend: de uitvoer van "Bouw mee aan …" matcht daarna "ProSafetyMatch bundelt/helpt je".
+@pytest.mark.parametrize("text, expected", [
+    ("Bouw mee aan ProSafetyMatch bundelt alles.",
+     "Blijf op de hoogte van ProSafetyMatch is in ontwikkeling om te bundelen alles."),
+    ("Bouw mee aan ProSafetyMatch helpt je snel.",
+     "Blijf op de hoogte van ProSafetyMatch is in ontwikkeling om te helpen snel."),
+])
+def test_soften_chained_rules(text, expected):
+    new, edits = freeze_site_copy.compile_soften_rules().rewrite(text)
+    assert new == expected
+    assert new == chained(freeze_site_copy.SOFTENER_RULES, text)
+    assert len(edits) == 2
+
+
+@pytest.mark.parametrize("text", [
+    "Voorproef van ProSafetyMatch: ProSafetyMatch helpt je, claimen kan.\nfundament voor ProSafetyMatch",
+    "Geen enkele regel hier.",
+])
+def test_soften_matches_chain(text):
+    new, _ = freeze_site_copy.compile_soften_rules().rewrite(text)
+    assert new == chained(freeze_site_copy.SOFTENER_RULES, text)
+
+
+def test_apply_matches_chain():
+    text = "DBA proof en gezag bij ProSafetyMatch.\nMail info@prosafetymatch.nl of privacy@prosafetymatch.nl."
+    new, _ = freeze_site_copy.compile_apply_rules().rewrite(text)
+    assert new != text
+    assert new == chained(freeze_site_copy.REPLACEMENTS, text, re.I)
+
+
+def test_json_preview_lists_each_step(tmp_path):
+    page = tmp_path / "page.tsx"
+    page.write_text("<p>Bouw mee aan ProSafetyMatch bundelt alles.</p>\n", encoding="utf-8")
+    result = rewrite_file(page, freeze_site_copy.compile_soften_rules(), ".bak2", dry_run=True,
+                          preview="json", root=tmp_path)
+    assert result.changed
+    assert [(c["rule"], c["line"]) for c in result.preview] == [("R3", 1), ("R5", 1)]
+    assert page.read_text(encoding="utf-8").startswith("<p>Bouw mee")
+
+
+def test_independent_rules_share_a_pass():
+    # apply: DBA[-\\s]?proof kan woorden aan elkaar plakken en krijgt een eigen pass.
+    assert [s.rules for s in freeze_site_copy.compile_apply_rules().stages] == [(0,), (1, 2, 3)]
+    soften = freeze_site_copy.compile_soften_rules()
+    assert len(soften.stages) < len(freeze_site_copy.SOFTENER_RULES)
+
+
+@pytest.mark.parametrize("rules, text", [
+    # De vervanging eindigt op een woord waarmee de volgende regel begint.
+    ([(r"\bfoo\b", "bar baz"), (r"\bbaz\s+qux\b", "Z")], "foo qux"),
+    # Overlappende matches: de eerste regel gaat voor, ook als de tweede eerder begint.
+    ([(r"\bb\s+c\b", "X"), (r"\ba\s+b\b", "Y")], "a b c"),
+    # Zonder \\b kan een vervanging midden in een woord een nieuwe match maken.
+    ([(r"oo", "x"), (r"fx", "!")], "foo"),
+    # Leestekens aan de rand laten ernaast een \\b ontstaan.
+    ([(r"a", "a-"), (r"\bb", "B")], "ab"),
+])
+def test_dependent_rules_stay_chained(rules, text):
+    rewriter = Rewriter(rules)
+    assert len(rewriter.stages) == 2
+    assert rewriter.rewrite(text)[0] == chained(rules, text)
+
+
+def test_large_file_rewrites_in_linear_time(tmp_path):
+    # ~2 MB met 50k vervangingen: regelnummers per match opnieuw tellen duurde tientallen seconden.
+    page = tmp_path / "page.tsx"
+    page.write_text("".join(f"<p>Bouw mee aan ProSafetyMatch bundelt {i}, claimen kan.</p>\n"
+                            for i in range(25_000)), encoding="utf-8")
+    rewriter = freeze_site_copy.compile_soften_rules()
+    start = time.perf_counter()
+    result = rewrite_file(page, rewriter, ".bak2", dry_run=True, preview="json", root=tmp_path)
+    assert time.perf_counter() - start < 10
+    assert sum(result.counts.values()) == 75_000
+    assert result.preview[-1]["line"] == 25_000
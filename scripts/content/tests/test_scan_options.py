@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Scan-opties gaan expliciet mee aan run_scan; argparse verandert niets aan content_scan."""
+
+import argparse
+
+import pytest
+
+import content_scan
+from content_scan import (ScanOptions, add_jobs_argument, add_visible_argument, iter_lines, run_scan,
+                          scan_options)
+
+TSX = 'import x from "y";\nexport default () => <p className="a">Zichtbare tekst</p>;\n'
+
+
+def parse(*argv):
+    ap = argparse.ArgumentParser()
+    add_jobs_argument(ap)
+    add_visible_argument(ap)
+    return ap.parse_args(argv)
+
+
+def lines_of(path, _state):
+    return [text for _, text in iter_lines(path)]
+
+
+def test_parse_args_has_no_side_effects():
+    before = content_scan._ACTIVE
+    args = parse("--visible-only", "--prefetch", "0")
+    assert content_scan._ACTIVE is before
+    options = scan_options(args)
+    assert options.prefetch == 0 and options.text_filter is not None
+    assert scan_options(parse("--sentences", "--visible-only")).text_filter.__name__ == "sentence_lines"
+    assert scan_options(parse()).text_filter is None
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_options_only_during_scan(tmp_path, jobs):
+    page = tmp_path / "page.tsx"
+    page.write_text(TSX, encoding="utf-8")
+    plain = list(run_scan(lines_of, [page], lambda: None, jobs=jobs))
+    visible = list(run_scan(lines_of, [page], lambda: None, jobs=jobs, options=scan_options(parse("--visible-only"))))
+    assert plain == [TSX.splitlines()]
+    assert visible == [["Zichtbare tekst"]]
+    assert content_scan._ACTIVE.text_filter is None
+    assert [t for _, t in iter_lines(page)] == TSX.splitlines()
+
+
+def test_prefetch_zero_reads_nothing_ahead(tmp_path):
+    page = tmp_path / "page.md"
+    page.write_text("tekst\n", encoding="utf-8")
+    seen = list(run_scan(lambda p, _: content_scan.preloaded(p), [page], lambda: None,
+                         options=ScanOptions(prefetch=0), empty=lambda: None))
+    assert seen == [None]
+    assert list(run_scan(lambda p, _: content_scan.preloaded(p), [page], lambda: None)) == [b"tekst\n"]
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+content_walk.walk_files: mappen buiten de scope (relatief aan root) worden niet betreden,
+en --changed-since en content_suite houden dezelfde scope aan.
+"""
+
+import os
+
+import pytest
+
+import content_audit
+import content_walk
+from content_audit import EXCLUDE_DIRS, INCLUDE_EXT, SITE_ROOT_FRAGMENT
+from content_git import select_changed
+from content_suite import iter_items
+
+FILES = [
+    "app/(site)/page.tsx",
+    "app/(site)/zzp/page.tsx",
+    "app/layout.tsx",
+    "public/img/2024/banner/caption.md",
+    "public/img/2024/logo.md",
+    "packages/demo/app/(site)/page.tsx",
+    "README.md",
+]
+
+
+@pytest.fixture()
+def tree(tmp_path):
+    for rel in FILES:
+        p = tmp_path / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text("tekst\n", encoding="utf-8")
+    return tmp_path
+
+
+def walk(root, monkeypatch):
+    opened = []
+    scandir = os.scandir
+
+    def spy(path):
+        opened.append(os.path.relpath(path, root))
+        return scandir(path)
+
+    monkeypatch.setattr(content_walk.os, "scandir", spy)
+    found = [p.relative_to(root).as_posix()
+             for p in content_walk.walk_files(root, EXCLUDE_DIRS, INCLUDE_EXT, scope_fragment=SITE_ROOT_FRAGMENT)]
+    return found, opened
+
+
+def test_prunes_outside_scope(tree, monkeypatch):
+    found, opened = walk(tree, monkeypatch)
+    assert found == ["app/(site)/page.tsx", "app/(site)/zzp/page.tsx"]
+    assert sorted(opened) == [".", "app", "app/(site)", "app/(site)/zzp"]
+
+
+@pytest.mark.parametrize("sub, expected", [
+    ("app", ["(site)/page.tsx", "(site)/zzp/page.tsx"]),
+    ("app/(site)", ["page.tsx", "zzp/page.tsx"]),
+    ("public", []),
+])
+def test_scope_relative_to_root(tree, monkeypatch, sub, expected):
+    found, _ = walk(tree / sub, monkeypatch)
+    assert found == expected
+
+
+@pytest.mark.parametrize("sub", ["", "app", "packages", "packages/demo"])
+def test_selections_agree(tree, sub):
+    # Geneste packages/demo/app/(site) hoort alleen bij een root die er zelf naartoe leidt.
+    root = (tree / sub).resolve()
+    walked = sorted(content_audit.iter_files(root))
+    changed = {(tree / rel).resolve(): {1} for rel in FILES}
+    assert select_changed(changed, [root], EXCLUDE_DIRS, content_audit.is_candidate, SITE_ROOT_FRAGMENT) == walked
+    assert sorted(p for p, _, reports in iter_items(root, ["content"]) if "content" in reports) == walked
+    assert sorted(p for p, _, reports in iter_items(root, ["content"], changed)) == walked
+    assert any("packages" in str(p) for p in walked) == (sub == "packages/demo")
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""content_watch.watch_loop: na een save alleen de paden uit de events opnieuw statten."""
+
+import io
+import threading
+import time
+
+import pytest
+
+import content_watch
+from content_watch import WatchHit, watch_loop
+
+
+def run(tmp_path, edits, **kwargs):
+    for name in ("a.tsx", "b.tsx"):
+        (tmp_path / name).write_text("niets\n", encoding="utf-8")
+    walks = []
+
+    def list_files():
+        walks.append(time.monotonic())
+        return sorted(tmp_path.glob("*.tsx"))
+
+    def scan(p):
+        text = p.read_text(encoding="utf-8")
+        if text == "stop\n":
+            raise KeyboardInterrupt
+        return [WatchHit((line,), i, line) for i, line in enumerate(text.splitlines(), 1) if "DBA" in line]
+
+    def editor():
+        time.sleep(0.3)
+        for name, text in edits:
+            (tmp_path / name).write_text(text, encoding="utf-8")
+            time.sleep(0.2)
+        (tmp_path / "b.tsx").write_text("stop\n", encoding="utf-8")
+
+    out = io.StringIO()
+    thread = threading.Thread(target=editor)
+    thread.start()
+    assert watch_loop([tmp_path], list_files, scan, out=out, **kwargs) == 0
+    thread.join()
+    return out.getvalue(), len(walks)
+
+
+def test_inotify_rescans_only_for_new_files(tmp_path):
+    notify = content_watch.open_inotify()
+    if notify is None:
+        pytest.skip("geen inotify")
+    notify.close()
+    # Het swap-bestand hoort niet bij de selectie: één walk, daarna genegeerd.
+    out, walks = run(tmp_path, [("a.tsx", "DBA proof\n"), ("a.swp", "x"), ("a.swp", "y"), ("a.tsx", "niets\n")])
+    assert "+ 1: DBA proof" in out and "- 1: DBA proof" in out
+    assert walks == 2
+
+
+def test_polling_restats_known_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(content_watch, "open_inotify", lambda: None)
+    out, walks = run(tmp_path, [("a.tsx", "DBA proof\n")], interval=0.02, full_every=60)
+    assert "+ 1: DBA proof" in out
+    assert walks == 1